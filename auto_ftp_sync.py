@@ -10,30 +10,74 @@ import sqlite3
 import time
 import json
 import hashlib
+import calendar
+import threading
+import zipfile
+import importlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from typing import Optional, List, Tuple, Dict
 from datetime import datetime
 
-# SFTP und SMB Imports
-try:
-    import paramiko
-    SFTP_AVAILABLE = True
-    xbmc.log("SFTP support loaded successfully", xbmc.LOGINFO)
-except ImportError:
-    SFTP_AVAILABLE = False
-    xbmc.log("SFTP not available - paramiko not installed. Install with: pip install paramiko", xbmc.LOGWARNING)
-
-try:
-    import smbclient
-    SMB_AVAILABLE = True
-    xbmc.log("SMB support loaded successfully", xbmc.LOGINFO)
-except ImportError:
-    SMB_AVAILABLE = False
-    xbmc.log("SMB not available - smbclient not installed. Install with: pip install smbprotocol", xbmc.LOGWARNING)
+from resources.lib.sync_state import open_sync_state_store
+from resources.lib.connection_pool import DEFAULT_IDLE_TIMEOUT, get_pool, close_all_pools
+from resources.lib.remote_dir_cache import get_dir_cache
+from resources.lib.notifications import NotificationDispatcher
+from resources.lib.scheduler import AdaptiveScheduler
+from resources.lib.file_watcher import FileWatcher
+from resources.lib.hashing import (HashCache, hash_file, canonical_favourites_hash,
+                                   CANONICAL_VARIANT_SUFFIX, LEGACY_HASH_ALGORITHM)
+from resources.lib.vfs_manager import VFSManager
+from resources.lib.favourites_merge import MergeBaseStore, MergeError, merge_favourites, parse_favourites, write_favourites
+from resources.lib.favourites_delta import apply_patch, diff_favourites, read_patch, write_patch
+from resources.lib.static_bundle import BUNDLE_FILE, extract_member, read_index, write_bundle
+from resources.lib.object_store import POINTER_SUFFIX, object_name, read_pointer, write_pointer
+from resources.lib.circuit_breaker import get_breaker, retry_with_backoff
+from resources.lib.transfer import (DEFAULT_BUFFER_SIZE, GZIP_SUFFIX, PART_SUFFIX, BytesWriter, TransferResult,
+                                    compress_file, copy_stream, decompress_file, discard_partial, discard_stale_partials,
+                                    log_throughput, partial_path, replace_if_changed, resume_offset, stale_partials,
+                                    verify_partial)
+
+# Zeitpunkt des Modul-Imports, für die Startzeit im Log
+STARTUP_STARTED = time.monotonic()
+
+# SFTP und SMB: paramiko/smbclient werden erst geladen, wenn das Backend genutzt wird
+paramiko = None
+smbclient = None
+PROTOCOL_MODULES = {
+    'paramiko': "SFTP not available - paramiko not installed. Install with: pip install paramiko",
+    'smbclient': "SMB not available - smbclient not installed. Install with: pip install smbprotocol",
+}
+_missing_protocol_modules = set()
+
+def load_protocol_module(name: str) -> bool:
+    """Importiert paramiko bzw. smbclient beim ersten Bedarf"""
+    if globals()[name] is not None:
+        return True
+    if name in _missing_protocol_modules:
+        return False
+    try:
+        globals()[name] = importlib.import_module(name)
+        xbmc.log(f"{name} loaded", xbmc.LOGINFO)
+        return True
+    except ImportError:
+        _missing_protocol_modules.add(name)
+        xbmc.log(PROTOCOL_MODULES[name], xbmc.LOGWARNING)
+        return False
+
+def protocol_module_available(name: str) -> bool:
+    """Prüft, ob paramiko/smbclient installiert ist, ohne es zu importieren"""
+    if globals()[name] is not None:
+        return True
+    return name not in _missing_protocol_modules and importlib.util.find_spec(name) is not None
 
 # Einstellungen laden
 ADDON = xbmcaddon.Addon()
 
+# Hash-Verfahren laut Einstellung 'hash_algorithm'
+HASH_ALGORITHMS = {0: 'blake2b', 1: 'md5', 2: 'sha256'}
+
 # Konfiguration
 class Config:
     def __init__(self):
@@ -56,6 +100,17 @@ class Config:
         self.sftp_key_file = ADDON.getSettingString('sftp_key_file')
         self.smb_share = ADDON.getSettingString('smb_share')
         self.smb_domain = ADDON.getSettingString('smb_domain')
+        self.prefer_vfs = ADDON.getSettingBool('prefer_vfs')
+        self.connect_timeout = max(1, ADDON.getSettingInt('connect_timeout'))  # Sekunden
+        self.read_timeout = max(1, ADDON.getSettingInt('read_timeout'))  # Sekunden
+        self.connect_retries = max(0, ADDON.getSettingInt('connect_retries'))
+        self.transfer_buffer_size = max(16, ADDON.getSettingInt('transfer_buffer_kib')) * 1024
+        # Kodi-VFS: blockweises Kopieren statt xbmcvfs.copy, je Protokoll wählbar
+        self.vfs_streaming = {
+            'ftp': ADDON.getSettingBool('vfs_stream_ftp'),
+            'sftp': ADDON.getSettingBool('vfs_stream_sftp'),
+            'smb': ADDON.getSettingBool('vfs_stream_smb'),
+        }
         
         # Kategorisierungs-Einstellungen
         self.enable_categories = ADDON.getSettingBool('enable_categories')
@@ -63,6 +118,26 @@ class Config:
         self.category_placeholder_suffix = ADDON.getSettingString('category_placeholder_suffix')
         self.auto_categorize = ADDON.getSettingBool('auto_categorize')
         
+        # Performance-Einstellungen
+        self.state_backend = ADDON.getSettingInt('state_backend')  # 0=JSON, 1=SQLite
+        self.hash_algorithm = HASH_ALGORITHMS.get(ADDON.getSettingInt('hash_algorithm'), 'blake2b')
+        self.sync_workers = max(1, ADDON.getSettingInt('sync_workers'))
+        self.sync_interval_min = max(1, ADDON.getSettingInt('sync_interval_min'))  # Minuten
+        self.sync_interval_max = max(self.sync_interval_min, ADDON.getSettingInt('sync_interval_max'))
+        self.watch_local_changes = ADDON.getSettingBool('watch_local_changes')
+        # Drei-Wege-Merge je Favorit statt Hoch-/Herunterladen der ganzen Datei
+        self.merge_favourites = ADDON.getSettingBool('merge_favourites')
+        # Änderungen als Patches hochladen; nach so vielen Patches wird die ganze Datei neu geschrieben
+        self.delta_uploads = ADDON.getSettingBool('delta_uploads')
+        self.delta_compact_patches = max(1, ADDON.getSettingInt('delta_compact_patches'))
+        # Zusätzlich gzip-Nebendateien hochladen und, wo im Manifest angeboten, diese laden
+        self.compress_transfers = ADDON.getSettingBool('compress_transfers')
+        self.compression_level = min(9, max(1, ADDON.getSettingInt('compression_level')))
+        # Statische Ordner gemeinsam als ein Archiv übertragen
+        self.bundle_static_folders = ADDON.getSettingBool('bundle_static_folders')
+        # Inhalte einmalig unter objects/<hash> ablegen, im custom_folder nur Zeigerdateien
+        self.content_addressed_store = ADDON.getSettingBool('content_addressed_store')
+        
         # Pfade berechnen
         self.ftp_path = f"/{self.ftp_base_path}/auto_fav_sync/{self.custom_folder}/favourites.xml"
         self.local_favourites = os.path.join(xbmcvfs.translatePath('special://userdata'), 'favourites.xml')
@@ -91,65 +166,129 @@ class Config:
         if not self.ftp_user:
             xbmc.log("WARNING: FTP user is not configured", xbmc.LOGWARNING)
 
+class LazyConfig:
+    """Liest die Einstellungen erst beim ersten Zugriff (kein Aufwand beim Import)"""
+    
+    def __init__(self):
+        self._config: Optional[Config] = None
+        self._lock = threading.Lock()
+    
+    def load(self) -> Config:
+        if self._config is None:
+            with self._lock:
+                if self._config is None:
+                    self._config = Config()
+        return self._config
+    
+    def reload(self):
+        """Einstellungen neu einlesen (z. B. nach onSettingsChanged)"""
+        with self._lock:
+            self._config = Config()
+    
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+
 # Globale Konfiguration
-config = Config()
+config = LazyConfig()
 LANGUAGE = ADDON.getLocalizedString
 
-# Rückwärtskompatibilität - Globale Variablen für bestehenden Code
-ENABLED = config.enabled
-IS_MAIN_SYSTEM = config.is_main_system
-OVERWRITE_STATIC = config.overwrite_static
-FTP_BASE_PATH = config.ftp_base_path
-CUSTOM_FOLDER = config.custom_folder
-SPECIFIC_CUSTOM_FOLDER = config.specific_custom_folder
-IMAGE_LIST_URL = config.image_list_url
-FTP_HOST = config.ftp_host
-FTP_USER = config.ftp_user
-FTP_PASS = config.ftp_pass
-FTP_PATH = config.ftp_path
-LOCAL_FAVOURITES = config.local_favourites
-SUPER_FAVOURITES_PATH = config.super_favourites_path
-LOCAL_IMAGE_PATH = config.local_image_path
-ADDON_IMAGE_PATH = config.addon_image_path
-STATIC_FOLDERS = config.static_folders
-ENABLE_IMAGE_ROTATION = config.enable_image_rotation
-ICON_PATH = config.icon_path
-
-# Kategorisierungs-Variablen
-ENABLE_CATEGORIES = config.enable_categories
-CATEGORY_PLACEHOLDER_PREFIX = config.category_placeholder_prefix
-CATEGORY_PLACEHOLDER_SUFFIX = config.category_placeholder_suffix
-AUTO_CATEGORIZE = config.auto_categorize
+# Rückwärtskompatibilität - frühere globale Variablen werden beim Zugriff aus config gelesen
+LEGACY_SETTINGS = {
+    'ENABLED': 'enabled',
+    'IS_MAIN_SYSTEM': 'is_main_system',
+    'OVERWRITE_STATIC': 'overwrite_static',
+    'FTP_BASE_PATH': 'ftp_base_path',
+    'CUSTOM_FOLDER': 'custom_folder',
+    'SPECIFIC_CUSTOM_FOLDER': 'specific_custom_folder',
+    'IMAGE_LIST_URL': 'image_list_url',
+    'FTP_HOST': 'ftp_host',
+    'FTP_USER': 'ftp_user',
+    'FTP_PASS': 'ftp_pass',
+    'FTP_PATH': 'ftp_path',
+    'LOCAL_FAVOURITES': 'local_favourites',
+    'SUPER_FAVOURITES_PATH': 'super_favourites_path',
+    'LOCAL_IMAGE_PATH': 'local_image_path',
+    'ADDON_IMAGE_PATH': 'addon_image_path',
+    'STATIC_FOLDERS': 'static_folders',
+    'ENABLE_IMAGE_ROTATION': 'enable_image_rotation',
+    'ICON_PATH': 'icon_path',
+    # Kategorisierungs-Variablen
+    'ENABLE_CATEGORIES': 'enable_categories',
+    'CATEGORY_PLACEHOLDER_PREFIX': 'category_placeholder_prefix',
+    'CATEGORY_PLACEHOLDER_SUFFIX': 'category_placeholder_suffix',
+    'AUTO_CATEGORIZE': 'auto_categorize',
+}
+
+def __getattr__(name):
+    if name in LEGACY_SETTINGS:
+        return getattr(config, LEGACY_SETTINGS[name])
+    if name in ('SFTP_AVAILABLE', 'SMB_AVAILABLE'):
+        return protocol_module_available('paramiko' if name == 'SFTP_AVAILABLE' else 'smbclient')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+# Benachrichtigungen laufen über einen eigenen Thread und blockieren den Aufrufer nicht
+NOTIFICATIONS = NotificationDispatcher()
+
 def show_notification(message_id: int, duration: int = 5000, **kwargs) -> None:
-    """Zeigt eine Benachrichtigung an"""
+    """Zeigt eine Benachrichtigung an (asynchron, gleiche Meldungen werden zusammengefasst)"""
     try:
         message = LANGUAGE(message_id).format(**kwargs)
-        xbmc.executebuiltin(f'Notification({LANGUAGE(30001)}, {message}, {duration}, {config.icon_path})')
-        time.sleep(duration / 1000)  # Warte, bis die Benachrichtigung abgeschlossen ist
+        NOTIFICATIONS.notify(LANGUAGE(30001), message, duration, config.icon_path)
     except Exception as e:
         xbmc.log(f"Error showing notification: {str(e)}", xbmc.LOGERROR)
 
-def refresh_favourites_ui():
-    """Aktualisiert die Favoriten-UI sofort ohne Neustart"""
+# Mehrere Aktualisierungen innerhalb dieses Fensters werden zu einer zusammengefasst
+REFRESH_DEBOUNCE_SECONDS = 2.0
+_refresh_lock = threading.Lock()
+_pending_refresh = {'favourites': False, 'containers': False}
+_refresh_timer: Optional[threading.Timer] = None
+
+def refresh_favourites_ui(change_set: 'SyncChangeSet' = None) -> bool:
+    """Aktualisiert die Favoriten-UI gezielt und entprellt
+    
+    Ohne Änderungsliste werden Favoriten und Container aktualisiert. Mit
+    ``change_set`` wird nur neu geladen, was sich lokal tatsächlich geändert hat;
+    eine Bibliotheksaktualisierung wird für Favoriten nie ausgelöst.
+    """
+    global _refresh_timer
     try:
-        # Lösche den Favoriten-Cache
-        xbmc.executebuiltin('ClearFavouritesCache()')
-        
-        # Aktualisiere die Favoriten-Liste
-        xbmc.executebuiltin('ReloadSkin()')
-        
-        # Aktualisiere den aktuellen Container
-        xbmc.executebuiltin('Container.Refresh()')
-        
-        # Aktualisiere die Favoriten-Ansicht spezifisch
-        xbmc.executebuiltin('UpdateLibrary(video)')
+        favourites = change_set is None or change_set.favourites_changed
+        containers = change_set is None or change_set.local_changed
+        if not favourites and not containers:
+            xbmc.log("No local changes, skipping UI refresh", xbmc.LOGDEBUG)
+            return True
         
-        xbmc.log("Favourites UI refreshed successfully", xbmc.LOGINFO)
+        with _refresh_lock:
+            _pending_refresh['favourites'] |= favourites
+            _pending_refresh['containers'] |= containers
+            if _refresh_timer is not None:
+                _refresh_timer.cancel()
+            _refresh_timer = threading.Timer(REFRESH_DEBOUNCE_SECONDS, _run_ui_refresh)
+            _refresh_timer.daemon = True
+            _refresh_timer.start()
         return True
     except Exception as e:
         xbmc.log(f"Error refreshing favourites UI: {str(e)}", xbmc.LOGERROR)
         return False
 
+def _run_ui_refresh():
+    """Führt die gesammelten UI-Aktualisierungen aus"""
+    global _refresh_timer
+    with _refresh_lock:
+        favourites = _pending_refresh['favourites']
+        containers = _pending_refresh['containers']
+        _pending_refresh['favourites'] = _pending_refresh['containers'] = False
+        _refresh_timer = None
+    try:
+        if favourites:
+            # Favoriten werden von Kodi erst beim Neuladen des Skins neu eingelesen
+            xbmc.executebuiltin('ReloadSkin()')
+        elif containers:
+            # Super-Favourites-Ordner: die aktuelle Liste neu laden genügt
+            xbmc.executebuiltin('Container.Refresh()')
+        xbmc.log("Favourites UI refreshed successfully", xbmc.LOGINFO)
+    except Exception as e:
+        xbmc.log(f"Error refreshing favourites UI: {str(e)}", xbmc.LOGERROR)
+
 class FavouritesCategoryManager:
     """Verwaltet die Kategorisierung von Favoriten mit Platzhaltern"""
     
@@ -289,7 +428,10 @@ class FavouritesCategoryManager:
             return False
     
     def auto_categorize_favourites(self) -> bool:
-        """Automatische Kategorisierung basierend auf Favoriten-Namen"""
+        """Automatische Kategorisierung basierend auf Favoriten-Namen
+        
+        Gibt nur True zurück, wenn die Favoriten-Datei tatsächlich neu geschrieben wurde.
+        """
         if not self.config.auto_categorize or not self.config.enable_categories:
             return False
         
@@ -303,6 +445,9 @@ class FavouritesCategoryManager:
             
             # Kategorisiere Favoriten
             categorized_content = self.categorize_favourites(content)
+            if categorized_content == content:
+                # Bereits kategorisiert - Datei nicht neu schreiben
+                return False
             
             # Speichere kategorisierte Favoriten
             with open(self.config.local_favourites, 'w', encoding='utf-8') as f:
@@ -321,20 +466,22 @@ def detect_system_type():
     try:
         # Prüfe, ob bereits eine Konfiguration existiert
         if config.custom_folder and config.ftp_host:
-            # Versuche, eine Verbindung zum FTP-Server herzustellen
-            with ftplib.FTP(config.ftp_host) as ftp:
-                ftp.login(config.ftp_user, config.ftp_pass)
-                
+            # Versuche, eine Verbindung zum FTP-Server herzustellen (aus dem Pool)
+            ftp_manager = FTPManager(config.ftp_host, config.ftp_user, config.ftp_pass, **connection_options(config))
+            try:
                 # Prüfe, ob bereits ein Hauptsystem existiert
                 main_system_marker = f"/{config.ftp_base_path}/auto_fav_sync/{config.custom_folder}/.main_system"
                 
                 try:
-                    ftp.cwd(main_system_marker)
+                    with ftp_manager.get_connection() as ftp:
+                        ftp.cwd(main_system_marker)
                     # Hauptsystem existiert bereits
                     return False  # Dieses System wird Subsystem
-                except:
+                except ftplib.error_perm:
                     # Kein Hauptsystem gefunden, dieses wird das Hauptsystem
                     return True
+            finally:
+                ftp_manager.close()
     except Exception as e:
         xbmc.log(f"Error detecting system type: {str(e)}", xbmc.LOGERROR)
         # Fallback: Verwende die aktuelle Einstellung
@@ -344,7 +491,12 @@ def detect_system_type():
 
 
 class SyncManager:
-    """Verwaltet die echte bidirektionale Synchronisation"""
+    """Verwaltet die echte bidirektionale Synchronisation
+    
+    Der Status wird einmal geladen und im Speicher gehalten. Innerhalb von
+    ``batch()`` werden Änderungen gesammelt und beim Verlassen einmal atomar
+    geschrieben; außerhalb wird nach jeder Änderung sofort geschrieben.
+    """
     
     def __init__(self, config):
         self.config = config
@@ -352,7 +504,19 @@ class SyncManager:
             xbmcvfs.translatePath('special://userdata/addon_data/script.auto.ftp.sync'),
             'sync_state.json'
         )
+        # Zuletzt gelesene Remote-Metadaten je Remote-Pfad (aus needs_sync)
+        self._remote_stats: Dict[str, Optional[Dict]] = {}
+        # Remote-Manifest des aktuellen Laufs (siehe RemoteManifest)
+        self.manifest: Optional['RemoteManifest'] = None
+        self._batch_depth = 0
+        # Schützt Status, Manifest und Remote-Metadaten bei paralleler Synchronisation
+        self._lock = threading.RLock()
         self.ensure_sync_dir()
+        self.store = open_sync_state_store(os.path.dirname(self.sync_state_file), config.state_backend)
+        self.hash_cache = HashCache(os.path.join(os.path.dirname(self.sync_state_file), 'hash_cache.json'))
+        self.merge_bases = MergeBaseStore(os.path.join(os.path.dirname(self.sync_state_file), 'merge_base'))
+        # Durch Kompaktierung überholte Patches, werden nach dem Speichern des Manifests gelöscht
+        self.obsolete_patches: List[str] = []
     
     def ensure_sync_dir(self):
         """Stellt sicher, dass das Sync-Verzeichnis existiert"""
@@ -360,83 +524,319 @@ class SyncManager:
         if not os.path.exists(sync_dir):
             os.makedirs(sync_dir, exist_ok=True)
     
-    def get_file_hash(self, file_path: str) -> str:
-        """Berechnet den Hash einer Datei"""
+    def get_file_hash(self, file_path: str, algorithm: str = None) -> str:
+        """Berechnet den Hash einer Datei (über den Hash-Cache, solange stat unverändert ist)
+        
+        Ohne ``algorithm`` wird das konfigurierte Verfahren verwendet; Einträge älterer
+        Versionen werden mit MD5 verglichen.
+        """
+        algorithm = algorithm or self.config.hash_algorithm
+        return self.hash_cache.get_or_compute(
+            file_path,
+            lambda path: self._compute_file_hash(path, algorithm),
+            variant=algorithm
+        )
+    
+    def get_content_hash(self, file_path: str, algorithm: str = None) -> Optional[str]:
+        """Semantischer Hash einer favourites.xml (siehe ``canonical_favourites_hash``)
+        
+        Für andere Dateien oder nicht lesbares XML wird None geliefert; dann gilt
+        der Byte-Hash aus ``get_file_hash``.
+        """
+        if os.path.basename(file_path) != 'favourites.xml':
+            return None
+        algorithm = algorithm or self.config.hash_algorithm
+        content_hash = self.hash_cache.get_or_compute(
+            file_path,
+            lambda path: canonical_favourites_hash(path, algorithm) or "",
+            variant=algorithm + CANONICAL_VARIANT_SUFFIX
+        )
+        return content_hash or None
+    
+    def content_matches(self, entry: Dict, hash_key: str, local_path: str) -> bool:
+        """Vergleicht die lokale Datei mit einem Status- oder Manifest-Eintrag
+        
+        Enthält der Eintrag einen semantischen ``content_hash``, zählen nur echte
+        Änderungen an den Favoriten; sonst wird der Byte-Hash unter ``hash_key`` verglichen.
+        """
+        algorithm = entry.get('hash_algo', LEGACY_HASH_ALGORITHM)
+        if entry.get('content_hash'):
+            content_hash = self.get_content_hash(local_path, algorithm)
+            if content_hash:
+                return entry['content_hash'] == content_hash
+        return entry.get(hash_key) == self.get_file_hash(local_path, algorithm)
+    
+    @staticmethod
+    def _compute_file_hash(file_path: str, algorithm: str) -> str:
+        """Liest die Datei blockweise und berechnet ihren Hash"""
         if not os.path.exists(file_path):
             return ""
         try:
-            with open(file_path, 'rb') as f:
-                return hashlib.md5(f.read()).hexdigest()
-        except:
+            return hash_file(file_path, algorithm)
+        except Exception as e:
+            xbmc.log(f"Error hashing {file_path}: {str(e)}", xbmc.LOGERROR)
             return ""
     
-    def get_sync_state(self) -> Dict:
-        """Lädt den aktuellen Synchronisationsstatus"""
+    @contextmanager
+    def batch(self):
+        """Sammelt Statusänderungen und schreibt sie beim Verlassen einmal atomar"""
+        self._batch_depth += 1
         try:
-            if os.path.exists(self.sync_state_file):
-                with open(self.sync_state_file, 'r') as f:
-                    return json.load(f)
-        except:
-            pass
-        return {}
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+    
+    def flush(self) -> bool:
+        """Schreibt geänderten Status atomar auf die Festplatte"""
+        self.hash_cache.flush()
+        return self.store.flush()
+    
+    def _changed(self):
+        """Schreibt sofort, sofern kein Batch aktiv ist"""
+        if self._batch_depth == 0:
+            self.flush()
+    
+    def close(self):
+        """Schreibt offene Änderungen und schließt den Status-Store"""
+        self.hash_cache.flush()
+        self.hash_cache.log_stats()
+        self.store.close()
+    
+    def get_sync_state(self) -> Dict:
+        """Liefert eine Kopie des aktuellen Synchronisationsstatus"""
+        return self.store.all()
     
     def save_sync_state(self, state: Dict):
-        """Speichert den Synchronisationsstatus"""
-        try:
-            with open(self.sync_state_file, 'w') as f:
-                json.dump(state, f, indent=2)
-        except Exception as e:
-            xbmc.log(f"Error saving sync state: {str(e)}", xbmc.LOGERROR)
+        """Ersetzt den gesamten Synchronisationsstatus"""
+        self.store.replace_all(state)
+        self._changed()
     
-    def needs_sync(self, local_path: str, remote_path: str) -> bool:
-        """Prüft, ob eine Datei synchronisiert werden muss"""
-        state = self.get_sync_state()
-        local_hash = self.get_file_hash(local_path)
+    def needs_sync(self, local_path: str, remote_path: str, connection_manager: 'ConnectionManager' = None) -> bool:
+        """Prüft, ob eine Datei synchronisiert werden muss
+        
+        Ist ein Verbindungsmanager angegeben, wird die Remote-Seite über ``stat``
+        (Größe, Änderungszeit, ETag) geprüft statt die Datei zu übertragen.
+        """
+        local_entry = self.store.get(local_path)
+        remote_entry = self.store.get(remote_path)
+        
+        # Das Manifest beschreibt den Remote-Inhalt ohne weiteren Roundtrip
+        manifest_entry = self.manifest.get_entry(remote_path) if self.manifest else None
+        if manifest_entry is not None:
+            # Mit Patches beschreibt 'head' den neuesten Stand, der Eintrag selbst die ganze Datei
+            return not self.content_matches(manifest_entry.get('head') or manifest_entry, 'hash', local_path)
         
         # Prüfe, ob sich die lokale Datei geändert hat
-        if state.get(local_path, {}).get('local_hash') != local_hash:
+        if not local_entry:
+            return True
+        if not self.content_matches(local_entry, 'local_hash', local_path):
             return True
         
-        # Prüfe, ob die Remote-Datei neuer ist
-        remote_timestamp = state.get(remote_path, {}).get('timestamp', 0)
-        local_timestamp = state.get(local_path, {}).get('timestamp', 0)
+        # Prüfe die Remote-Metadaten (ein kleiner Roundtrip pro Datei)
+        if connection_manager is not None:
+            remote_stat = connection_manager.stat(remote_path)
+            with self._lock:
+                self._remote_stats[remote_path] = remote_stat
+            if remote_stat is not None:
+                return self.remote_changed(remote_entry, remote_stat)
+        
+        # Fallback: Prüfe, ob die Remote-Datei laut Status neuer ist
+        remote_timestamp = remote_entry.get('timestamp', 0)
+        local_timestamp = local_entry.get('timestamp', 0)
         
         return remote_timestamp > local_timestamp
     
-    def update_sync_state(self, local_path: str, remote_path: str, is_upload: bool):
-        """Aktualisiert den Synchronisationsstatus"""
-        state = self.get_sync_state()
+    def publish_patch(self, local_path: str, remote_path: str, seq: int):
+        """Trägt einen hochgeladenen Patch ein: ``local_path`` ist der neue Stand nach Patch ``seq``"""
+        algorithm = self.config.hash_algorithm
+        head = {
+            'hash': self.get_file_hash(local_path, algorithm),
+            'hash_algo': algorithm,
+            'size': os.path.getsize(local_path)
+        }
+        content_hash = self.get_content_hash(local_path, algorithm)
+        if content_hash:
+            head['content_hash'] = content_hash
+        with self._lock:
+            self.manifest.set_head(remote_path, seq, head)
+        self.update_sync_state(local_path, remote_path, False, seq=seq)
+    
+    def publish_bundle(self, remote_path: str, bundle_hash: str, size: int, algorithm: str, members: Dict):
+        """Trägt ein hochgeladenes Archiv samt Index in das Manifest ein"""
+        with self._lock:
+            if self.manifest is not None:
+                self.manifest.update_entry(remote_path, bundle_hash, size, algorithm, members=members)
+    
+    @staticmethod
+    def remote_changed(remote_entry: Dict, remote_stat: Dict) -> bool:
+        """Vergleicht gespeicherte Remote-Metadaten mit einem aktuellen ``stat``-Ergebnis"""
+        if remote_entry.get('remote_etag') and remote_stat.get('etag'):
+            return remote_entry['remote_etag'] != remote_stat['etag']
+        if 'remote_size' not in remote_entry or 'remote_mtime' not in remote_entry:
+            # Keine Metadaten aus einem früheren Lauf bekannt
+            return True
+        return (remote_entry['remote_size'] != remote_stat.get('size')
+                or remote_entry['remote_mtime'] != remote_stat.get('mtime'))
+    
+    def upload_content(self, local_path: str) -> Dict:
+        """Inhalts-Hash einer hochzuladenden Datei (erlaubt fortsetzbare Uploads)"""
+        algorithm = self.config.hash_algorithm
+        return {'hash': self.get_file_hash(local_path, algorithm), 'hash_algo': algorithm}
+    
+    def download_content(self, remote_path: str) -> Optional[Dict]:
+        """Erwarteter Inhalt einer Remote-Datei laut Manifest (erlaubt fortsetzbare Downloads)"""
+        with self._lock:
+            if self.manifest is None:
+                return None
+            return self.manifest.get_entry(remote_path)
+    
+    def update_sync_state(self, local_path: str, remote_path: str, is_upload: bool, connection_manager: 'ConnectionManager' = None, seq: int = None, compressed: str = None):
+        """Aktualisiert den Synchronisationsstatus
+        
+        ``seq`` ist die Sequenznummer des zuletzt angewendeten Patches (Delta-Uploads),
+        ``compressed`` die tatsächlich hochgeladene Nebendatei (siehe ``upload_file``).
+        """
         timestamp = time.time()
+        algorithm = self.config.hash_algorithm
+        local_hash = self.get_file_hash(local_path, algorithm)
+        content_hash = self.get_content_hash(local_path, algorithm)
+        local_entry = {
+            'local_hash': local_hash,
+            'hash_algo': algorithm,
+            'timestamp': timestamp
+        }
+        if content_hash:
+            local_entry['content_hash'] = content_hash
+        if seq is not None:
+            local_entry['seq'] = seq
+        remote_entry = {
+            'remote_hash': local_hash,
+            'hash_algo': algorithm,
+            'timestamp': timestamp
+        }
         
-        if is_upload:
-            state[local_path] = {
-                'local_hash': self.get_file_hash(local_path),
-                'timestamp': timestamp
-            }
-            state[remote_path] = {
-                'remote_hash': self.get_file_hash(local_path),
-                'timestamp': timestamp
-            }
-        else:
-            state[local_path] = {
-                'local_hash': self.get_file_hash(local_path),
-                'timestamp': timestamp
-            }
-            state[remote_path] = {
-                'remote_hash': self.get_file_hash(local_path),
-                'timestamp': timestamp
-            }
+        # Manifest für andere Systeme aktualisieren; es ersetzt die Remote-Metadaten
+        manifest_known = False
+        with self._lock:
+            if self.manifest is not None:
+                if is_upload:
+                    compacted = self.manifest.update_entry(remote_path, local_hash, os.path.getsize(local_path), algorithm, content_hash,
+                                                           compressed,
+                                                           object_hash=local_hash if self.config.content_addressed_store else None)
+                    self.obsolete_patches.extend(favourites_patch_path(remote_path, patch_seq) for patch_seq in compacted)
+                manifest_known = self.manifest.get_entry(remote_path) is not None
+            
+            # Remote-Metadaten merken: nach einem Upload hat der Server neue Werte,
+            # nach einem Download gilt das Ergebnis aus needs_sync weiter
+            remote_stat = self._remote_stats.pop(remote_path, None)
+        if not manifest_known:
+            if connection_manager is not None and (is_upload or remote_stat is None):
+                remote_stat = connection_manager.stat(remote_path)
+            if remote_stat is not None:
+                remote_entry.update({
+                    'remote_size': remote_stat.get('size'),
+                    'remote_mtime': remote_stat.get('mtime'),
+                    'remote_etag': remote_stat.get('etag')
+                })
         
-        self.save_sync_state(state)
+        with self._lock:
+            self.store.set(local_path, local_entry)
+            self.store.set(remote_path, remote_entry)
+            self._changed()
+
+class SyncChangeSet:
+    """Sammelt, welche Dateien ein Sync-Lauf tatsächlich übertragen hat"""
+    
+    def __init__(self, config):
+        self.config = config
+        self.uploaded: List[str] = []
+        self.downloaded: List[str] = []
+        self.rewritten: List[str] = []
+        # Heruntergeladen, aber inhaltsgleich - lokal nichts geändert
+        self.unchanged: List[str] = []
+        self._lock = threading.Lock()
+    
+    def record_upload(self, local_path: str):
+        with self._lock:
+            self.uploaded.append(local_path)
+    
+    def record_download(self, local_path: str, result: TransferResult = None):
+        with self._lock:
+            if result is not None and result.unchanged:
+                self.unchanged.append(local_path)
+            else:
+                self.downloaded.append(local_path)
+    
+    def record_rewrite(self, local_path: str):
+        """Lokale Datei wurde ohne Übertragung geändert (z. B. Kategorisierung)"""
+        with self._lock:
+            self.rewritten.append(local_path)
+    
+    @property
+    def changed(self) -> bool:
+        return bool(self.uploaded or self.downloaded or self.rewritten)
+    
+    @property
+    def local_changed(self) -> bool:
+        """Lokale Dateien wurden geändert (nur dann muss die UI neu laden)"""
+        return bool(self.downloaded or self.rewritten)
+    
+    @property
+    def favourites_changed(self) -> bool:
+        local_favourites = self.config.local_favourites
+        return local_favourites in self.downloaded or local_favourites in self.rewritten
+    
+    def summary(self) -> str:
+        return (f"{len(self.uploaded)} uploaded, {len(self.downloaded)} downloaded, "
+                f"{len(self.unchanged)} unchanged, {len(self.rewritten)} rewritten")
+
+# Standardwerte, falls ein Verbindungsmanager ohne Einstellungen erzeugt wird
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 30
+DEFAULT_CONNECT_RETRIES = 2
+# Freie Verbindungen bleiben bis kurz nach dem nächsten planmäßigen Lauf im Pool
+POOL_IDLE_MARGIN = 60
 
 class ConnectionManager:
-    """Abstrakte Basisklasse für alle Verbindungsmanager"""
+    """Abstrakte Basisklasse für alle Verbindungsmanager
+    
+    Verbindungen werden mit ``timeout`` (Verbindungsaufbau) und ``read_timeout``
+    (laufende Übertragungen) aufgebaut. Vorübergehende Fehler beim Aufbau werden
+    bis zu ``retries`` Mal mit gestreutem Backoff wiederholt; nach wiederholten
+    Fehlern schlägt der Circuit Breaker des Hosts bis zum Ablauf der Wartezeit sofort fehl.
+    """
+    
+    # Fehler, bei denen sich ein erneuter Verbindungsversuch lohnt
+    TRANSIENT_ERRORS = (OSError, EOFError, ftplib.error_temp)
     
     def __init__(self, host: str, user: str, password: str, **kwargs):
         self.host = host
         self.user = user
         self.password = password
         self._connection = None
+        self.timeout = kwargs.get('timeout', DEFAULT_CONNECT_TIMEOUT)
+        self.read_timeout = kwargs.get('read_timeout', DEFAULT_READ_TIMEOUT)
+        self.retries = kwargs.get('retries', DEFAULT_CONNECT_RETRIES)
+        self.buffer_size = kwargs.get('buffer_size', DEFAULT_BUFFER_SIZE)
+        self.idle_timeout = kwargs.get('idle_timeout', DEFAULT_IDLE_TIMEOUT)
+        self.breaker = get_breaker(host)
+    
+    def _connect(self):
+        """Baut eine neue Verbindung auf - muss von Unterklassen implementiert werden"""
+        raise NotImplementedError
+    
+    def _is_transient(self, error: Exception) -> bool:
+        return isinstance(error, self.TRANSIENT_ERRORS)
+    
+    def _create_connection(self):
+        """Pool-Factory: ``_connect`` mit Circuit Breaker und begrenzten Wiederholungen"""
+        return self.breaker.call(lambda: retry_with_backoff(self._connect, self.retries, self._is_transient))
+    
+    def _acquire(self):
+        """Leiht eine Verbindung aus dem Pool; Verbindungen mit anderen Timeouts werden neu aufgebaut"""
+        return self._pool.acquire(self._create_connection, (self.timeout, self.read_timeout))
     
     @contextmanager
     def get_connection(self):
@@ -447,17 +847,37 @@ class ConnectionManager:
         """Schließt die Verbindung - muss von Unterklassen implementiert werden"""
         raise NotImplementedError
     
-    def upload_file(self, local_path: str, remote_path: str) -> bool:
-        """Lädt eine Datei hoch - muss von Unterklassen implementiert werden"""
+    def upload_file(self, local_path: str, remote_path: str, expected: Optional[Dict] = None) -> bool:
+        """Lädt eine Datei hoch - muss von Unterklassen implementiert werden
+        
+        ``expected`` ({'hash', 'hash_algo'}) beschreibt den zu übertragenden Inhalt
+        und erlaubt Backends, eine abgebrochene Übertragung fortzusetzen.
+        """
         raise NotImplementedError
     
-    def download_file(self, remote_path: str, local_path: str) -> bool:
+    def download_file(self, remote_path: str, local_path: str, expected: Optional[Dict] = None) -> bool:
         """Lädt eine Datei herunter - muss von Unterklassen implementiert werden"""
         raise NotImplementedError
     
     def folder_exists(self, folder_path: str) -> bool:
         """Prüft, ob ein Ordner existiert - muss von Unterklassen implementiert werden"""
         raise NotImplementedError
+    
+    def stat(self, remote_path: str) -> Optional[Dict]:
+        """Liefert Remote-Metadaten ({'size', 'mtime', 'etag'}) oder None - muss von Unterklassen implementiert werden"""
+        raise NotImplementedError
+    
+    def file_missing(self, remote_path: str) -> bool:
+        """True nur, wenn der Server bestätigt, dass die Datei fehlt (nicht bei Verbindungsfehlern) - muss von Unterklassen implementiert werden"""
+        raise NotImplementedError
+    
+    def rename_file(self, source_path: str, target_path: str) -> bool:
+        """Benennt eine Remote-Datei um und ersetzt das Ziel - muss von Unterklassen implementiert werden"""
+        raise NotImplementedError
+    
+    def delete_file(self, remote_path: str) -> bool:
+        """Löscht eine Remote-Datei - muss von Unterklassen implementiert werden"""
+        raise NotImplementedError
 
 class FTPManager(ConnectionManager):
     """Verwaltet FTP-Verbindungen mit Wiederverwendung"""
@@ -465,70 +885,216 @@ class FTPManager(ConnectionManager):
     def __init__(self, host: str, user: str, password: str, **kwargs):
         super().__init__(host, user, password, **kwargs)
         self._connection: Optional[ftplib.FTP] = None
+        self._pool = get_pool(('ftp', host, user, password), probe=self._probe, closer=self._quit,
+                              idle_timeout=self.idle_timeout)
+        self._dir_cache_key = ('ftp', host)
+    
+    def _connect(self) -> ftplib.FTP:
+        """Baut eine neue FTP-Verbindung auf (über ``_create_connection``)"""
+        connection = ftplib.FTP(self.host, timeout=self.timeout)
+        connection.login(self.user, self.password)
+        # Nach dem Login gilt für Steuer- und Datenverbindung das Lese-Timeout
+        connection.sock.settimeout(self.read_timeout)
+        connection.timeout = self.read_timeout
+        xbmc.log("FTP connection established", xbmc.LOGINFO)
+        return connection
+    
+    @staticmethod
+    def _probe(connection: ftplib.FTP):
+        """Keepalive-Probe vor der Wiederverwendung"""
+        connection.voidcmd('NOOP')
+    
+    @staticmethod
+    def _quit(connection: ftplib.FTP):
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
     
     @contextmanager
     def get_connection(self):
-        """Kontextmanager für FTP-Verbindungen"""
+        """Kontextmanager für FTP-Verbindungen aus dem Verbindungspool"""
         try:
             if self._connection is None:
-                self._connection = ftplib.FTP(self.host)
-                self._connection.login(self.user, self.password)
-                xbmc.log("FTP connection established", xbmc.LOGINFO)
+                self._connection = self._acquire()
             yield self._connection
+        except ftplib.error_perm:
+            # Befehlsfehler (z. B. 550) - die Verbindung bleibt nutzbar
+            raise
         except Exception as e:
             xbmc.log(f"FTP connection error: {str(e)}", xbmc.LOGERROR)
             if self._connection:
-                try:
-                    self._connection.quit()
-                except:
-                    pass
+                self._pool.release(self._connection, broken=True)
                 self._connection = None
             raise
     
     def close(self):
-        """Schließt die FTP-Verbindung"""
+        """Gibt die FTP-Verbindung an den Pool zurück"""
         if self._connection:
-            try:
-                self._connection.quit()
-                xbmc.log("FTP connection closed", xbmc.LOGINFO)
-            except Exception as e:
-                xbmc.log(f"Error closing FTP connection: {str(e)}", xbmc.LOGERROR)
-            finally:
-                self._connection = None
+            self._pool.release(self._connection)
+            self._connection = None
     
-    def upload_file(self, local_path: str, remote_path: str) -> bool:
-        """Lädt eine Datei zum FTP-Server hoch"""
+    def upload_file(self, local_path: str, remote_path: str, expected: Optional[Dict] = None) -> bool:
+        """Lädt eine Datei zum FTP-Server hoch
+        
+        Geschrieben wird in eine Teildatei, die nach der Größenprüfung umbenannt
+        wird. Mit bekanntem Inhalts-Hash (``expected``) setzt ein erneuter Versuch
+        eine abgebrochene Teildatei per ``REST`` fort; die lokale Datei muss diesen
+        Hash haben, eine fortgesetzte Teildatei wird vor dem Umbenennen zusätzlich
+        über ihren Hash geprüft. Ohne ``SIZE`` ist die Größe unbekannt: Dann wird
+        nicht fortgesetzt, sondern von vorn übertragen und (mit ``expected``) der
+        Hash geprüft. Teildateien früherer Inhalte werden danach gelöscht, nicht
+        fortsetzbare Teildateien nach einem Fehler sofort.
+        """
+        part_path, resumable = partial_path(remote_path, expected)
+        storing = False
         try:
             if not os.path.exists(local_path):
                 xbmc.log(f"Local file does not exist: {local_path}", xbmc.LOGERROR)
                 return False
                 
+            # Stelle sicher, dass der Remote-Ordner existiert
+            remote_dir = os.path.dirname(remote_path)
+            if remote_dir and remote_dir != '/':
+                self._ensure_remote_directory(remote_dir)
+            
+            if resumable and not verify_partial(local_path, None, expected):
+                # Die Datei hat sich seit dem Hashen geändert
+                return False
+            local_size = os.path.getsize(local_path)
+            started = time.monotonic()
             with self.get_connection() as ftp:
+                ftp.voidcmd('TYPE I')
+                offset = resume_offset(self._size(ftp, part_path), local_size) if resumable else 0
+                storing = True
                 with open(local_path, 'rb') as file:
-                    ftp.storbinary(f'STOR {remote_path}', file)
+                    self._store(ftp, part_path, file, offset)
+                uploaded = self._size(ftp, part_path)
+                if uploaded is None and expected and expected.get('hash'):
+                    # Server ohne SIZE: Vollständigkeit nur über den Hash feststellbar
+                    verified = self._hash(ftp, part_path, expected) == expected['hash']
+                else:
+                    verified = not offset or self._hash(ftp, part_path, expected) == expected['hash']
+            if uploaded is not None and uploaded != local_size:
+                xbmc.log(f"FTP upload incomplete: {uploaded} of {local_size} bytes", xbmc.LOGERROR)
+                if not resumable:
+                    self.delete_file(part_path)
+                return False
+            if not verified:
+                xbmc.log(f"FTP upload hash mismatch for {part_path}, discarding", xbmc.LOGERROR)
+                self.delete_file(part_path)
+                return False
+            if not self.rename_file(part_path, remote_path):
+                return False
+            if resumable:
+                self._discard_stale_parts(remote_path, part_path)
             xbmc.log(f"Successfully uploaded: {local_path} -> {remote_path}", xbmc.LOGINFO)
+            log_throughput('FTP', 'upload', remote_path, local_size - offset, started)
             return True
         except Exception as e:
             xbmc.log(f"FTP upload failed: {str(e)}", xbmc.LOGERROR)
+            get_dir_cache().invalidate(self._dir_cache_key, os.path.dirname(remote_path))
+            if storing and not resumable:
+                # Nur fortsetzbare Teildateien bleiben für den nächsten Versuch liegen
+                self.delete_file(part_path)
             return False
     
-    def download_file(self, remote_path: str, local_path: str) -> bool:
-        """Lädt eine Datei vom FTP-Server herunter"""
+    def download_file(self, remote_path: str, local_path: str, expected: Optional[Dict] = None) -> bool:
+        """Lädt eine Datei vom FTP-Server herunter
+        
+        Die Datei entsteht als lokale Teildatei (fortsetzbar per ``REST``) und ersetzt
+        ``local_path`` erst nach erfolgreicher Größen- (und mit ``expected`` Hash-)Prüfung,
+        und nur wenn sich der Inhalt unterscheidet (siehe ``TransferResult.unchanged``).
+        """
+        part_path, resumable = partial_path(local_path, expected)
+        if resumable:
+            discard_stale_partials(local_path, part_path)
         try:
+            # Stelle sicher, dass der lokale Ordner existiert
+            local_dir = os.path.dirname(local_path)
+            if local_dir and not os.path.exists(local_dir):
+                os.makedirs(local_dir, exist_ok=True)
+            
+            started = time.monotonic()
             with self.get_connection() as ftp:
-                with open(local_path, 'wb') as file:
-                    ftp.retrbinary(f'RETR {remote_path}', file.write)
+                ftp.voidcmd('TYPE I')
+                remote_size = self._size(ftp, remote_path)
+                part_size = os.path.getsize(part_path) if os.path.exists(part_path) else None
+                offset = resume_offset(part_size, remote_size) if resumable else 0
+                with open(part_path, 'ab' if offset else 'wb') as file:
+                    offset = self._retrieve(ftp, remote_path, file, offset)
+            if not verify_partial(part_path, remote_size, expected):
+                os.remove(part_path)
+                return False
+            result = replace_if_changed(part_path, local_path)
             xbmc.log(f"Successfully downloaded: {remote_path} -> {local_path}", xbmc.LOGINFO)
-            return True
+            log_throughput('FTP', 'download', remote_path, result.size - offset, started)
+            return result
         except Exception as e:
+            # Fortsetzbare Teildateien bleiben für den nächsten Versuch liegen
             xbmc.log(f"FTP download failed: {str(e)}", xbmc.LOGERROR)
+            if not resumable:
+                discard_partial(part_path)
             return False
     
+    @staticmethod
+    def _size(ftp: ftplib.FTP, path: str) -> Optional[int]:
+        """Dateigröße per ``SIZE`` (erwartet ``TYPE I``) oder None"""
+        try:
+            return ftp.size(path)
+        except ftplib.error_perm:
+            return None
+    
+    def _hash(self, ftp: ftplib.FTP, path: str, expected: Dict) -> str:
+        """Hash einer Remote-Datei (liest sie einmal vollständig)"""
+        digest = hashlib.new(expected.get('hash_algo') or LEGACY_HASH_ALGORITHM)
+        ftp.retrbinary(f'RETR {path}', digest.update, blocksize=self.buffer_size)
+        return digest.hexdigest()
+    
+    def _discard_stale_parts(self, remote_path: str, current_part: str):
+        """Löscht Teildateien abgebrochener Uploads früherer Inhalte neben ``remote_path``"""
+        remote_dir = os.path.dirname(remote_path)
+        try:
+            with self.get_connection() as ftp:
+                for name in stale_partials(remote_path, ftp.nlst(remote_dir), current_part):
+                    ftp.delete(f"{remote_dir}/{name}")
+                    xbmc.log(f"Removed stale partial upload {remote_dir}/{name}", xbmc.LOGDEBUG)
+        except Exception as e:
+            xbmc.log(f"Could not remove stale partial uploads: {str(e)}", xbmc.LOGDEBUG)
+    
+    def _store(self, ftp: ftplib.FTP, path: str, file, offset: int):
+        if offset:
+            file.seek(offset)
+            try:
+                ftp.storbinary(f'STOR {path}', file, blocksize=self.buffer_size, rest=offset)
+                xbmc.log(f"Resumed FTP upload of {path} at byte {offset}", xbmc.LOGINFO)
+                return
+            except (ftplib.error_perm, ftplib.error_reply) as e:
+                # Server ohne REST für STOR: von vorn beginnen
+                xbmc.log(f"FTP upload resume rejected ({str(e)}), restarting", xbmc.LOGWARNING)
+                file.seek(0)
+        ftp.storbinary(f'STOR {path}', file, blocksize=self.buffer_size)
+    
+    def _retrieve(self, ftp: ftplib.FTP, path: str, file, offset: int) -> int:
+        """Lädt ab ``offset`` in ``file`` und liefert den tatsächlich genutzten Offset"""
+        if offset:
+            try:
+                ftp.retrbinary(f'RETR {path}', file.write, blocksize=self.buffer_size, rest=offset)
+                xbmc.log(f"Resumed FTP download of {path} at byte {offset}", xbmc.LOGINFO)
+                return offset
+            except (ftplib.error_perm, ftplib.error_reply) as e:
+                xbmc.log(f"FTP download resume rejected ({str(e)}), restarting", xbmc.LOGWARNING)
+                file.seek(0)
+                file.truncate()
+        ftp.retrbinary(f'RETR {path}', file.write, blocksize=self.buffer_size)
+        return 0
+    
     def folder_exists(self, folder_path: str) -> bool:
         """Prüft, ob ein Ordner auf dem FTP-Server existiert"""
         try:
             with self.get_connection() as ftp:
                 ftp.cwd(folder_path)
+            get_dir_cache().add(self._dir_cache_key, folder_path)
             return True
         except ftplib.error_perm as e:
             if '550' in str(e):
@@ -536,6 +1102,82 @@ class FTPManager(ConnectionManager):
             else:
                 xbmc.log(f"FTP error: {str(e)}", xbmc.LOGERROR)
                 return False
+    
+    def _ensure_remote_directory(self, remote_dir: str):
+        """Stellt sicher, dass ein Remote-Ordner existiert (über den gemeinsamen Ordner-Cache)"""
+        try:
+            with self.get_connection() as ftp:
+                def exists(path: str) -> bool:
+                    try:
+                        ftp.cwd(path)
+                        return True
+                    except ftplib.error_perm:
+                        return False
+                get_dir_cache().ensure(self._dir_cache_key, remote_dir, exists, ftp.mkd)
+        except Exception as e:
+            xbmc.log(f"Error creating remote directory {remote_dir}: {str(e)}", xbmc.LOGERROR)
+    
+    def stat(self, remote_path: str) -> Optional[Dict]:
+        """Liest Größe (SIZE) und Änderungszeit (MDTM) einer Datei auf dem FTP-Server"""
+        try:
+            with self.get_connection() as ftp:
+                # SIZE ist nur im Binärmodus zuverlässig
+                ftp.voidcmd('TYPE I')
+                size = ftp.size(remote_path)
+                mtime = None
+                try:
+                    response = ftp.sendcmd(f'MDTM {remote_path}')
+                    # Antwort: "213 YYYYMMDDHHMMSS[.sss]" in UTC
+                    timestamp = response.split()[-1][:14]
+                    mtime = calendar.timegm(time.strptime(timestamp, '%Y%m%d%H%M%S'))
+                except (ftplib.error_perm, ValueError):
+                    pass
+            return {'size': size, 'mtime': mtime, 'etag': None}
+        except ftplib.error_perm as e:
+            if '550' not in str(e):
+                xbmc.log(f"FTP stat error: {str(e)}", xbmc.LOGERROR)
+            return None
+        except Exception as e:
+            xbmc.log(f"FTP stat error: {str(e)}", xbmc.LOGERROR)
+            return None
+    
+    def file_missing(self, remote_path: str) -> bool:
+        """Prüft per SIZE, ob der FTP-Server die Datei als nicht vorhanden meldet (550)"""
+        try:
+            with self.get_connection() as ftp:
+                ftp.voidcmd('TYPE I')
+                ftp.size(remote_path)
+            return False
+        except ftplib.error_perm as e:
+            return '550' in str(e)
+        except Exception as e:
+            xbmc.log(f"FTP stat error: {str(e)}", xbmc.LOGERROR)
+            return False
+    
+    def rename_file(self, source_path: str, target_path: str) -> bool:
+        """Benennt eine Datei auf dem FTP-Server um (RNFR/RNTO)"""
+        try:
+            with self.get_connection() as ftp:
+                try:
+                    ftp.rename(source_path, target_path)
+                except ftplib.error_perm:
+                    # Manche Server überschreiben bei RNTO nicht
+                    ftp.delete(target_path)
+                    ftp.rename(source_path, target_path)
+            return True
+        except Exception as e:
+            xbmc.log(f"FTP rename failed: {str(e)}", xbmc.LOGERROR)
+            return False
+    
+    def delete_file(self, remote_path: str) -> bool:
+        """Löscht eine Datei auf dem FTP-Server (DELE)"""
+        try:
+            with self.get_connection() as ftp:
+                ftp.delete(remote_path)
+            return True
+        except Exception as e:
+            xbmc.log(f"FTP delete failed: {str(e)}", xbmc.LOGERROR)
+            return False
 
 class SFTPManager(ConnectionManager):
     """Verwaltet SFTP-Verbindungen mit Wiederverwendung"""
@@ -544,73 +1186,111 @@ class SFTPManager(ConnectionManager):
         super().__init__(host, user, password, **kwargs)
         self.port = port
         self.key_file = key_file
-        self._connection: Optional[paramiko.SSHClient] = None
-        self._sftp: Optional[paramiko.SFTPClient] = None
+        self._connection: Optional['paramiko.SSHClient'] = None
+        self._sftp: Optional['paramiko.SFTPClient'] = None
+        self._pool = get_pool(('sftp', host, port, user, password, key_file), probe=self._probe, closer=self._disconnect,
+                              idle_timeout=self.idle_timeout)
+        self._dir_cache_key = ('sftp', host, port)
+    
+    def _connect(self) -> Tuple:
+        """Baut eine neue SSH-Verbindung mit SFTP-Kanal auf (über ``_create_connection``)"""
+        if not load_protocol_module('paramiko'):
+            raise Exception("SFTP not available - paramiko not installed")
+        
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        
+        # Authentifizierung
+        if self.key_file and os.path.exists(self.key_file):
+            # Schlüssel-basierte Authentifizierung
+            client.connect(
+                hostname=self.host,
+                port=self.port,
+                username=self.user,
+                key_filename=self.key_file,
+                timeout=self.timeout,
+                banner_timeout=self.timeout,
+                auth_timeout=self.timeout
+            )
+        else:
+            # Passwort-basierte Authentifizierung
+            client.connect(
+                hostname=self.host,
+                port=self.port,
+                username=self.user,
+                password=self.password,
+                timeout=self.timeout,
+                banner_timeout=self.timeout,
+                auth_timeout=self.timeout
+            )
+        
+        # Keepalive hält die Sitzung zwischen zwei Syncs offen
+        client.get_transport().set_keepalive(30)
+        sftp = client.open_sftp()
+        sftp.get_channel().settimeout(self.read_timeout)
+        xbmc.log("SFTP connection established", xbmc.LOGINFO)
+        return client, sftp
+    
+    def _is_transient(self, error: Exception) -> bool:
+        # SSH-Protokollfehler ja, abgelehnte Anmeldung nicht
+        if paramiko is not None and isinstance(error, paramiko.SSHException):
+            return not isinstance(error, paramiko.AuthenticationException)
+        return super()._is_transient(error)
+    
+    @staticmethod
+    def _probe(connection: Tuple) -> bool:
+        """Prüft vor der Wiederverwendung, ob die SSH-Sitzung noch lebt"""
+        client, sftp = connection
+        transport = client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        transport.send_ignore()
+        return True
+    
+    @staticmethod
+    def _disconnect(connection: Tuple):
+        client, sftp = connection
+        try:
+            sftp.close()
+        finally:
+            client.close()
     
     @contextmanager
     def get_connection(self):
-        """Kontextmanager für SFTP-Verbindungen"""
+        """Kontextmanager für SFTP-Verbindungen aus dem Verbindungspool"""
         try:
             if self._connection is None:
-                if not SFTP_AVAILABLE:
-                    raise Exception("SFTP not available - paramiko not installed")
-                
-                self._connection = paramiko.SSHClient()
-                self._connection.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                
-                # Authentifizierung
-                if self.key_file and os.path.exists(self.key_file):
-                    # Schlüssel-basierte Authentifizierung
-                    self._connection.connect(
-                        hostname=self.host,
-                        port=self.port,
-                        username=self.user,
-                        key_filename=self.key_file
-                    )
-                else:
-                    # Passwort-basierte Authentifizierung
-                    self._connection.connect(
-                        hostname=self.host,
-                        port=self.port,
-                        username=self.user,
-                        password=self.password
-                    )
-                
-                self._sftp = self._connection.open_sftp()
-                xbmc.log("SFTP connection established", xbmc.LOGINFO)
+                self._connection, self._sftp = self._acquire()
             
             yield self._sftp
+        except (FileNotFoundError, PermissionError):
+            # Dateifehler des Servers - die Sitzung bleibt nutzbar
+            raise
         except Exception as e:
             xbmc.log(f"SFTP connection error: {str(e)}", xbmc.LOGERROR)
             if self._connection:
-                try:
-                    self._connection.close()
-                except:
-                    pass
+                self._pool.release((self._connection, self._sftp), broken=True)
                 self._connection = None
                 self._sftp = None
             raise
     
     def close(self):
-        """Schließt die SFTP-Verbindung"""
-        if self._sftp:
-            try:
-                self._sftp.close()
-            except:
-                pass
-            self._sftp = None
-        
+        """Gibt die SFTP-Verbindung an den Pool zurück"""
         if self._connection:
-            try:
-                self._connection.close()
-                xbmc.log("SFTP connection closed", xbmc.LOGINFO)
-            except Exception as e:
-                xbmc.log(f"Error closing SFTP connection: {str(e)}", xbmc.LOGERROR)
-            finally:
-                self._connection = None
+            self._pool.release((self._connection, self._sftp))
+            self._connection = None
+            self._sftp = None
     
-    def upload_file(self, local_path: str, remote_path: str) -> bool:
-        """Lädt eine Datei zum SFTP-Server hoch"""
+    def upload_file(self, local_path: str, remote_path: str, expected: Optional[Dict] = None) -> bool:
+        """Lädt eine Datei zum SFTP-Server hoch
+        
+        Wie bei FTP über eine Teildatei; mit bekanntem Inhalts-Hash wird eine
+        abgebrochene Teildatei ab ihrer aktuellen Größe weitergeschrieben und vor
+        dem Umbenennen über ihren Hash geprüft. Nicht fortsetzbare Teildateien
+        werden nach einem Fehler gelöscht.
+        """
+        part_path, resumable = partial_path(remote_path, expected)
+        storing = False
         try:
             if not os.path.exists(local_path):
                 xbmc.log(f"Local file does not exist: {local_path}", xbmc.LOGERROR)
@@ -621,35 +1301,120 @@ class SFTPManager(ConnectionManager):
             if remote_dir and remote_dir != '/':
                 self._ensure_remote_directory(remote_dir)
             
+            if resumable and not verify_partial(local_path, None, expected):
+                # Die Datei hat sich seit dem Hashen geändert
+                return False
+            local_size = os.path.getsize(local_path)
+            started = time.monotonic()
             with self.get_connection() as sftp:
-                sftp.put(local_path, remote_path)
+                offset = resume_offset(self._size(sftp, part_path), local_size) if resumable else 0
+                storing = True
+                with open(local_path, 'rb') as local_file:
+                    local_file.seek(offset)
+                    with sftp.open(part_path, 'r+b' if offset else 'wb') as remote_file:
+                        remote_file.seek(offset)
+                        remote_file.set_pipelined(True)
+                        copy_stream(local_file, BytesWriter(remote_file), self.buffer_size)
+                uploaded = self._size(sftp, part_path)
+                verified = not offset or self._hash(sftp, part_path, expected) == expected['hash']
+            if offset:
+                xbmc.log(f"Resumed SFTP upload of {part_path} at byte {offset}", xbmc.LOGINFO)
+            if uploaded != local_size:
+                xbmc.log(f"SFTP upload incomplete: {uploaded} of {local_size} bytes", xbmc.LOGERROR)
+                if not resumable:
+                    self.delete_file(part_path)
+                return False
+            if not verified:
+                xbmc.log(f"SFTP upload hash mismatch for {part_path}, discarding", xbmc.LOGERROR)
+                self.delete_file(part_path)
+                return False
+            if not self.rename_file(part_path, remote_path):
+                return False
+            if resumable:
+                self._discard_stale_parts(remote_path, part_path)
             xbmc.log(f"Successfully uploaded: {local_path} -> {remote_path}", xbmc.LOGINFO)
+            log_throughput('SFTP', 'upload', remote_path, local_size - offset, started)
             return True
         except Exception as e:
             xbmc.log(f"SFTP upload failed: {str(e)}", xbmc.LOGERROR)
+            get_dir_cache().invalidate(self._dir_cache_key, os.path.dirname(remote_path))
+            if storing and not resumable:
+                # Nur fortsetzbare Teildateien bleiben für den nächsten Versuch liegen
+                self.delete_file(part_path)
             return False
     
-    def download_file(self, remote_path: str, local_path: str) -> bool:
-        """Lädt eine Datei vom SFTP-Server herunter"""
+    def download_file(self, remote_path: str, local_path: str, expected: Optional[Dict] = None) -> bool:
+        """Lädt eine Datei vom SFTP-Server herunter (fortsetzbar über eine lokale Teildatei)"""
+        part_path, resumable = partial_path(local_path, expected)
+        if resumable:
+            discard_stale_partials(local_path, part_path)
         try:
             # Stelle sicher, dass der lokale Ordner existiert
             local_dir = os.path.dirname(local_path)
             if local_dir and not os.path.exists(local_dir):
                 os.makedirs(local_dir, exist_ok=True)
             
+            started = time.monotonic()
             with self.get_connection() as sftp:
-                sftp.get(remote_path, local_path)
+                remote_size = sftp.stat(remote_path).st_size
+                part_size = os.path.getsize(part_path) if os.path.exists(part_path) else None
+                offset = resume_offset(part_size, remote_size) if resumable else 0
+                with sftp.open(remote_path, 'rb') as remote_file:
+                    remote_file.seek(offset)
+                    remote_file.prefetch(remote_size)
+                    with open(part_path, 'ab' if offset else 'wb') as local_file:
+                        copy_stream(remote_file, local_file, self.buffer_size)
+            if offset:
+                xbmc.log(f"Resumed SFTP download of {remote_path} at byte {offset}", xbmc.LOGINFO)
+            if not verify_partial(part_path, remote_size, expected):
+                os.remove(part_path)
+                return False
+            result = replace_if_changed(part_path, local_path)
             xbmc.log(f"Successfully downloaded: {remote_path} -> {local_path}", xbmc.LOGINFO)
-            return True
+            log_throughput('SFTP', 'download', remote_path, remote_size - offset, started)
+            return result
         except Exception as e:
+            # Fortsetzbare Teildateien bleiben für den nächsten Versuch liegen
             xbmc.log(f"SFTP download failed: {str(e)}", xbmc.LOGERROR)
+            if not resumable:
+                discard_partial(part_path)
             return False
     
+    @staticmethod
+    def _size(sftp, path: str) -> Optional[int]:
+        try:
+            return sftp.stat(path).st_size
+        except FileNotFoundError:
+            return None
+    
+    def _hash(self, sftp, path: str, expected: Dict) -> str:
+        """Hash einer Remote-Datei (liest sie einmal vollständig)"""
+        digest = hashlib.new(expected.get('hash_algo') or LEGACY_HASH_ALGORITHM)
+        with sftp.open(path, 'rb') as remote_file:
+            while True:
+                chunk = remote_file.read(self.buffer_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _discard_stale_parts(self, remote_path: str, current_part: str):
+        """Löscht Teildateien abgebrochener Uploads früherer Inhalte neben ``remote_path``"""
+        remote_dir = os.path.dirname(remote_path)
+        try:
+            with self.get_connection() as sftp:
+                for name in stale_partials(remote_path, sftp.listdir(remote_dir), current_part):
+                    sftp.remove(f"{remote_dir}/{name}")
+                    xbmc.log(f"Removed stale partial upload {remote_dir}/{name}", xbmc.LOGDEBUG)
+        except Exception as e:
+            xbmc.log(f"Could not remove stale partial uploads: {str(e)}", xbmc.LOGDEBUG)
+    
     def folder_exists(self, folder_path: str) -> bool:
         """Prüft, ob ein Ordner auf dem SFTP-Server existiert"""
         try:
             with self.get_connection() as sftp:
                 sftp.stat(folder_path)
+            get_dir_cache().add(self._dir_cache_key, folder_path)
             return True
         except FileNotFoundError:
             return False
@@ -657,20 +1422,71 @@ class SFTPManager(ConnectionManager):
             xbmc.log(f"SFTP error: {str(e)}", xbmc.LOGERROR)
             return False
     
-    def _ensure_remote_directory(self, remote_dir: str):
-        """Stellt sicher, dass ein Remote-Ordner existiert"""
+    def stat(self, remote_path: str) -> Optional[Dict]:
+        """Liest Größe und Änderungszeit einer Datei auf dem SFTP-Server"""
         try:
             with self.get_connection() as sftp:
-                sftp.stat(remote_dir)
+                attributes = sftp.stat(remote_path)
+            return {'size': attributes.st_size, 'mtime': attributes.st_mtime, 'etag': None}
         except FileNotFoundError:
-            # Ordner existiert nicht, erstelle ihn
-            try:
-                parent_dir = os.path.dirname(remote_dir)
-                if parent_dir and parent_dir != '/':
-                    self._ensure_remote_directory(parent_dir)
-                sftp.mkdir(remote_dir)
-            except Exception as e:
-                xbmc.log(f"Error creating remote directory {remote_dir}: {str(e)}", xbmc.LOGERROR)
+            return None
+        except Exception as e:
+            xbmc.log(f"SFTP stat error: {str(e)}", xbmc.LOGERROR)
+            return None
+    
+    def file_missing(self, remote_path: str) -> bool:
+        """Prüft, ob der SFTP-Server die Datei als nicht vorhanden meldet"""
+        try:
+            with self.get_connection() as sftp:
+                sftp.stat(remote_path)
+            return False
+        except FileNotFoundError:
+            return True
+        except Exception as e:
+            xbmc.log(f"SFTP stat error: {str(e)}", xbmc.LOGERROR)
+            return False
+    
+    def rename_file(self, source_path: str, target_path: str) -> bool:
+        """Benennt eine Datei auf dem SFTP-Server atomar um"""
+        try:
+            with self.get_connection() as sftp:
+                try:
+                    sftp.posix_rename(source_path, target_path)
+                except IOError:
+                    # Server ohne posix-rename@openssh.com Erweiterung
+                    try:
+                        sftp.remove(target_path)
+                    except FileNotFoundError:
+                        pass
+                    sftp.rename(source_path, target_path)
+            return True
+        except Exception as e:
+            xbmc.log(f"SFTP rename failed: {str(e)}", xbmc.LOGERROR)
+            return False
+    
+    def delete_file(self, remote_path: str) -> bool:
+        """Löscht eine Datei auf dem SFTP-Server"""
+        try:
+            with self.get_connection() as sftp:
+                sftp.remove(remote_path)
+            return True
+        except Exception as e:
+            xbmc.log(f"SFTP delete failed: {str(e)}", xbmc.LOGERROR)
+            return False
+    
+    def _ensure_remote_directory(self, remote_dir: str):
+        """Stellt sicher, dass ein Remote-Ordner existiert (über den gemeinsamen Ordner-Cache)"""
+        try:
+            with self.get_connection() as sftp:
+                def exists(path: str) -> bool:
+                    try:
+                        sftp.stat(path)
+                        return True
+                    except FileNotFoundError:
+                        return False
+                get_dir_cache().ensure(self._dir_cache_key, remote_dir, exists, sftp.mkdir)
+        except Exception as e:
+            xbmc.log(f"Error creating remote directory {remote_dir}: {str(e)}", xbmc.LOGERROR)
 
 class SMBManager(ConnectionManager):
     """Verwaltet SMB-Verbindungen mit Wiederverwendung"""
@@ -680,37 +1496,63 @@ class SMBManager(ConnectionManager):
         self.share = share
         self.domain = domain
         self._connection = None
+        # smbclient verwaltet die Verbindung selbst; der Pool merkt sich die registrierte
+        # Sitzung, damit nicht bei jedem Zugriff erneut angemeldet wird
+        self._pool = get_pool(('smb', host, user, password, domain), probe=self._probe, idle_timeout=self.idle_timeout)
+        self._dir_cache_key = ('smb', host, share)
+    
+    def _connect(self):
+        """Registriert eine SMB-Sitzung (über ``_create_connection``)"""
+        if not load_protocol_module('smbclient'):
+            raise Exception("SMB not available - smbclient not installed")
+        
+        session = smbclient.register_session(
+            server=self.host,
+            username=self.user,
+            password=self.password,
+            domain=self.domain,
+            connection_timeout=self.timeout
+        )
+        xbmc.log("SMB connection established", xbmc.LOGINFO)
+        return session
+    
+    @staticmethod
+    def _probe(session) -> bool:
+        """SMB2 ECHO vor der Wiederverwendung; tote Sitzungen werden verworfen"""
+        try:
+            session.connection.echo()
+            return True
+        except Exception:
+            try:
+                smbclient.delete_session(session.connection.server_name)
+            except Exception:
+                pass
+            return False
     
     @contextmanager
     def get_connection(self):
-        """Kontextmanager für SMB-Verbindungen"""
+        """Kontextmanager für SMB-Verbindungen aus dem Verbindungspool"""
         try:
-            if not SMB_AVAILABLE:
-                raise Exception("SMB not available - smbclient not installed")
-            
-            # SMB-Verbindung herstellen
-            smbclient.register_session(
-                server=self.host,
-                username=self.user,
-                password=self.password,
-                domain=self.domain
-            )
-            
-            xbmc.log("SMB connection established", xbmc.LOGINFO)
+            if self._connection is None:
+                self._connection = self._acquire()
             yield None  # SMB verwendet globale Funktionen
+        except (FileNotFoundError, PermissionError, FileExistsError):
+            # Dateifehler des Servers - die Sitzung bleibt nutzbar
+            raise
         except Exception as e:
             xbmc.log(f"SMB connection error: {str(e)}", xbmc.LOGERROR)
+            if self._connection is not None:
+                self._pool.release(self._connection, broken=True)
+                self._connection = None
             raise
     
     def close(self):
-        """Schließt die SMB-Verbindung"""
-        try:
-            smbclient.reset_connection_cache()
-            xbmc.log("SMB connection closed", xbmc.LOGINFO)
-        except Exception as e:
-            xbmc.log(f"Error closing SMB connection: {str(e)}", xbmc.LOGERROR)
+        """Gibt die SMB-Sitzung an den Pool zurück"""
+        if self._connection is not None:
+            self._pool.release(self._connection)
+            self._connection = None
     
-    def upload_file(self, local_path: str, remote_path: str) -> bool:
+    def upload_file(self, local_path: str, remote_path: str, expected: Optional[Dict] = None) -> bool:
         """Lädt eine Datei zum SMB-Server hoch"""
         try:
             if not os.path.exists(local_path):
@@ -722,36 +1564,45 @@ class SMBManager(ConnectionManager):
             if remote_dir and remote_dir != '/':
                 self._ensure_remote_directory(remote_dir)
             
+            started = time.monotonic()
             with self.get_connection():
                 smb_path = f"\\\\{self.host}\\{self.share}\\{remote_path}"
                 with open(local_path, 'rb') as local_file:
                     with smbclient.open_file(smb_path, mode='wb') as remote_file:
-                        remote_file.write(local_file.read())
+                        size = copy_stream(local_file, remote_file, self.buffer_size)
             
             xbmc.log(f"Successfully uploaded: {local_path} -> {smb_path}", xbmc.LOGINFO)
+            log_throughput('SMB', 'upload', remote_path, size, started)
             return True
         except Exception as e:
             xbmc.log(f"SMB upload failed: {str(e)}", xbmc.LOGERROR)
+            get_dir_cache().invalidate(self._dir_cache_key, os.path.dirname(remote_path))
             return False
     
-    def download_file(self, remote_path: str, local_path: str) -> bool:
+    def download_file(self, remote_path: str, local_path: str, expected: Optional[Dict] = None) -> bool:
         """Lädt eine Datei vom SMB-Server herunter"""
+        # In eine Nachbardatei laden, damit ein Abbruch die lokale Datei nicht beschädigt
+        part_path = local_path + PART_SUFFIX
         try:
             # Stelle sicher, dass der lokale Ordner existiert
             local_dir = os.path.dirname(local_path)
             if local_dir and not os.path.exists(local_dir):
                 os.makedirs(local_dir, exist_ok=True)
             
+            started = time.monotonic()
             with self.get_connection():
                 smb_path = f"\\\\{self.host}\\{self.share}\\{remote_path}"
                 with smbclient.open_file(smb_path, mode='rb') as remote_file:
-                    with open(local_path, 'wb') as local_file:
-                        local_file.write(remote_file.read())
+                    with open(part_path, 'wb') as local_file:
+                        size = copy_stream(remote_file, local_file, self.buffer_size)
+            result = replace_if_changed(part_path, local_path)
             
             xbmc.log(f"Successfully downloaded: {smb_path} -> {local_path}", xbmc.LOGINFO)
-            return True
+            log_throughput('SMB', 'download', remote_path, size, started)
+            return result
         except Exception as e:
             xbmc.log(f"SMB download failed: {str(e)}", xbmc.LOGERROR)
+            discard_partial(part_path)
             return False
     
     def folder_exists(self, folder_path: str) -> bool:
@@ -760,6 +1611,7 @@ class SMBManager(ConnectionManager):
             with self.get_connection():
                 smb_path = f"\\\\{self.host}\\{self.share}\\{folder_path}"
                 smbclient.listdir(smb_path)
+            get_dir_cache().add(self._dir_cache_key, folder_path)
             return True
         except FileNotFoundError:
             return False
@@ -767,28 +1619,235 @@ class SMBManager(ConnectionManager):
             xbmc.log(f"SMB error: {str(e)}", xbmc.LOGERROR)
             return False
     
-    def _ensure_remote_directory(self, remote_dir: str):
-        """Stellt sicher, dass ein Remote-Ordner existiert"""
+    def stat(self, remote_path: str) -> Optional[Dict]:
+        """Liest Größe und Änderungszeit einer Datei auf dem SMB-Server"""
         try:
             with self.get_connection():
-                smb_path = f"\\\\{self.host}\\{self.share}\\{remote_dir}"
-                smbclient.listdir(smb_path)
+                smb_path = f"\\\\{self.host}\\{self.share}\\{remote_path}"
+                attributes = smbclient.stat(smb_path)
+            return {'size': attributes.st_size, 'mtime': int(attributes.st_mtime), 'etag': None}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            xbmc.log(f"SMB stat error: {str(e)}", xbmc.LOGERROR)
+            return None
+    
+    def file_missing(self, remote_path: str) -> bool:
+        """Prüft, ob der SMB-Server die Datei als nicht vorhanden meldet"""
+        try:
+            with self.get_connection():
+                smbclient.stat(f"\\\\{self.host}\\{self.share}\\{remote_path}")
+            return False
         except FileNotFoundError:
-            # Ordner existiert nicht, erstelle ihn
+            return True
+        except Exception as e:
+            xbmc.log(f"SMB stat error: {str(e)}", xbmc.LOGERROR)
+            return False
+    
+    def rename_file(self, source_path: str, target_path: str) -> bool:
+        """Benennt eine Datei auf dem SMB-Server um und ersetzt das Ziel"""
+        try:
+            with self.get_connection():
+                smb_source = f"\\\\{self.host}\\{self.share}\\{source_path}"
+                smb_target = f"\\\\{self.host}\\{self.share}\\{target_path}"
+                smbclient.replace(smb_source, smb_target)
+            return True
+        except Exception as e:
+            xbmc.log(f"SMB rename failed: {str(e)}", xbmc.LOGERROR)
+            return False
+    
+    def delete_file(self, remote_path: str) -> bool:
+        """Löscht eine Datei auf dem SMB-Server"""
+        try:
+            with self.get_connection():
+                smbclient.remove(f"\\\\{self.host}\\{self.share}\\{remote_path}")
+            return True
+        except Exception as e:
+            xbmc.log(f"SMB delete failed: {str(e)}", xbmc.LOGERROR)
+            return False
+    
+    def _ensure_remote_directory(self, remote_dir: str):
+        """Stellt sicher, dass ein Remote-Ordner existiert (über den gemeinsamen Ordner-Cache)"""
+        try:
+            with self.get_connection():
+                # smbclient.makedirs legt den gesamten Pfad in einem Durchgang an
+                get_dir_cache().ensure(
+                    self._dir_cache_key, remote_dir, exists=None,
+                    makedirs=lambda path: smbclient.makedirs(f"\\\\{self.host}\\{self.share}\\{path}", exist_ok=True)
+                )
+        except Exception as e:
+            xbmc.log(f"Error creating remote directory {remote_dir}: {str(e)}", xbmc.LOGERROR)
+
+MANIFEST_FILE = 'manifest.json'
+
+class RemoteManifest:
+    """Verwaltet die ``manifest.json`` im ``custom_folder`` auf dem Server
+    
+    Das Manifest listet Hash, Größe und Schreiber jeder synchronisierten Datei
+    (relativ zum ``custom_folder``). Es wird einmal pro Lauf geladen, sodass
+    unveränderte Dateien ohne weitere Roundtrips erkannt werden.
+    """
+    
+    def __init__(self, connection_manager: 'ConnectionManager', remote_dir: str, local_dir: str):
+        self.connection_manager = connection_manager
+        self.remote_dir = remote_dir.rstrip('/')
+        self.remote_path = f"{self.remote_dir}/{MANIFEST_FILE}"
+        self.local_dir = local_dir
+        self.files: Dict[str, Dict] = {}
+        self.loaded = False
+        self.dirty = False
+    
+    def relative_path(self, remote_path: str) -> Optional[str]:
+        """Liefert den Pfad relativ zum Manifest-Ordner oder None"""
+        prefix = self.remote_dir + '/'
+        if remote_path.startswith(prefix):
+            return remote_path[len(prefix):]
+        return None
+    
+    def get_entry(self, remote_path: str) -> Optional[Dict]:
+        """Liefert den Manifest-Eintrag für einen Remote-Pfad"""
+        relative = self.relative_path(remote_path)
+        if not self.loaded or relative is None:
+            return None
+        return self.files.get(relative)
+    
+    def update_entry(self, remote_path: str, file_hash: str, size: int, hash_algo: str, content_hash: str = None, compressed: str = None, members: Dict = None, object_hash: str = None) -> range:
+        """Trägt eine hochgeladene Datei in das Manifest ein
+        
+        ``hash`` bleibt der Byte-Hash (für ältere Versionen und die Prüfung
+        fortgesetzter Downloads); ``content_hash`` ist der semantische Hash von favourites.xml.
+        ``compressed`` (z. B. "gzip") kündigt eine komprimierte Nebendatei an; die
+        unkomprimierte Datei bleibt für ältere Versionen bestehen. ``members`` ist der
+        Index eines Archivs (siehe ``sync_static_bundle_real``), ``object_hash`` verweist
+        auf den Inhalt unter ``objects/<hash>`` (siehe ``upload_object``).
+        Die ganze Datei enthält alle bisherigen Patches (Kompaktierung) und erhält
+        die nächste Sequenznummer; geliefert werden die Nummern der überholten Patches.
+        """
+        relative = self.relative_path(remote_path)
+        if relative is None or not self.loaded:
+            # Ohne geladenes Manifest gingen beim Speichern alle fremden Einträge verloren
+            return range(0)
+        previous = self.files.get(relative, {})
+        entry = {
+            'hash': file_hash,
+            'hash_algo': hash_algo,
+            'size': size,
+            'writer': xbmc.getInfoLabel('System.ComputerName'),
+            'updated': time.time()
+        }
+        if content_hash:
+            entry['content_hash'] = content_hash
+        if compressed:
+            entry['compressed'] = compressed
+        if members is not None:
+            entry['members'] = members
+        if object_hash:
+            entry['object'] = object_hash
+        if 'seq' in previous:
+            entry['seq'] = entry['snapshot_seq'] = previous['seq'] + 1
+        self.files[relative] = entry
+        self.dirty = True
+        return range(previous.get('snapshot_seq', 0) + 1, previous.get('seq', 0) + 1)
+    
+    def set_head(self, remote_path: str, seq: int, head: Dict):
+        """Vermerkt Patch ``seq``; ``head`` beschreibt den Inhalt nach allen Patches
+        
+        Hash und Größe des Eintrags beschreiben weiterhin die ganze Datei auf dem
+        Server (Stand ``snapshot_seq``), die ältere Versionen unverändert laden.
+        """
+        relative = self.relative_path(remote_path)
+        if relative is None or not self.loaded or relative not in self.files:
+            return
+        entry = self.files[relative]
+        entry.setdefault('snapshot_seq', entry.get('seq', 0))
+        entry['seq'] = seq
+        entry['head'] = head
+        self.dirty = True
+    
+    def remove_entry(self, remote_path: str) -> bool:
+        """Entfernt den Eintrag einer nicht mehr verwendeten Datei; True, wenn es ihn gab"""
+        relative = self.relative_path(remote_path)
+        if relative is None or not self.loaded or relative not in self.files:
+            return False
+        del self.files[relative]
+        self.dirty = True
+        return True
+    
+    def load(self) -> bool:
+        """Lädt das Manifest einmalig vom Server
+        
+        Nur ein bestätigt fehlendes Manifest gilt als leer. Scheitert das Laden
+        anderweitig, bleibt ``loaded`` False; dann werden weder Einträge
+        übernommen noch wird das Manifest überschrieben.
+        """
+        import tempfile
+        fd, temp_path = tempfile.mkstemp(suffix='.json', dir=self.local_dir)
+        os.close(fd)
+        try:
+            if self.connection_manager.file_missing(self.remote_path):
+                xbmc.log("No remote manifest found", xbmc.LOGINFO)
+                self.loaded = True
+                return False
+            if not self.connection_manager.download_file(self.remote_path, temp_path):
+                xbmc.log("Remote manifest not available, leaving it untouched", xbmc.LOGWARNING)
+                return False
+            with open(temp_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.files = data.get('files', {})
+            self.loaded = True
+            xbmc.log(f"Remote manifest loaded: {len(self.files)} files", xbmc.LOGINFO)
+            return True
+        except Exception as e:
+            xbmc.log(f"Error loading remote manifest: {str(e)}", xbmc.LOGERROR)
+            return False
+        finally:
+            try:
+                os.unlink(temp_path)
+            except:
+                pass
+    
+    def save(self) -> bool:
+        """Schreibt das Manifest atomar (temporäre Datei + Umbenennen)"""
+        if not self.dirty:
+            return True
+        if not self.loaded:
+            return False
+        import tempfile
+        writer = xbmc.getInfoLabel('System.ComputerName')
+        data = {
+            'version': 1,
+            'writer': writer,
+            'updated': time.time(),
+            'files': self.files
+        }
+        fd, temp_path = tempfile.mkstemp(suffix='.json', dir=self.local_dir)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            remote_temp = f"{self.remote_path}.{re.sub(r'[^A-Za-z0-9_-]', '_', writer) or 'tmp'}.tmp"
+            if not self.connection_manager.upload_file(temp_path, remote_temp):
+                return False
+            if not self.connection_manager.rename_file(remote_temp, self.remote_path):
+                return False
+            self.dirty = False
+            xbmc.log(f"Remote manifest saved: {len(self.files)} files", xbmc.LOGINFO)
+            return True
+        except Exception as e:
+            xbmc.log(f"Error saving remote manifest: {str(e)}", xbmc.LOGERROR)
+            return False
+        finally:
             try:
-                parent_dir = os.path.dirname(remote_dir)
-                if parent_dir and parent_dir != '/':
-                    self._ensure_remote_directory(parent_dir)
-                smbclient.makedirs(smb_path)
-            except Exception as e:
-                xbmc.log(f"Error creating remote directory {remote_dir}: {str(e)}", xbmc.LOGERROR)
+                os.unlink(temp_path)
+            except:
+                pass
 
 def get_protocol_status() -> Dict[str, bool]:
     """Gibt den Status der verfügbaren Protokolle zurück"""
     return {
         "FTP": True,  # FTP ist immer verfügbar
-        "SFTP": SFTP_AVAILABLE,
-        "SMB": SMB_AVAILABLE
+        "SFTP": protocol_module_available('paramiko'),
+        "SMB": protocol_module_available('smbclient'),
+        "VFS": True  # Kodi-VFS benötigt keine zusätzlichen Module
     }
 
 def log_protocol_status():
@@ -800,41 +1859,87 @@ def log_protocol_status():
         xbmc.log(f"{protocol}: {status_text}", xbmc.LOGINFO)
     xbmc.log("=======================", xbmc.LOGINFO)
 
+def connection_options(config: Config) -> Dict:
+    """Timeouts und Wiederholungen aus den Einstellungen für die Verbindungsmanager
+    
+    Gepoolte Verbindungen überdauern das längste Sync-Intervall, damit auch der
+    nächste planmäßige Lauf den Login wiederverwendet.
+    """
+    return {
+        'timeout': config.connect_timeout,
+        'read_timeout': config.read_timeout,
+        'retries': config.connect_retries,
+        'buffer_size': config.transfer_buffer_size,
+        'idle_timeout': config.sync_interval_max * 60 + POOL_IDLE_MARGIN,
+    }
+
+def create_vfs_manager(config: Config) -> VFSManager:
+    """Verbindungsmanager über Kodi-VFS für das konfigurierte Protokoll"""
+    protocol = {0: 'ftp', 1: 'sftp', 2: 'smb'}.get(config.protocol, 'ftp')
+    return VFSManager(
+        protocol,
+        config.ftp_host,
+        config.ftp_user,
+        config.ftp_pass,
+        port=config.sftp_port if protocol == 'sftp' else None,
+        share=config.smb_share if protocol == 'smb' else None,
+        streaming=config.vfs_streaming.get(protocol, False),
+        chunk_size=config.transfer_buffer_size
+    )
+
 def create_connection_manager(config: Config) -> ConnectionManager:
-    """Factory-Funktion für die Erstellung von Verbindungsmanagern"""
+    """Factory-Funktion für die Erstellung von Verbindungsmanagern
+    
+    Nur mit ``prefer_vfs`` wird Kodi-VFS genutzt; fehlt paramiko bzw. smbclient,
+    wird wie bisher auf FTP ausgewichen. Die Bibliotheken werden erst hier bei
+    Bedarf importiert.
+    """
+    if config.prefer_vfs:
+        return create_vfs_manager(config)
     if config.protocol == 0:  # FTP
-        return FTPManager(config.ftp_host, config.ftp_user, config.ftp_pass)
+        return FTPManager(config.ftp_host, config.ftp_user, config.ftp_pass, **connection_options(config))
     elif config.protocol == 1:  # SFTP
-        if not SFTP_AVAILABLE:
+        if not load_protocol_module('paramiko'):
             xbmc.log("SFTP not available, falling back to FTP", xbmc.LOGWARNING)
-            return FTPManager(config.ftp_host, config.ftp_user, config.ftp_pass)
+            return FTPManager(config.ftp_host, config.ftp_user, config.ftp_pass, **connection_options(config))
         return SFTPManager(
             config.ftp_host, 
             config.ftp_user, 
             config.ftp_pass,
             port=config.sftp_port,
-            key_file=config.sftp_key_file
+            key_file=config.sftp_key_file,
+            **connection_options(config)
         )
     elif config.protocol == 2:  # SMB
-        if not SMB_AVAILABLE:
+        if not load_protocol_module('smbclient'):
             xbmc.log("SMB not available, falling back to FTP", xbmc.LOGWARNING)
-            return FTPManager(config.ftp_host, config.ftp_user, config.ftp_pass)
+            return FTPManager(config.ftp_host, config.ftp_user, config.ftp_pass, **connection_options(config))
         return SMBManager(
             config.ftp_host,
             config.ftp_user,
             config.ftp_pass,
             share=config.smb_share,
-            domain=config.smb_domain
+            domain=config.smb_domain,
+            **connection_options(config)
         )
     else:
         xbmc.log(f"Unknown protocol {config.protocol}, falling back to FTP", xbmc.LOGWARNING)
-        return FTPManager(config.ftp_host, config.ftp_user, config.ftp_pass)
+        return FTPManager(config.ftp_host, config.ftp_user, config.ftp_pass, **connection_options(config))
+
+@contextmanager
+def legacy_ftp_connection():
+    """FTP-Verbindung der Legacy-Funktionen aus dem gemeinsamen Verbindungspool"""
+    ftp_manager = FTPManager(config.ftp_host, config.ftp_user, config.ftp_pass, **connection_options(config))
+    try:
+        with ftp_manager.get_connection() as ftp:
+            yield ftp
+    finally:
+        ftp_manager.close()
 
 def ftp_upload_legacy(local_path, remote_path):
     """Ursprüngliche FTP-Upload-Funktion für Rückwärtskompatibilität"""
     try:
-        with ftplib.FTP(FTP_HOST) as ftp:
-            ftp.login(FTP_USER, FTP_PASS)
+        with legacy_ftp_connection() as ftp:
             with open(local_path, 'rb') as file:
                 ftp.storbinary(f'STOR {remote_path}', file)
         return True
@@ -845,20 +1950,20 @@ def ftp_upload_legacy(local_path, remote_path):
 def ftp_download_legacy(remote_path, local_path):
     """Ursprüngliche FTP-Download-Funktion für Rückwärtskompatibilität"""
     try:
-        with ftplib.FTP(FTP_HOST) as ftp:
-            ftp.login(FTP_USER, FTP_PASS)
-            with open(local_path, 'wb') as file:
+        with legacy_ftp_connection() as ftp:
+            with open(local_path + PART_SUFFIX, 'wb') as file:
                 ftp.retrbinary(f'RETR {remote_path}', file.write)
+        replace_if_changed(local_path + PART_SUFFIX, local_path)
         return True
     except Exception as e:
         xbmc.log(f"FTP download failed: {str(e)}", xbmc.LOGERROR)
+        discard_partial(local_path + PART_SUFFIX)
         return False
 
 def ftp_folder_exists_legacy(folder_path):
     """Ursprüngliche FTP-Ordner-Prüfung für Rückwärtskompatibilität"""
     try:
-        with ftplib.FTP(FTP_HOST) as ftp:
-            ftp.login(FTP_USER, FTP_PASS)
+        with legacy_ftp_connection() as ftp:
             ftp.cwd(folder_path)
         return True
     except ftplib.error_perm as e:
@@ -868,13 +1973,149 @@ def ftp_folder_exists_legacy(folder_path):
             xbmc.log(f"FTP error: {str(e)}", xbmc.LOGERROR)
             return False
 
-def upload_file(connection_manager: ConnectionManager, local_path: str, remote_path: str) -> bool:
-    """Lädt eine Datei zum Server hoch (universell für alle Protokolle)"""
-    return connection_manager.upload_file(local_path, remote_path)
+def object_path(file_hash: str) -> str:
+    """Remote-Pfad eines Objekts im gemeinsamen Speicher aller custom_folder"""
+    return f"/{config.ftp_base_path}/auto_fav_sync/{object_name(file_hash)}"
+
+def upload_file(connection_manager: ConnectionManager, local_path: str, remote_path: str, expected: Optional[Dict] = None) -> bool:
+    """Lädt eine Datei zum Server hoch (universell für alle Protokolle)
+    
+    Synchronisierte Inhalte (mit ``expected``) erhalten bei ``compress_transfers``
+    zusätzlich eine gzip-Nebendatei; die unkomprimierte Datei bleibt für ältere Versionen.
+    Nur wenn die Nebendatei hochgeladen wurde, wird ``expected['compressed']`` gesetzt;
+    ein Fehler dabei lässt den Upload nicht scheitern.
+    Mit ``content_addressed_store`` werden sie als Objekt abgelegt (siehe ``upload_object``).
+    """
+    if expected is not None and config.content_addressed_store:
+        return upload_object(connection_manager, local_path, remote_path, expected)
+    if not connection_manager.upload_file(local_path, remote_path, expected):
+        return False
+    if expected is not None and config.compress_transfers:
+        upload_side_file(connection_manager, local_path, remote_path, expected)
+    return True
+
+def upload_side_file(connection_manager: ConnectionManager, local_path: str, remote_path: str, expected: Dict):
+    """Lädt die gzip-Nebendatei hoch und vermerkt sie in ``expected``; Fehler sind nicht fatal"""
+    if upload_compressed(connection_manager, local_path, remote_path):
+        expected['compressed'] = 'gzip'
+    else:
+        xbmc.log(f"Compressed copy of {remote_path} not uploaded, announcing plain file only", xbmc.LOGWARNING)
+
+def upload_object(connection_manager: ConnectionManager, local_path: str, remote_path: str, expected: Dict) -> bool:
+    """Legt den Inhalt unter ``objects/<hash>`` ab und schreibt die Zeigerdatei ``<remote_path>.ref``
+    
+    Objekte sind unveränderlich und werden von allen custom_folder geteilt; ein
+    Hash, der bereits vollständig auf dem Server liegt, wird nicht erneut
+    hochgeladen. Objekte entstehen unter einem temporären Namen und werden erst
+    danach umbenannt, damit ein Abbruch kein unvollständiges Objekt hinterlässt.
+    Eine unkomprimierte Datei von vor der Umstellung wird nach dem Zeiger
+    gelöscht, damit sie nicht veraltet weiter ausgeliefert wird.
+    """
+    file_hash = expected['hash']
+    target = object_path(file_hash)
+    size = os.path.getsize(local_path)
+    remote_stat = connection_manager.stat(target)
+    if remote_stat is not None and remote_stat.get('size') == size:
+        xbmc.log(f"Object {file_hash[:16]} already on server, skipped {size} bytes for {remote_path}", xbmc.LOGINFO)
+        if config.compress_transfers and connection_manager.stat(target + GZIP_SUFFIX) is not None:
+            expected['compressed'] = 'gzip'
+    else:
+        writer = re.sub(r'[^A-Za-z0-9_-]', '_', xbmc.getInfoLabel('System.ComputerName')) or 'tmp'
+        remote_temp = f"{target}.{writer}.tmp"
+        if not connection_manager.upload_file(local_path, remote_temp, expected):
+            return False
+        if not connection_manager.rename_file(remote_temp, target):
+            connection_manager.delete_file(remote_temp)
+            return False
+        if config.compress_transfers:
+            upload_side_file(connection_manager, local_path, target, expected)
+    
+    import tempfile
+    fd, temp_path = tempfile.mkstemp(suffix=POINTER_SUFFIX)
+    os.close(fd)
+    try:
+        write_pointer(temp_path, file_hash, expected.get('hash_algo', LEGACY_HASH_ALGORITHM), size)
+        if not connection_manager.upload_file(temp_path, remote_path + POINTER_SUFFIX):
+            return False
+    finally:
+        discard_partial(temp_path)
+    for stale_path in (remote_path, remote_path + GZIP_SUFFIX):
+        if connection_manager.stat(stale_path) is not None and connection_manager.delete_file(stale_path):
+            xbmc.log(f"Removed {stale_path}, content is now served via {remote_path}{POINTER_SUFFIX}", xbmc.LOGINFO)
+    return True
+
+def upload_compressed(connection_manager: ConnectionManager, local_path: str, remote_path: str) -> bool:
+    """Lädt die gzip-Nebendatei ``<remote_path>.gz`` hoch"""
+    import tempfile
+    fd, temp_path = tempfile.mkstemp(suffix=GZIP_SUFFIX)
+    os.close(fd)
+    try:
+        compressed = compress_file(local_path, temp_path, config.compression_level)
+        if not connection_manager.upload_file(temp_path, remote_path + GZIP_SUFFIX):
+            return False
+        size = os.path.getsize(local_path)
+        xbmc.log(f"Uploaded {remote_path}{GZIP_SUFFIX}: {compressed} of {size} bytes "
+                 f"({size - compressed} bytes saved per download)", xbmc.LOGINFO)
+        return True
+    except Exception as e:
+        xbmc.log(f"Error compressing {local_path}: {str(e)}", xbmc.LOGERROR)
+        return False
+    finally:
+        discard_partial(temp_path)
+
+def download_file(connection_manager: ConnectionManager, remote_path: str, local_path: str, expected: Optional[Dict] = None) -> TransferResult:
+    """Lädt eine Datei vom Server herunter (universell für alle Protokolle)
+    
+    Kündigt das Manifest eine gzip-Nebendatei an, wird diese geladen; schlägt das
+    fehl, wird wie bisher die unkomprimierte Datei übertragen. Verweist der Eintrag
+    auf ein Objekt, wird dieses statt ``remote_path`` geladen; fehlt die Datei,
+    dient die Zeigerdatei als Rückfall (unabhängig von ``content_addressed_store``).
+    """
+    source = object_path(expected['object']) if expected and expected.get('object') else remote_path
+    if expected and expected.get('compressed') == 'gzip':
+        result = download_compressed(connection_manager, source, local_path, expected)
+        if result:
+            return result
+        xbmc.log(f"Compressed download of {source} failed, using plain file", xbmc.LOGWARNING)
+    result = connection_manager.download_file(source, local_path, expected)
+    result = result if isinstance(result, TransferResult) else TransferResult(bool(result))
+    if not result and not (expected and expected.get('object')):
+        pointer = download_pointer(connection_manager, remote_path, local_path)
+        if pointer is not None:
+            return download_file(connection_manager, remote_path, local_path, pointer)
+    return result
+
+def download_pointer(connection_manager: ConnectionManager, remote_path: str, local_path: str) -> Optional[Dict]:
+    """Liest die Zeigerdatei ``<remote_path>.ref`` (Eintrag mit ``object``, Hash und Größe)"""
+    pointer_path = local_path + POINTER_SUFFIX
+    try:
+        if not connection_manager.download_file(remote_path + POINTER_SUFFIX, pointer_path):
+            return None
+        return read_pointer(pointer_path)
+    finally:
+        discard_partial(pointer_path)
 
-def download_file(connection_manager: ConnectionManager, remote_path: str, local_path: str) -> bool:
-    """Lädt eine Datei vom Server herunter (universell für alle Protokolle)"""
-    return connection_manager.download_file(remote_path, local_path)
+def download_compressed(connection_manager: ConnectionManager, remote_path: str, local_path: str, expected: Dict) -> TransferResult:
+    """Lädt ``<remote_path>.gz``, entpackt es und prüft Größe und Hash laut Manifest"""
+    compressed_path = local_path + GZIP_SUFFIX
+    part = local_path + PART_SUFFIX
+    try:
+        if not connection_manager.download_file(remote_path + GZIP_SUFFIX, compressed_path):
+            return TransferResult(False)
+        compressed = os.path.getsize(compressed_path)
+        size = decompress_file(compressed_path, part, getattr(connection_manager, 'buffer_size', DEFAULT_BUFFER_SIZE))
+        if not verify_partial(part, expected.get('size'), expected):
+            return TransferResult(False)
+        result = replace_if_changed(part, local_path)
+        xbmc.log(f"Downloaded {remote_path}{GZIP_SUFFIX}: {compressed} of {size} bytes "
+                 f"({size - compressed} bytes saved)", xbmc.LOGINFO)
+        return result
+    except Exception as e:
+        xbmc.log(f"Error decompressing {remote_path}{GZIP_SUFFIX}: {str(e)}", xbmc.LOGERROR)
+        return TransferResult(False)
+    finally:
+        discard_partial(compressed_path)
+        discard_partial(part)
 
 def folder_exists(connection_manager: ConnectionManager, folder_path: str) -> bool:
     """Prüft, ob ein Ordner auf dem Server existiert (universell für alle Protokolle)"""
@@ -895,26 +2136,26 @@ def ftp_folder_exists(connection_manager: ConnectionManager, folder_path: str) -
 
 def sync_standard_favourites():
     """Synchronisiert Standard-Favoriten (ursprüngliche Funktion)"""
-    if IS_MAIN_SYSTEM:
-        return ftp_upload_legacy(LOCAL_FAVOURITES, FTP_PATH)
+    if config.is_main_system:
+        return ftp_upload_legacy(config.local_favourites, config.ftp_path)
     else:
-        return ftp_download_legacy(FTP_PATH, LOCAL_FAVOURITES)
+        return ftp_download_legacy(config.ftp_path, config.local_favourites)
 
 def sync_static_favourites():
     """Synchronisiert statische Favoriten (ursprüngliche Funktion)"""
-    for folder in STATIC_FOLDERS:
+    for folder in config.static_folders:
         if not folder:  # Überspringe leere Ordner
             continue
             
-        local_static_path = os.path.join(SUPER_FAVOURITES_PATH, folder, 'favourites.xml')
-        remote_static_path = f"/{FTP_BASE_PATH}/auto_fav_sync/{CUSTOM_FOLDER}/{folder}/favourites.xml"
+        local_static_path = os.path.join(config.super_favourites_path, folder, 'favourites.xml')
+        remote_static_path = f"/{config.ftp_base_path}/auto_fav_sync/{config.custom_folder}/{folder}/favourites.xml"
         
-        if IS_MAIN_SYSTEM:
+        if config.is_main_system:
             ftp_upload_legacy(local_static_path, remote_static_path)
         else:
             ftp_download_legacy(remote_static_path, local_static_path)
-            if OVERWRITE_STATIC and folder == SPECIFIC_CUSTOM_FOLDER:
-                specific_remote_static_path = f"/{FTP_BASE_PATH}/auto_fav_sync/{SPECIFIC_CUSTOM_FOLDER}/favourites.xml"
+            if config.overwrite_static and folder == config.specific_custom_folder:
+                specific_remote_static_path = f"/{config.ftp_base_path}/auto_fav_sync/{config.specific_custom_folder}/favourites.xml"
                 ftp_download_legacy(specific_remote_static_path, local_static_path)
 
 def sync_standard_favourites_optimized(connection_manager: ConnectionManager) -> bool:
@@ -1024,24 +2265,36 @@ def download_random_image() -> bool:
 
 def sync_favourites():
     """Hauptfunktion für die Synchronisation der Favoriten (ursprüngliche Version)"""
-    if not CUSTOM_FOLDER:
+    if not config.custom_folder:
         show_notification(30023, 5000)  # Ein benutzerdefinierter Ordnername ist erforderlich
         return
 
-    if not ftp_folder_exists_legacy(f"/{FTP_BASE_PATH}/auto_fav_sync/{CUSTOM_FOLDER}"):
-        show_notification(30024, 5000, folder=CUSTOM_FOLDER)  # Benutzerdefinierter Ordner nicht gefunden
+    if not ftp_folder_exists_legacy(f"/{config.ftp_base_path}/auto_fav_sync/{config.custom_folder}"):
+        show_notification(30024, 5000, folder=config.custom_folder)  # Benutzerdefinierter Ordner nicht gefunden
         return
 
     sync_standard_favourites()
     sync_static_favourites()
 
-def sync_favourites_real():
-    """Echte bidirektionale Synchronisation mit sofortiger UI-Aktualisierung"""
+def sync_favourites_real(change_set: SyncChangeSet = None, paths: set = None) -> bool:
+    """Echte bidirektionale Synchronisation mit gezielter UI-Aktualisierung
+    
+    Übertragene Dateien werden in ``change_set`` gesammelt; die UI wird nur
+    aktualisiert, wenn sich lokal etwas geändert hat. Mit ``paths`` (lokale
+    Favoriten-Dateien, z. B. vom Datei-Watcher) werden nur diese abgeglichen.
+    """
+    if change_set is None:
+        change_set = SyncChangeSet(config)
     try:
         if not config.custom_folder:
             show_notification(30023, 5000)  # Ein benutzerdefinierter Ordnername ist erforderlich
             return False
 
+        # Server nach wiederholten Fehlern nicht erneut anfragen, bis die Wartezeit abläuft
+        if get_breaker(config.ftp_host).is_open:
+            xbmc.log(f"Skipping sync, {config.ftp_host} is unavailable (circuit open)", xbmc.LOGWARNING)
+            return False
+
         # Erkenne automatisch den Systemtyp
         is_main = detect_system_type()
         xbmc.log(f"System type detected: {'Main' if is_main else 'Sub'}", xbmc.LOGINFO)
@@ -1061,37 +2314,64 @@ def sync_favourites_real():
             if is_main:
                 mark_main_system(connection_manager)
 
-            # Synchronisiere Standard-Favoriten
-            if sync_standard_favourites_real(sync_manager, connection_manager, is_main):
-                xbmc.log("Standard favourites synced successfully", xbmc.LOGINFO)
-            else:
-                xbmc.log("Standard favourites sync failed", xbmc.LOGWARNING)
+            # Remote-Manifest einmalig laden
+            sync_manager.manifest = RemoteManifest(
+                connection_manager,
+                f"/{config.ftp_base_path}/auto_fav_sync/{config.custom_folder}",
+                os.path.dirname(sync_manager.sync_state_file)
+            )
+            sync_manager.manifest.load()
 
-            # Synchronisiere statische Favoriten
-            if sync_static_favourites_real(sync_manager, connection_manager, is_main):
-                xbmc.log("Static favourites synced successfully", xbmc.LOGINFO)
-            else:
-                xbmc.log("Static favourites sync failed", xbmc.LOGWARNING)
+            # Status einmal laden und am Ende einmal atomar schreiben
+            with sync_manager.batch():
+                # Synchronisiere Standard-Favoriten
+                if paths is None or config.local_favourites in paths:
+                    if sync_standard_favourites_real(sync_manager, connection_manager, is_main, change_set):
+                        xbmc.log("Standard favourites synced successfully", xbmc.LOGINFO)
+                    else:
+                        xbmc.log("Standard favourites sync failed", xbmc.LOGWARNING)
+
+                # Synchronisiere statische Favoriten
+                folders = None
+                if paths is not None:
+                    folders = [folder for folder in config.static_folders
+                               if static_favourites_path(folder) in paths]
+                if folders is None or folders:
+                    if sync_static_favourites_real(sync_manager, connection_manager, is_main, change_set, folders):
+                        xbmc.log("Static favourites synced successfully", xbmc.LOGINFO)
+                    else:
+                        xbmc.log("Static favourites sync failed", xbmc.LOGWARNING)
+
+                # Manifest nach allen Uploads einmal atomar schreiben
+                # (beim Merge lädt jedes System hoch)
+                if is_main or config.merge_favourites:
+                    if sync_manager.manifest.save():
+                        delete_obsolete_patches(sync_manager, connection_manager)
 
             # Kategorisierungs-Funktionen
             if config.enable_categories:
                 if is_main:
                     # Hauptsystem: Kategorisiere lokale Favoriten
-                    category_manager.auto_categorize_favourites()
+                    if category_manager.auto_categorize_favourites():
+                        change_set.record_rewrite(config.local_favourites)
                 else:
                     # Subsystem: Kategorisiere heruntergeladene Favoriten
                     if os.path.exists(config.local_favourites):
-                        category_manager.auto_categorize_favourites()
+                        if category_manager.auto_categorize_favourites():
+                            change_set.record_rewrite(config.local_favourites)
 
-            # Aktualisiere UI sofort
-            if refresh_favourites_ui():
-                show_notification(30028, 5000)  # Synchronisation abgeschlossen
-                return True
-            else:
-                show_notification(30028, 5000)  # Synchronisation abgeschlossen, aber UI-Update fehlgeschlagen
+            xbmc.log(f"Sync finished: {change_set.summary()}", xbmc.LOGINFO)
+            if not change_set.changed:
+                # Nichts übertragen - keine UI-Aktualisierung, keine Benachrichtigung
                 return True
+
+            # Aktualisiere nur die betroffenen Teile der UI
+            refresh_favourites_ui(change_set)
+            show_notification(30028, 5000)  # Synchronisation abgeschlossen
+            return True
                 
         finally:
+            sync_manager.close()
             connection_manager.close()
             
     except Exception as e:
@@ -1125,25 +2405,225 @@ def mark_main_system(connection_manager: ConnectionManager):
     except Exception as e:
         xbmc.log(f"Error marking main system: {str(e)}", xbmc.LOGERROR)
 
-def sync_standard_favourites_real(sync_manager: SyncManager, connection_manager: ConnectionManager, is_main: bool) -> bool:
+def merge_favourites_real(sync_manager: SyncManager, connection_manager: ConnectionManager, local_path: str, remote_path: str, is_main: bool, change_set: SyncChangeSet = None) -> Optional[bool]:
+    """Drei-Wege-Merge einer Favoriten-Datei mit ihrer Remote-Version
+    
+    Basis ist der zuletzt synchronisierte Stand. Die lokale Datei wird nur
+    geschrieben und die Remote-Datei nur hochgeladen, wenn der Merge die
+    jeweilige Seite ändert. Bei Konflikten gewinnt das Hauptsystem. Liefert None,
+    wenn nicht gemerged werden kann (ungültiges XML); dann wird wie bisher die
+    ganze Datei übertragen.
+    """
+    if not sync_manager.needs_sync(local_path, remote_path, connection_manager):
+        return True
+    remote_copy = sync_manager.merge_bases.remote_copy_path(local_path)
+    try:
+        local_entries = parse_favourites(local_path) if os.path.exists(local_path) else []
+        entry = sync_manager.download_content(remote_path)
+        if download_file(connection_manager, remote_path, remote_copy, entry):
+            remote_entries = parse_favourites(remote_copy)
+            if entry is not None and entry.get('seq', 0) > entry.get('snapshot_seq', 0):
+                # Die ganze Datei ist Stand snapshot_seq, neuere Änderungen liegen als Patches vor
+                remote_entries = apply_remote_patches(connection_manager, remote_path, remote_entries,
+                                                      entry['snapshot_seq'] + 1, entry['seq'], os.path.dirname(remote_copy))
+        elif connection_manager.file_missing(remote_path) and connection_manager.file_missing(remote_path + POINTER_SUFFIX):
+            # Remote-Datei existiert noch nicht (ein Verbindungsfehler darf nicht als leere Liste gelten)
+            remote_entries = []
+        else:
+            return False
+    except MergeError as e:
+        xbmc.log(f"Cannot merge favourites, transferring whole file: {str(e)}", xbmc.LOGWARNING)
+        return None
+    finally:
+        discard_partial(remote_copy)
+    
+    result = merge_favourites(sync_manager.merge_bases.load(local_path) or [], local_entries, remote_entries, prefer_local=is_main)
+    if result.conflicts:
+        xbmc.log(f"Resolved {result.conflicts} favourite conflicts in {local_path} "
+                 f"in favour of the {'local' if is_main else 'remote'} version", xbmc.LOGWARNING)
+    if result.local_changed:
+        write_favourites(local_path, result.entries)
+        if change_set is not None:
+            change_set.record_download(local_path)
+    content = sync_manager.upload_content(local_path) if result.remote_changed else {}
+    if result.remote_changed:
+        if not upload_file(connection_manager, local_path, remote_path, content):
+            return False
+        if change_set is not None:
+            change_set.record_upload(local_path)
+    sync_manager.update_sync_state(local_path, remote_path, result.remote_changed, connection_manager,
+                                   compressed=content.get('compressed'))
+    sync_manager.merge_bases.save(local_path)
+    xbmc.log(f"Merged {local_path}: {len(result.entries)} entries "
+             f"(local {'updated' if result.local_changed else 'unchanged'}, "
+             f"remote {'updated' if result.remote_changed else 'unchanged'})", xbmc.LOGINFO)
+    return True
+
+def favourites_patch_path(remote_path: str, seq: int) -> str:
+    """Remote-Pfad von Patch ``seq`` einer Favoriten-Datei (``favourites.patches/`` daneben)"""
+    return f"{remote_path.rsplit('.', 1)[0]}.patches/{seq:08d}.json"
+
+def delete_obsolete_patches(sync_manager: SyncManager, connection_manager: ConnectionManager):
+    """Löscht Patches, die nach einer Kompaktierung in der ganzen Datei enthalten sind"""
+    for patch_path in sync_manager.obsolete_patches:
+        connection_manager.delete_file(patch_path)
+    if sync_manager.obsolete_patches:
+        xbmc.log(f"Deleted {len(sync_manager.obsolete_patches)} compacted patches", xbmc.LOGINFO)
+    sync_manager.obsolete_patches = []
+
+def upload_favourites_delta(sync_manager: SyncManager, connection_manager: ConnectionManager, local_path: str, remote_path: str, change_set: SyncChangeSet = None) -> Optional[bool]:
+    """Lädt nur die Änderungen seit dem zuletzt veröffentlichten Stand als Patch hoch
+    
+    Liefert None, wenn stattdessen die ganze Datei hochgeladen werden muss: ohne
+    Manifest-Eintrag, ohne passenden Basisstand, bei ungültigem XML, wenn der
+    Patch größer als die Datei wäre oder ``delta_compact_patches`` erreicht ist
+    (Kompaktierung).
+    """
+    entry = sync_manager.download_content(remote_path)
+    if entry is None:
+        return None
+    seq = entry.get('seq', 0)
+    if seq - entry.get('snapshot_seq', 0) >= config.delta_compact_patches:
+        return None
+    head = entry.get('head') or entry
+    base_path = sync_manager.merge_bases.base_path(local_path)
+    if (not head.get('content_hash') or not os.path.exists(base_path)
+            or canonical_favourites_hash(base_path, head.get('hash_algo', LEGACY_HASH_ALGORITHM)) != head['content_hash']):
+        # Basisstand entspricht nicht dem veröffentlichten Stand
+        return None
+    try:
+        ops = diff_favourites(parse_favourites(base_path), parse_favourites(local_path))
+    except MergeError as e:
+        xbmc.log(f"Cannot diff favourites, uploading whole file: {str(e)}", xbmc.LOGWARNING)
+        return None
+    if not ops:
+        return None
+    
+    import tempfile
+    fd, temp_path = tempfile.mkstemp(suffix='.json', dir=os.path.dirname(sync_manager.sync_state_file))
+    os.close(fd)
+    try:
+        write_patch(temp_path, seq + 1, ops)
+        size = os.path.getsize(temp_path)
+        if size >= os.path.getsize(local_path):
+            # Patch wäre größer als die ganze Datei
+            return None
+        if not upload_file(connection_manager, temp_path, favourites_patch_path(remote_path, seq + 1)):
+            return False
+    finally:
+        discard_partial(temp_path)
+    sync_manager.publish_patch(local_path, remote_path, seq + 1)
+    sync_manager.merge_bases.save(local_path)
+    if change_set is not None:
+        change_set.record_upload(local_path)
+    xbmc.log(f"Uploaded patch {seq + 1} for {remote_path}: {len(ops)} operations, {size} bytes", xbmc.LOGINFO)
+    return True
+
+def apply_remote_patches(connection_manager: ConnectionManager, remote_path: str, entries: list, first_seq: int, last_seq: int, work_dir: str) -> list:
+    """Lädt die Patches ``first_seq``..``last_seq`` und wendet sie der Reihe nach an"""
+    patch_file = os.path.join(work_dir, 'patch.json')
+    try:
+        for patch_seq in range(first_seq, last_seq + 1):
+            if not download_file(connection_manager, favourites_patch_path(remote_path, patch_seq), patch_file):
+                raise MergeError(f"Patch {patch_seq} not available")
+            entries = apply_patch(entries, read_patch(patch_file, patch_seq))
+    finally:
+        discard_partial(patch_file)
+    return entries
+
+def download_favourites_delta(sync_manager: SyncManager, connection_manager: ConnectionManager, local_path: str, remote_path: str, change_set: SyncChangeSet = None) -> Optional[bool]:
+    """Bringt eine Favoriten-Datei über die Patches seit dem zuletzt gesehenen Stand auf den neuesten Stand
+    
+    Ob Patches vorliegen, entscheidet allein der Manifest-Eintrag (``seq``),
+    nicht die lokale Einstellung ``delta_uploads``. Ohne passenden Basisstand
+    oder wenn die benötigten Patches bereits kompaktiert sind, wird die ganze
+    Datei (Stand ``snapshot_seq``) geladen und nur die neueren Patches
+    angewendet. Das Ergebnis wird gegen den Hash im Manifest geprüft. Liefert
+    None, wenn es keine Patches gibt oder sie nicht anwendbar sind; dann gilt
+    der normale Download.
+    """
+    entry = sync_manager.download_content(remote_path)
+    if entry is None or 'seq' not in entry:
+        return None
+    seq = entry['seq']
+    snapshot_seq = entry.get('snapshot_seq', seq)
+    head = entry.get('head') or entry
+    local_seq = sync_manager.store.get(local_path).get('seq')
+    candidate = sync_manager.merge_bases.remote_copy_path(local_path)
+    
+    starts = [None]
+    if local_seq is not None and snapshot_seq <= local_seq <= seq:
+        starts.insert(0, local_seq)
+    for start in starts:
+        try:
+            if start is None:
+                # Ganze Datei als Ausgangspunkt
+                if not download_file(connection_manager, remote_path, candidate, entry):
+                    return False
+                entries, start = parse_favourites(candidate), snapshot_seq
+            else:
+                entries = sync_manager.merge_bases.load(local_path)
+                if entries is None:
+                    continue
+            entries = apply_remote_patches(connection_manager, remote_path, entries, start + 1, seq,
+                                           os.path.dirname(candidate))
+            write_favourites(candidate, entries)
+        except MergeError as e:
+            xbmc.log(f"Cannot apply patches to {local_path}: {str(e)}", xbmc.LOGWARNING)
+            continue
+        if canonical_favourites_hash(candidate, head.get('hash_algo', LEGACY_HASH_ALGORITHM)) == head.get('content_hash'):
+            break
+        xbmc.log(f"Patched {local_path} does not match the manifest", xbmc.LOGWARNING)
+    else:
+        discard_partial(candidate)
+        return None
+    
+    result = replace_if_changed(candidate, local_path)
+    sync_manager.update_sync_state(local_path, remote_path, False, connection_manager, seq=seq)
+    sync_manager.merge_bases.save(local_path)
+    if change_set is not None:
+        change_set.record_download(local_path, result)
+    xbmc.log(f"Updated {local_path} to sequence {seq} ({seq - start} patches applied)", xbmc.LOGINFO)
+    return True
+
+def sync_standard_favourites_real(sync_manager: SyncManager, connection_manager: ConnectionManager, is_main: bool, change_set: SyncChangeSet = None) -> bool:
     """Echte Synchronisation der Standard-Favoriten"""
     try:
         local_path = config.local_favourites
         remote_path = config.ftp_path
         
+        if config.merge_favourites:
+            merged = merge_favourites_real(sync_manager, connection_manager, local_path, remote_path, is_main, change_set)
+            if merged is not None:
+                return merged
+        
         if is_main:
             # Hauptsystem: Upload wenn sich etwas geändert hat
-            if sync_manager.needs_sync(local_path, remote_path):
-                if upload_file(connection_manager, local_path, remote_path):
-                    sync_manager.update_sync_state(local_path, remote_path, True)
+            if sync_manager.needs_sync(local_path, remote_path, connection_manager):
+                delta = upload_favourites_delta(sync_manager, connection_manager, local_path, remote_path, change_set) if config.delta_uploads else None
+                if delta is not None:
+                    return delta
+                content = sync_manager.upload_content(local_path)
+                if upload_file(connection_manager, local_path, remote_path, content):
+                    sync_manager.update_sync_state(local_path, remote_path, True, connection_manager, compressed=content.get('compressed'))
+                    if config.delta_uploads:
+                        sync_manager.merge_bases.save(local_path)
+                    if change_set is not None:
+                        change_set.record_upload(local_path)
                     xbmc.log("Uploaded standard favourites", xbmc.LOGINFO)
                     return True
         else:
             # Subsystem: Download wenn Remote neuer ist
-            if sync_manager.needs_sync(local_path, remote_path):
-                if download_file(connection_manager, remote_path, local_path):
-                    sync_manager.update_sync_state(local_path, remote_path, False)
-                    xbmc.log("Downloaded standard favourites", xbmc.LOGINFO)
+            if sync_manager.needs_sync(local_path, remote_path, connection_manager):
+                delta = download_favourites_delta(sync_manager, connection_manager, local_path, remote_path, change_set)
+                if delta is not None:
+                    return delta
+                result = download_file(connection_manager, remote_path, local_path, sync_manager.download_content(remote_path))
+                if result:
+                    sync_manager.update_sync_state(local_path, remote_path, False, connection_manager)
+                    if change_set is not None:
+                        change_set.record_download(local_path, result)
+                    xbmc.log("Standard favourites unchanged" if result.unchanged else "Downloaded standard favourites", xbmc.LOGINFO)
                     return True
         
         return True
@@ -1151,42 +2631,261 @@ def sync_standard_favourites_real(sync_manager: SyncManager, connection_manager:
         xbmc.log(f"Error syncing standard favourites: {str(e)}", xbmc.LOGERROR)
         return False
 
-def sync_static_favourites_real(sync_manager: SyncManager, connection_manager: ConnectionManager, is_main: bool) -> bool:
-    """Echte Synchronisation der statischen Favoriten"""
-    success = True
+def static_favourites_path(folder: str) -> str:
+    """Lokaler Pfad der favourites.xml eines statischen Super-Favourites-Ordners"""
+    return os.path.join(config.super_favourites_path, folder, 'favourites.xml')
+
+def sync_static_folder_real(sync_manager: SyncManager, connection_manager: ConnectionManager, is_main: bool, folder: str, change_set: SyncChangeSet = None) -> bool:
+    """Echte Synchronisation eines einzelnen statischen Ordners"""
     try:
-        for folder in config.static_folders:
-            if not folder:
-                continue
-                
-            local_path = os.path.join(config.super_favourites_path, folder, 'favourites.xml')
-            remote_path = f"/{config.ftp_base_path}/auto_fav_sync/{config.custom_folder}/{folder}/favourites.xml"
-            
-            if is_main:
-                # Hauptsystem: Upload wenn sich etwas geändert hat
-                if sync_manager.needs_sync(local_path, remote_path):
-                    if upload_file(connection_manager, local_path, remote_path):
-                        sync_manager.update_sync_state(local_path, remote_path, True)
+        success = True
+        local_path = static_favourites_path(folder)
+        remote_path = f"/{config.ftp_base_path}/auto_fav_sync/{config.custom_folder}/{folder}/favourites.xml"
+        
+        if not is_main and static_folder_overwritten(folder):
+            # Der Inhalt kommt ausschließlich aus specific_custom_folder; ein Abgleich mit
+            # der eigenen Remote-Datei würde ihn bei jedem Lauf erneut ersetzen
+            return overwrite_static_folder_real(sync_manager, connection_manager, folder, change_set)
+        
+        merged = None
+        if config.merge_favourites:
+            merged = merge_favourites_real(sync_manager, connection_manager, local_path, remote_path, is_main, change_set)
+        
+        if merged is not None:
+            success = merged
+        elif is_main:
+            # Hauptsystem: Upload wenn sich etwas geändert hat
+            if sync_manager.needs_sync(local_path, remote_path, connection_manager):
+                delta = upload_favourites_delta(sync_manager, connection_manager, local_path, remote_path, change_set) if config.delta_uploads else None
+                if delta is not None:
+                    success = delta
+                else:
+                    # Hash erst für den vollständigen Upload berechnen
+                    content = sync_manager.upload_content(local_path)
+                    if upload_file(connection_manager, local_path, remote_path, content):
+                        sync_manager.update_sync_state(local_path, remote_path, True, connection_manager, compressed=content.get('compressed'))
+                        if config.delta_uploads:
+                            sync_manager.merge_bases.save(local_path)
+                        if change_set is not None:
+                            change_set.record_upload(local_path)
                         xbmc.log(f"Uploaded static favourites: {folder}", xbmc.LOGINFO)
                     else:
                         success = False
-            else:
-                # Subsystem: Download wenn Remote neuer ist
-                if sync_manager.needs_sync(local_path, remote_path):
-                    if download_file(connection_manager, remote_path, local_path):
-                        sync_manager.update_sync_state(local_path, remote_path, False)
+        else:
+            # Subsystem: Download wenn Remote neuer ist
+            if sync_manager.needs_sync(local_path, remote_path, connection_manager):
+                delta = download_favourites_delta(sync_manager, connection_manager, local_path, remote_path, change_set)
+                if delta is not None:
+                    success = delta
+                else:
+                    result = download_file(connection_manager, remote_path, local_path, sync_manager.download_content(remote_path))
+                    if result:
+                        sync_manager.update_sync_state(local_path, remote_path, False, connection_manager)
+                        if change_set is not None:
+                            change_set.record_download(local_path, result)
                         xbmc.log(f"Downloaded static favourites: {folder}", xbmc.LOGINFO)
                     else:
                         success = False
-                        
-                # Überschreiben falls aktiviert
-                if config.overwrite_static and folder == config.specific_custom_folder:
-                    specific_remote_path = f"/{config.ftp_base_path}/auto_fav_sync/{config.specific_custom_folder}/favourites.xml"
-                    if download_file(connection_manager, specific_remote_path, local_path):
-                        sync_manager.update_sync_state(local_path, specific_remote_path, False)
-                        xbmc.log(f"Overwritten static favourites: {folder}", xbmc.LOGINFO)
         
         return success
+    except Exception as e:
+        xbmc.log(f"Error syncing static favourites {folder}: {str(e)}", xbmc.LOGERROR)
+        return False
+
+def static_folder_overwritten(folder: str) -> bool:
+    """True, wenn ``overwrite_static`` den Ordner auf Subsystemen mit ``specific_custom_folder`` ersetzt"""
+    return bool(config.overwrite_static and folder and folder == config.specific_custom_folder)
+
+def overwrite_static_folder_real(sync_manager: SyncManager, connection_manager: ConnectionManager, folder: str, change_set: SyncChangeSet = None) -> bool:
+    """Überschreibt den Ordner ``specific_custom_folder`` mit dessen Favoriten vom Server (``overwrite_static``)
+    
+    Geladen wird nur, wenn sich die Quelle seit dem letzten Überschreiben geändert hat;
+    veröffentlichte Patches werden wie beim normalen Download angewendet.
+    """
+    if not static_folder_overwritten(folder):
+        return True
+    local_path = static_favourites_path(folder)
+    specific_remote_path = f"/{config.ftp_base_path}/auto_fav_sync/{config.specific_custom_folder}/favourites.xml"
+    if not sync_manager.needs_sync(local_path, specific_remote_path, connection_manager):
+        return True
+    delta = download_favourites_delta(sync_manager, connection_manager, local_path, specific_remote_path, change_set)
+    if delta is not None:
+        return delta
+    result = download_file(connection_manager, specific_remote_path, local_path, sync_manager.download_content(specific_remote_path))
+    if not result:
+        return False
+    sync_manager.update_sync_state(local_path, specific_remote_path, False, connection_manager)
+    if change_set is not None:
+        change_set.record_download(local_path, result)
+    xbmc.log(f"Overwritten static favourites: {folder}", xbmc.LOGINFO)
+    return True
+
+def static_bundle_remote_path() -> str:
+    """Remote-Pfad des Archivs mit allen statischen Ordnern"""
+    return f"/{config.ftp_base_path}/auto_fav_sync/{config.custom_folder}/{BUNDLE_FILE}"
+
+def sync_static_bundle_real(sync_manager: SyncManager, connection_manager: ConnectionManager, is_main: bool, change_set: SyncChangeSet = None, folders: List[str] = None) -> bool:
+    """Synchronisiert alle statischen Ordner über ein einziges Archiv (``static_bundle.zip``)
+    
+    Das Hauptsystem packt bei einer Änderung alle Ordner samt Index (Hash und
+    Größe je Ordner) in ein Archiv und lädt es in einem Vorgang hoch; der Index
+    steht zusätzlich im Manifest. Subsysteme laden das Archiv nur, wenn laut
+    Index ein Ordner abweicht, und entpacken nur diese Ordner.
+    """
+    try:
+        if folders is None:
+            folders = config.static_folders
+        folders = [folder for folder in folders if folder]
+        remote_path = static_bundle_remote_path()
+        entry = sync_manager.download_content(remote_path)
+        members = (entry or {}).get('members', {})
+        if is_main:
+            return upload_static_bundle(sync_manager, connection_manager, remote_path, members, change_set)
+        success = download_static_bundle(sync_manager, connection_manager, remote_path, entry,
+                                         [folder for folder in folders if not static_folder_overwritten(folder)], change_set)
+        for folder in folders:
+            success = overwrite_static_folder_real(sync_manager, connection_manager, folder, change_set) and success
+        return success
+    except Exception as e:
+        xbmc.log(f"Error syncing static bundle: {str(e)}", xbmc.LOGERROR)
+        return False
+
+def upload_static_bundle(sync_manager: SyncManager, connection_manager: ConnectionManager, remote_path: str, members: Dict, change_set: SyncChangeSet = None) -> bool:
+    """Packt alle statischen Ordner neu und lädt das Archiv hoch, sofern sich einer geändert hat"""
+    algorithm = config.hash_algorithm
+    files = {}
+    for folder in config.static_folders:
+        local_path = static_favourites_path(folder)
+        if not os.path.exists(local_path):
+            continue
+        item = {
+            'hash': sync_manager.get_file_hash(local_path, algorithm),
+            'hash_algo': algorithm,
+            'size': os.path.getsize(local_path)
+        }
+        content_hash = sync_manager.get_content_hash(local_path, algorithm)
+        if content_hash:
+            item['content_hash'] = content_hash
+        files[folder] = (local_path, item)
+    changed = [folder for folder, (local_path, _) in files.items()
+               if folder not in members or not sync_manager.content_matches(members[folder], 'hash', local_path)]
+    if not changed and set(members) <= set(files):
+        return True
+    
+    import tempfile
+    fd, temp_path = tempfile.mkstemp(suffix='.zip', dir=os.path.dirname(sync_manager.sync_state_file))
+    os.close(fd)
+    try:
+        write_bundle(temp_path, files, config.compression_level)
+        bundle_hash = hash_file(temp_path, algorithm)
+        size = os.path.getsize(temp_path)
+        if not connection_manager.upload_file(temp_path, remote_path, {'hash': bundle_hash, 'hash_algo': algorithm}):
+            return False
+    finally:
+        discard_partial(temp_path)
+    sync_manager.publish_bundle(remote_path, bundle_hash, size, algorithm, {folder: item for folder, (_, item) in files.items()})
+    if change_set is not None:
+        for folder in changed:
+            change_set.record_upload(files[folder][0])
+    xbmc.log(f"Uploaded static bundle: {len(files)} folders ({', '.join(changed) or 'removed folders'} changed), "
+             f"{size} bytes", xbmc.LOGINFO)
+    return True
+
+def download_static_bundle(sync_manager: SyncManager, connection_manager: ConnectionManager, remote_path: str, entry: Optional[Dict], folders: List[str], change_set: SyncChangeSet = None) -> bool:
+    """Lädt das Archiv einmal und entpackt nur Ordner, deren Hash laut Index abweicht"""
+    if entry is None:
+        xbmc.log("No static bundle on server", xbmc.LOGDEBUG)
+        return True
+    members = entry.get('members', {})
+    needed = [folder for folder in folders
+              if folder in members and not sync_manager.content_matches(members[folder], 'hash', static_favourites_path(folder))]
+    if not needed:
+        return True
+    
+    success = True
+    bundle_path = os.path.join(os.path.dirname(sync_manager.sync_state_file), BUNDLE_FILE)
+    if not download_file(connection_manager, remote_path, bundle_path, entry):
+        return False
+    try:
+        with zipfile.ZipFile(bundle_path) as bundle:
+            index = read_index(bundle)
+            for folder in needed:
+                item = index.get(folder)
+                if item is None:
+                    xbmc.log(f"Static bundle has no entry for {folder}", xbmc.LOGWARNING)
+                    success = False
+                    continue
+                local_path = static_favourites_path(folder)
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                part = local_path + PART_SUFFIX
+                extract_member(bundle, folder, part, getattr(connection_manager, 'buffer_size', DEFAULT_BUFFER_SIZE))
+                if not verify_partial(part, item.get('size'), item):
+                    discard_partial(part)
+                    success = False
+                    continue
+                result = replace_if_changed(part, local_path)
+                if change_set is not None:
+                    change_set.record_download(local_path, result)
+        xbmc.log(f"Extracted {len(needed)} of {len(members)} folders from static bundle", xbmc.LOGINFO)
+        return success
+    except (zipfile.BadZipFile, KeyError, OSError) as e:
+        xbmc.log(f"Error reading static bundle: {str(e)}", xbmc.LOGERROR)
+        return False
+    finally:
+        discard_partial(bundle_path)
+
+def sync_static_favourites_real(sync_manager: SyncManager, connection_manager: ConnectionManager, is_main: bool, change_set: SyncChangeSet = None, folders: List[str] = None) -> bool:
+    """Echte Synchronisation der statischen Favoriten
+    
+    Mit ``sync_workers`` > 1 laufen die Ordner parallel in einem begrenzten
+    Thread-Pool; jeder Worker nutzt dabei eine eigene Verbindung. ``folders``
+    beschränkt den Lauf auf einzelne Ordner (Standard: alle ``static_folders``).
+    Mit ``bundle_static_folders`` überträgt das Hauptsystem alle Ordner gemeinsam
+    als ein Archiv (siehe ``sync_static_bundle_real``). Subsysteme richten sich
+    nach dem Manifest-Eintrag des Archivs, nicht nach ihrer eigenen Einstellung.
+    """
+    try:
+        bundle_path = static_bundle_remote_path()
+        bundle_entry = sync_manager.download_content(bundle_path)
+        if config.bundle_static_folders if is_main else bool((bundle_entry or {}).get('members')):
+            return sync_static_bundle_real(sync_manager, connection_manager, is_main, change_set, folders)
+        if is_main and bundle_entry is not None:
+            # Zurück zu einzelnen Ordnern: das veraltete Archiv darf Subsysteme nicht mehr steuern
+            if sync_manager.manifest.remove_entry(bundle_path):
+                connection_manager.delete_file(bundle_path)
+                xbmc.log("Static folders are no longer bundled, removed static bundle", xbmc.LOGINFO)
+        if folders is None:
+            folders = config.static_folders
+        folders = [folder for folder in folders if folder]
+        workers = max(1, min(config.sync_workers, len(folders)))
+        
+        if workers == 1:
+            results = [sync_static_folder_real(sync_manager, connection_manager, is_main, folder, change_set) for folder in folders]
+            return all(results)
+        
+        worker_state = threading.local()
+        worker_managers = []
+        managers_lock = threading.Lock()
+        
+        def run_folder(folder: str) -> bool:
+            # Jeder Worker-Thread erhält seine eigene Backend-Sitzung
+            manager = getattr(worker_state, 'connection_manager', None)
+            if manager is None:
+                manager = create_connection_manager(config)
+                worker_state.connection_manager = manager
+                with managers_lock:
+                    worker_managers.append(manager)
+            return sync_static_folder_real(sync_manager, manager, is_main, folder, change_set)
+        
+        xbmc.log(f"Syncing {len(folders)} static folders with {workers} workers", xbmc.LOGINFO)
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='auto_ftp_sync') as executor:
+                results = list(executor.map(run_folder, folders))
+        finally:
+            for manager in worker_managers:
+                manager.close()
+        
+        return all(results)
     except Exception as e:
         xbmc.log(f"Error syncing static favourites: {str(e)}", xbmc.LOGERROR)
         return False
@@ -1226,19 +2925,19 @@ def sync_favourites_optimized() -> bool:
         xbmc.log(f"Error in sync_favourites: {str(e)}", xbmc.LOGERROR)
         return False
 
-# Hauptausführung - Echte Synchronisation
-if ENABLED:
-    # Protokoll-Status loggen
-    log_protocol_status()
-    
-    # Verwende die echte Synchronisation mit sofortiger UI-Aktualisierung
-    if sync_favourites_real():
+def run_sync(change_set: SyncChangeSet = None, paths: set = None) -> bool:
+    """Führt die echte Synchronisation aus, mit Fallback auf die ursprüngliche Version"""
+    # Verwende die echte Synchronisation mit gezielter UI-Aktualisierung
+    if sync_favourites_real(change_set, paths):
         xbmc.log("Real sync completed successfully", xbmc.LOGINFO)
-    else:
-        xbmc.log("Real sync failed, falling back to legacy sync", xbmc.LOGWARNING)
-        sync_favourites()  # Fallback auf ursprüngliche Version
-    
-    download_random_image()
+        return True
+    if get_breaker(config.ftp_host).is_open:
+        # Der Legacy-Sync würde für jede Datei erneut in denselben Timeout laufen
+        xbmc.log("Real sync failed and server is unavailable, skipping legacy sync", xbmc.LOGWARNING)
+        return False
+    xbmc.log("Real sync failed, falling back to legacy sync", xbmc.LOGWARNING)
+    sync_favourites()  # Fallback auf ursprüngliche Version
+    return False
 
 def force_sync():
     """Erzwingt eine vollständige Synchronisation"""
@@ -1248,6 +2947,7 @@ def force_sync():
         # Lösche den Sync-Status, um eine vollständige Synchronisation zu erzwingen
         sync_manager = SyncManager(config)
         sync_manager.save_sync_state({})
+        sync_manager.close()
         
         # Führe die echte Synchronisation durch
         if sync_favourites_real():
@@ -1273,7 +2973,9 @@ def add_category_placeholder(category_name: str) -> bool:
         
         if success:
             # Aktualisiere UI
-            refresh_favourites_ui()
+            change_set = SyncChangeSet(config)
+            change_set.record_rewrite(config.local_favourites)
+            refresh_favourites_ui(change_set)
             
         return success
         
@@ -1293,7 +2995,9 @@ def categorize_existing_favourites() -> bool:
         
         if success:
             # Aktualisiere UI
-            refresh_favourites_ui()
+            change_set = SyncChangeSet(config)
+            change_set.record_rewrite(config.local_favourites)
+            refresh_favourites_ui(change_set)
             
         return success
         
@@ -1331,3 +3035,152 @@ def test_connection() -> bool:
         xbmc.log(f"Connection test error: {str(e)}", xbmc.LOGERROR)
         show_notification(30029, 5000)  # Synchronisation fehlgeschlagen
         return False
+
+def local_watch_paths() -> List[str]:
+    """Lokale Dateien, deren Änderung einen gezielten Sync auslöst"""
+    return [config.local_favourites] + [static_favourites_path(folder) for folder in config.static_folders]
+
+class SyncService(xbmc.Monitor):
+    """Hintergrunddienst: synchronisiert wiederholt mit adaptivem Intervall
+    
+    Nach Änderungen wird im kürzesten Intervall erneut synchronisiert, im
+    Leerlauf verdoppelt sich der Abstand bis zum Maximum. Während der Wiedergabe
+    wird kein Sync gestartet; bei ``abortRequested`` endet der Dienst sauber.
+    Lokale Änderungen an den Favoriten-Dateien meldet ein ``FileWatcher``; sie
+    werden gezielt und ohne Warten auf das nächste Intervall übertragen.
+    Der erste Sync läuft in einem Hintergrund-Thread, sobald Kodi im Leerlauf
+    ist, damit der Dienst den Start bis zum Home-Bildschirm nicht verzögert.
+    """
+    
+    # Prüfintervall (Sekunden), solange eine Wiedergabe läuft oder der Sync deaktiviert ist
+    PLAYBACK_RECHECK_SECONDS = 30
+    # Wie oft (Sekunden) zwischen zwei Läufen auf lokale Änderungen geprüft wird
+    WATCH_CHECK_SECONDS = 1
+    # Leerlaufzeit (Sekunden), ab der der erste Sync startet, und Obergrenze der Wartezeit
+    STARTUP_IDLE_SECONDS = 5
+    STARTUP_MAX_DELAY = 60
+    
+    def __init__(self):
+        super().__init__()
+        self.player = xbmc.Player()
+        self.scheduler = AdaptiveScheduler(config.sync_interval_min * 60, config.sync_interval_max * 60)
+        self.watcher = None
+        self._sync_lock = threading.Lock()
+    
+    def onSettingsChanged(self):
+        """Einstellungen neu laden und bald erneut synchronisieren"""
+        config.reload()
+        self.scheduler.configure(config.sync_interval_min * 60, config.sync_interval_max * 60)
+        self.start_watcher()
+        xbmc.log("Settings changed, sync schedule reset", xbmc.LOGINFO)
+    
+    def start_watcher(self):
+        """(Re-)Startet den Datei-Watcher für die aktuell konfigurierten Pfade"""
+        self.stop_watcher()
+        if config.enabled and config.watch_local_changes:
+            self.watcher = FileWatcher(local_watch_paths())
+            self.watcher.start()
+    
+    def stop_watcher(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+    
+    def is_busy(self) -> bool:
+        """Während der Wiedergabe wird nicht synchronisiert"""
+        return self.player.isPlaying()
+    
+    def is_syncing(self) -> bool:
+        return self._sync_lock.locked()
+    
+    def sync_once(self, paths: set = None):
+        # Läuft bereits ein Sync (z. B. der verzögerte erste Lauf), deckt dieser den Aufruf ab
+        if not self._sync_lock.acquire(blocking=False):
+            xbmc.log("Sync already running, skipping", xbmc.LOGDEBUG)
+            return
+        try:
+            self._sync(paths)
+        finally:
+            self._sync_lock.release()
+    
+    def _sync(self, paths: set = None):
+        change_set = SyncChangeSet(config)
+        run_sync(change_set, paths)
+        if self.watcher is not None:
+            # Vom Sync selbst geschriebene Dateien nicht erneut hochladen
+            self.watcher.discard(change_set.downloaded + change_set.rewritten)
+        if paths is None:
+            self.scheduler.record_result(change_set.changed)
+        elif change_set.changed:
+            self.scheduler.reset()
+        xbmc.log(f"Next sync in {int(self.scheduler.next_delay())} s", xbmc.LOGDEBUG)
+    
+    def wait_for_next_sync(self) -> bool:
+        """Wartet bis zum nächsten planmäßigen Lauf und synchronisiert lokale
+        Änderungen zwischendurch gezielt. Liefert True bei ``abortRequested``."""
+        deadline = time.monotonic() + self.scheduler.next_delay()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self.watcher is None:
+                return self.waitForAbort(remaining)
+            if self.waitForAbort(min(remaining, self.WATCH_CHECK_SECONDS)):
+                return True
+            if not config.enabled or self.is_busy() or self.is_syncing():
+                continue
+            paths = self.watcher.take_ready()
+            if paths:
+                xbmc.log(f"Local changes detected: {', '.join(sorted(paths))}", xbmc.LOGINFO)
+                self.sync_once(paths)
+    
+    def wait_for_idle(self) -> bool:
+        """Wartet, bis Kodi gestartet und im Leerlauf ist (höchstens ``STARTUP_MAX_DELAY``)"""
+        deadline = time.monotonic() + self.STARTUP_MAX_DELAY
+        while time.monotonic() < deadline:
+            if (xbmc.getGlobalIdleTime() >= self.STARTUP_IDLE_SECONDS
+                    and not xbmc.getCondVisibility('Window.IsActive(busydialog)')):
+                return True
+            if self.waitForAbort(1):
+                return False
+        return not self.abortRequested()
+    
+    def initial_sync(self):
+        """Erster Sync und Bildrotation, im Hintergrund nach dem Kodi-Start"""
+        if not self.wait_for_idle():
+            return
+        # Protokoll-Status loggen
+        log_protocol_status()
+        if config.enabled:
+            self.sync_once()
+            download_random_image()
+        xbmc.log(f"Initial sync finished {time.monotonic() - STARTUP_STARTED:.1f} s after service start", xbmc.LOGINFO)
+    
+    def run(self):
+        self.start_watcher()
+        threading.Thread(target=self.initial_sync, name="auto_ftp_sync.startup", daemon=True).start()
+        xbmc.log(f"Auto FTP Sync service started in {(time.monotonic() - STARTUP_STARTED) * 1000:.0f} ms", xbmc.LOGINFO)
+        
+        while not self.abortRequested():
+            if self.wait_for_next_sync():
+                break
+            # Während der Wiedergabe pausieren, danach sofort nachholen
+            while self.is_busy() or not config.enabled:
+                if self.waitForAbort(self.PLAYBACK_RECHECK_SECONDS):
+                    break
+            if self.abortRequested():
+                break
+            self.sync_once()
+        
+        self.shutdown()
+    
+    def shutdown(self):
+        """Gibt Verbindungen und Hintergrund-Threads frei"""
+        self.stop_watcher()
+        NOTIFICATIONS.stop()
+        close_all_pools()
+        xbmc.log("Auto FTP Sync service stopped", xbmc.LOGINFO)
+
+# Hauptausführung - Hintergrunddienst mit echter Synchronisation
+if __name__ == '__main__':
+    SyncService().run()
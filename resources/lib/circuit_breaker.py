@@ -0,0 +1,110 @@
+import time
+import random
+import threading
+import xbmc
+
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN = 300.0
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 8.0
+
+
+class CircuitOpenError(ConnectionError):
+    """Der Server gilt nach wiederholten Fehlern vorübergehend als nicht erreichbar."""
+
+
+class CircuitBreaker:
+    """Schlägt nach ``failure_threshold`` aufeinanderfolgenden Fehlern für ``cooldown``
+    Sekunden sofort fehl, statt erneut auf TCP-Timeouts zu warten.
+
+    Nach Ablauf der Wartezeit wird genau ein Versuch durchgelassen (half-open);
+    gelingt er, ist der Breaker wieder geschlossen, sonst beginnt die Wartezeit neu.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 cooldown: float = BREAKER_COOLDOWN):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """True, solange die Wartezeit nach dem Auslösen noch läuft."""
+        with self._lock:
+            return self._opened_at is not None and time.monotonic() - self._opened_at < self.cooldown
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.cooldown or self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                xbmc.log(f"Circuit for {self.name} closed", xbmc.LOGINFO)
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                xbmc.log(f"Circuit for {self.name} open for {int(self.cooldown)} s "
+                         f"after {self._failures} failures", xbmc.LOGWARNING)
+
+    def call(self, func):
+        """Führt ``func`` aus, sofern der Breaker es zulässt, und zählt das Ergebnis."""
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} unavailable, retrying after cooldown")
+        try:
+            result = func()
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+def retry_with_backoff(func, retries: int, is_transient, base_delay: float = RETRY_BASE_DELAY,
+                       max_delay: float = RETRY_MAX_DELAY):
+    """Ruft ``func`` auf und wiederholt es bei vorübergehenden Fehlern höchstens ``retries`` Mal.
+
+    Die Wartezeit wächst exponentiell bis ``max_delay`` und wird zufällig gestreut
+    (full jitter), damit mehrere Geräte den Server nicht gleichzeitig erneut anfragen.
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= retries or not is_transient(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            attempt += 1
+            xbmc.log(f"Transient error ({str(e)}), retry {attempt}/{retries} in {delay:.1f} s", xbmc.LOGWARNING)
+            time.sleep(delay)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """Liefert den prozessweiten Circuit Breaker für ``host``."""
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host)
+            _breakers[host] = breaker
+        return breaker
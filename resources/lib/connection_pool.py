@@ -0,0 +1,175 @@
+import time
+import threading
+import xbmc
+from contextlib import contextmanager
+
+
+# Standard-Leerlaufzeit (Sekunden); länger als das kürzeste Sync-Intervall (5 Minuten)
+DEFAULT_IDLE_TIMEOUT = 600.0
+
+
+class ConnectionPool:
+    """Pool wiederverwendbarer Verbindungen zu einem Server.
+
+    Freigegebene Verbindungen bleiben bis ``idle_timeout`` im Pool; danach
+    schließt sie ein Timer, auch wenn der Pool nicht mehr benutzt wird. Vor der
+    Wiederverwendung einer Verbindung, die länger als ``probe_after`` Sekunden
+    unbenutzt war, wird ``probe`` aufgerufen (z. B. FTP ``NOOP``); schlägt die
+    Probe fehl, wird die Verbindung verworfen und transparent eine neue aufgebaut.
+    Höchstens ``max_size`` freie Verbindungen werden vorgehalten.
+
+    Die Factory wird bei ``acquire`` übergeben, damit der Pool keine Instanz
+    eines Verbindungsmanagers (und deren Einstellungen) festhält. Freie
+    Verbindungen, die mit anderen ``options`` (z. B. Timeouts) aufgebaut wurden,
+    werden nicht wiederverwendet, sondern geschlossen.
+    """
+
+    def __init__(self, name: str, factory=None, probe=None, closer=None,
+                 max_size: int = 4, idle_timeout: float = DEFAULT_IDLE_TIMEOUT, probe_after: float = 10.0):
+        self.name = name
+        self._factory = factory
+        self._probe = probe
+        self._closer = closer
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.probe_after = probe_after
+        self._idle = []  # [(connection, zuletzt benutzt)]
+        self._options = {}  # id(connection) -> options beim Aufbau
+        self._lock = threading.Lock()
+        self._timer = None
+        self.created = 0
+        self.reused = 0
+
+    def _close(self, connection) -> None:
+        self._options.pop(id(connection), None)
+        if self._closer is None:
+            return
+        try:
+            self._closer(connection)
+        except Exception as e:
+            xbmc.log(f"Error closing pooled {self.name} connection: {str(e)}", xbmc.LOGDEBUG)
+
+    def _evict_idle(self) -> list:
+        """Entfernt abgelaufene Verbindungen; muss unter dem Lock aufgerufen werden."""
+        now = time.monotonic()
+        expired = [entry for entry in self._idle if now - entry[1] > self.idle_timeout]
+        self._idle = [entry for entry in self._idle if now - entry[1] <= self.idle_timeout]
+        return [connection for connection, _ in expired]
+
+    def _schedule_eviction(self) -> None:
+        """Startet den Timer bis zum Ablauf der ältesten freien Verbindung; unter dem Lock aufrufen."""
+        if self._timer is not None or not self._idle:
+            return
+        delay = max(0.0, min(last_used for _, last_used in self._idle) + self.idle_timeout - time.monotonic())
+        self._timer = threading.Timer(delay + 1.0, self._evict_expired)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _evict_expired(self) -> None:
+        with self._lock:
+            self._timer = None
+            expired = self._evict_idle()
+            self._schedule_eviction()
+        for connection in expired:
+            xbmc.log(f"Closing idle {self.name} connection", xbmc.LOGDEBUG)
+            self._close(connection)
+
+    def acquire(self, factory=None, options=None):
+        """Liefert eine funktionsfähige Verbindung aus dem Pool oder baut über ``factory`` eine neue auf."""
+        while True:
+            with self._lock:
+                expired = self._evict_idle()
+                entry = self._idle.pop() if self._idle else None
+            for connection in expired:
+                self._close(connection)
+            if entry is None:
+                break
+            connection, last_used = entry
+            if self._options.get(id(connection)) != options:
+                xbmc.log(f"Replacing {self.name} connection built with other options", xbmc.LOGDEBUG)
+                self._close(connection)
+                continue
+            if self._probe is not None and time.monotonic() - last_used > self.probe_after:
+                try:
+                    if self._probe(connection) is False:
+                        raise ConnectionError("probe failed")
+                except Exception as e:
+                    xbmc.log(f"Discarding stale {self.name} connection: {str(e)}", xbmc.LOGDEBUG)
+                    self._close(connection)
+                    continue
+            self.reused += 1
+            return connection
+        connection = (factory or self._factory)()
+        self._options[id(connection)] = options
+        self.created += 1
+        return connection
+
+    def release(self, connection, broken: bool = False) -> None:
+        """Gibt eine Verbindung zurück; defekte oder überzählige Verbindungen werden geschlossen."""
+        if connection is None:
+            return
+        with self._lock:
+            expired = self._evict_idle()
+            if not broken and len(self._idle) < self.max_size:
+                self._idle.append((connection, time.monotonic()))
+                self._schedule_eviction()
+                connection = None
+        for stale in expired:
+            self._close(stale)
+        if connection is not None:
+            self._close(connection)
+
+    @contextmanager
+    def connection(self, factory=None, options=None):
+        """Kontextmanager: Verbindung ausleihen und danach zurückgeben."""
+        connection = self.acquire(factory, options)
+        try:
+            yield connection
+        except Exception:
+            self.release(connection, broken=True)
+            raise
+        else:
+            self.release(connection)
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for connection, _ in idle:
+            self._close(connection)
+
+
+# Prozessweite Pools, damit wiederholte Syncs in derselben Kodi-Sitzung
+# bestehende Logins weiterverwenden
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key: tuple, factory=None, probe=None, closer=None, **kwargs) -> ConnectionPool:
+    """Liefert den Pool für ``key`` und legt ihn bei Bedarf an.
+
+    ``probe`` und ``closer`` sollten ungebundene Funktionen sein; die Factory
+    des jeweiligen Verbindungsmanagers wird bei ``acquire`` übergeben. Weitere
+    Argumente (z. B. ``idle_timeout``) gelten auch für einen bestehenden Pool,
+    damit geänderte Einstellungen wirken.
+    """
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(str(key[0]), factory, probe, closer, **kwargs)
+            _pools[key] = pool
+        else:
+            for name, value in kwargs.items():
+                setattr(pool, name, value)
+        return pool
+
+
+def close_all_pools() -> None:
+    """Schließt alle gepoolten Verbindungen (z. B. beim Beenden des Dienstes)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
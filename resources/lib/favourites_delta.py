@@ -0,0 +1,150 @@
+import copy
+import json
+import time
+import xml.etree.ElementTree as ET
+import xbmc
+
+from resources.lib.favourites_merge import MergeError, entry_value
+
+PATCH_VERSION = 1
+
+
+class _Chain:
+    """Doppelt verkettete Liste über Dictionaries; Einfügen, Entfernen und Verschieben in O(1).
+
+    ``None`` dient als Kopf und Ende der (ringförmigen) Liste.
+    """
+
+    def __init__(self, keys):
+        self.next = {None: None}
+        self.prev = {None: None}
+        for key in keys:
+            self.insert_after(key, self.prev[None])
+
+    def __contains__(self, key) -> bool:
+        return key is not None and key in self.next
+
+    def __iter__(self):
+        key = self.next[None]
+        while key is not None:
+            yield key
+            key = self.next[key]
+
+    def remove(self, key) -> None:
+        before, after = self.prev.pop(key), self.next.pop(key)
+        self.next[before] = after
+        self.prev[after] = before
+
+    def insert_after(self, key, anchor) -> None:
+        after = self.next[anchor]
+        self.next[anchor] = key
+        self.prev[key] = anchor
+        self.next[key] = after
+        self.prev[after] = key
+
+
+def _key_json(key):
+    return list(key) if key is not None else None
+
+
+def _entry_json(element) -> dict:
+    """Serialisiert einen Favoriten vollständig, also auch Kindelemente wie ``<action>``.
+
+    ``text`` und ``attrib`` bleiben für ältere Versionen erhalten, die ``xml`` nicht kennen.
+    """
+    entry = copy.copy(element)
+    entry.tail = None
+    return {"text": element.text or "", "attrib": dict(element.attrib),
+            "xml": ET.tostring(entry, encoding="unicode")}
+
+
+def _entry_element(data: dict):
+    if data.get("xml"):
+        try:
+            return ET.fromstring(data["xml"])
+        except ET.ParseError as e:
+            raise MergeError(f"Invalid patch entry: {str(e)}")
+    element = ET.Element("favourite", dict(data.get("attrib") or {}))
+    element.text = data.get("text", "")
+    return element
+
+
+def diff_favourites(old: list, new: list) -> list:
+    """Beschreibt den Übergang von ``old`` zu ``new`` als Liste von Patch-Operationen.
+
+    ``remove`` entfernt einen Eintrag, ``add`` fügt einen Eintrag hinter ``after``
+    ein (oder ersetzt ihn, wenn der Schlüssel schon existiert), ``move`` verschiebt
+    ihn hinter ``after``. Die Einträge von ``new`` werden der Reihe nach gegen eine
+    verkettete Liste des Zwischenstands geprüft, daher ist der Aufwand linear.
+    """
+    old_map = dict(old)
+    new_map = dict(new)
+    ops = [{"op": "remove", "key": _key_json(key)} for key, _ in old if key not in new_map]
+    chain = _Chain(key for key, _ in old if key in new_map)
+    previous = None
+    for key, element in new:
+        if key not in chain or entry_value(element) != entry_value(old_map[key]):
+            ops.append({"op": "add", "key": _key_json(key), "after": _key_json(previous),
+                        "entry": _entry_json(element)})
+        elif chain.prev[key] != previous:
+            ops.append({"op": "move", "key": _key_json(key), "after": _key_json(previous)})
+        else:
+            previous = key
+            continue
+        if key in chain:
+            chain.remove(key)
+        chain.insert_after(key, previous)
+        previous = key
+    return ops
+
+
+def apply_patch(entries: list, ops: list) -> list:
+    """Wendet Patch-Operationen aus ``diff_favourites`` auf (Schlüssel, Element)-Paare an."""
+    elements = dict(entries)
+    chain = _Chain(key for key, _ in entries)
+    for op in ops:
+        kind = op.get("op")
+        key = tuple(op["key"])
+        if kind == "remove":
+            if key in chain:
+                chain.remove(key)
+                del elements[key]
+            continue
+        if kind not in ("add", "move"):
+            raise MergeError(f"Unknown patch operation: {kind}")
+        after = tuple(op["after"]) if op.get("after") is not None else None
+        if after is not None and after not in chain:
+            raise MergeError(f"Patch anchor {after} not found")
+        if kind == "add":
+            elements[key] = _entry_element(op.get("entry") or {})
+        elif key not in chain:
+            raise MergeError(f"Cannot move missing entry {key}")
+        if key in chain:
+            chain.remove(key)
+        chain.insert_after(key, after)
+    return [(key, elements[key]) for key in chain]
+
+
+def write_patch(file_path: str, seq: int, ops: list) -> None:
+    """Schreibt einen Patch mit Sequenznummer als kompaktes JSON."""
+    data = {
+        "version": PATCH_VERSION,
+        "seq": seq,
+        "writer": xbmc.getInfoLabel("System.ComputerName"),
+        "created": time.time(),
+        "ops": ops,
+    }
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def read_patch(file_path: str, seq: int) -> list:
+    """Liest die Operationen eines Patches und prüft dessen Sequenznummer."""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise MergeError(f"Cannot read patch {seq}: {str(e)}")
+    if data.get("seq") != seq or not isinstance(data.get("ops"), list):
+        raise MergeError(f"Patch {seq} is invalid")
+    return data["ops"]
@@ -0,0 +1,195 @@
+import os
+import copy
+import shutil
+import hashlib
+import xml.etree.ElementTree as ET
+import xbmc
+
+from resources.lib.hashing import canonical_children
+from resources.lib.transfer import PART_SUFFIX
+
+
+class MergeError(ValueError):
+    """Eine Favoriten-Datei ist kein gültiges favourites.xml und kann nicht gemerged werden."""
+
+
+class MergeResult:
+    """Ergebnis eines Drei-Wege-Merges.
+
+    ``local_changed``/``remote_changed`` geben an, ob sich die jeweilige Seite
+    durch den Merge ändert; nur dann muss geschrieben bzw. übertragen werden.
+    """
+
+    def __init__(self, entries: list, local_changed: bool, remote_changed: bool, conflicts: int = 0):
+        self.entries = entries
+        self.local_changed = local_changed
+        self.remote_changed = remote_changed
+        self.conflicts = conflicts
+
+    def __repr__(self) -> str:
+        return (f"MergeResult(entries={len(self.entries)}, local_changed={self.local_changed}, "
+                f"remote_changed={self.remote_changed}, conflicts={self.conflicts})")
+
+
+def entry_value(element) -> tuple:
+    """Vergleichswert eines Favoriten: Aktion, Attribute und Kindelemente, ohne Leerzeichen-Unterschiede."""
+    return ((element.text or "").strip(),
+            tuple(sorted((name, value.strip()) for name, value in element.attrib.items())),
+            canonical_children(element))
+
+
+def parse_favourites(file_path: str) -> list:
+    """Liest eine favourites.xml als Liste von (Schlüssel, Element) in Dateireihenfolge.
+
+    Schlüssel ist die Aktion (ersatzweise der Name) zusammen mit der laufenden
+    Nummer gleicher Aktionen, damit auch doppelte Einträge eindeutig bleiben.
+    """
+    try:
+        root = ET.parse(file_path).getroot()
+    except (ET.ParseError, OSError) as e:
+        raise MergeError(f"Cannot parse {file_path}: {str(e)}")
+    if root.tag != "favourites":
+        raise MergeError(f"{file_path} is not a favourites file")
+    entries = []
+    seen = {}
+    for element in root.iter("favourite"):
+        key = (element.text or "").strip() or (element.get("name") or "").strip()
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        entries.append(((key, occurrence), element))
+    return entries
+
+
+def _order_changed(side: list, base: list, side_keys: dict, base_keys: dict) -> bool:
+    """True, wenn eine Seite gemeinsame Einträge gegenüber der Basis umsortiert hat."""
+    return ([key for key, _ in side if key in base_keys]
+            != [key for key, _ in base if key in side_keys])
+
+
+def merge_favourites(base: list, local: list, remote: list, prefer_local: bool = False) -> MergeResult:
+    """Führt lokale und entfernte Änderungen gegenüber dem letzten gemeinsamen Stand zusammen.
+
+    Je Eintrag gewinnt die Seite, die ihn gegenüber ``base`` geändert, hinzugefügt
+    oder gelöscht hat. Haben beide Seiten denselben Eintrag unterschiedlich
+    geändert, entscheidet ``prefer_local``; eine Änderung gewinnt gegen eine
+    Löschung. Die Reihenfolge stammt von der Seite, die umsortiert hat, neue
+    Einträge der anderen Seite folgen ihrem dortigen Vorgänger. Alle Schritte
+    laufen über Dictionaries in linearer Zeit.
+    """
+    base_map = dict(base)
+    local_map = dict(local)
+    remote_map = dict(remote)
+    merged = {}
+    conflicts = 0
+    for key in [key for key, _ in local] + [key for key, _ in remote if key not in local_map]:
+        local_element = local_map.get(key)
+        remote_element = remote_map.get(key)
+        base_element = base_map.get(key)
+        local_value = entry_value(local_element) if local_element is not None else None
+        remote_value = entry_value(remote_element) if remote_element is not None else None
+        base_value = entry_value(base_element) if base_element is not None else None
+        if local_value == remote_value:
+            chosen = local_element
+        elif local_value == base_value:
+            chosen = remote_element
+        elif remote_value == base_value:
+            chosen = local_element
+        else:
+            conflicts += 1
+            if local_element is None or remote_element is None:
+                chosen = local_element if local_element is not None else remote_element
+            else:
+                chosen = local_element if prefer_local else remote_element
+        if chosen is not None:
+            merged[key] = chosen
+
+    local_keys = [key for key, _ in local if key in merged]
+    remote_keys = [key for key, _ in remote if key in merged]
+    local_moved = _order_changed(local, base, local_map, base_map)
+    remote_moved = _order_changed(remote, base, remote_map, base_map)
+    if local_moved and (prefer_local or not remote_moved):
+        primary, secondary = local_keys, remote_keys
+    else:
+        primary, secondary = remote_keys, local_keys
+
+    # Einträge, die nur die andere Seite kennt, hinter ihrem dortigen Vorgänger einfügen
+    primary_keys = set(primary)
+    following = {}
+    anchor = None
+    for key in secondary:
+        if key in primary_keys:
+            anchor = key
+        else:
+            following.setdefault(anchor, []).append(key)
+    order = list(following.get(None, ()))
+    for key in primary:
+        order.append(key)
+        order.extend(following.get(key, ()))
+
+    entries = [(key, merged[key]) for key in order]
+    values = [(key, entry_value(element)) for key, element in entries]
+    return MergeResult(
+        entries,
+        local_changed=values != [(key, entry_value(element)) for key, element in local],
+        remote_changed=values != [(key, entry_value(element)) for key, element in remote],
+        conflicts=conflicts
+    )
+
+
+def write_favourites(file_path: str, entries: list) -> None:
+    """Schreibt Favoriten im Kodi-Format atomar (Nachbardatei + ``os.replace``)."""
+    root = ET.Element("favourites")
+    root.text = "\n    "
+    for _, element in entries:
+        favourite = copy.copy(element)
+        favourite.tail = "\n    "
+        root.append(favourite)
+    if len(root):
+        root[-1].tail = "\n"
+    else:
+        root.text = "\n"
+    # Auf einem neuen Subsystem existiert der Ordner (z. B. Super Favourites) noch nicht
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    part = file_path + PART_SUFFIX
+    with open(part, "w", encoding="utf-8") as f:
+        f.write(ET.tostring(root, encoding="unicode"))
+        f.write("\n")
+    os.replace(part, file_path)
+
+
+class MergeBaseStore:
+    """Letzter synchronisierter Stand je Favoriten-Datei, die Basis des Drei-Wege-Merges."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _name(self, local_path: str) -> str:
+        return hashlib.sha1(local_path.encode("utf-8")).hexdigest()[:16]
+
+    def base_path(self, local_path: str) -> str:
+        return os.path.join(self.directory, self._name(local_path) + ".base.xml")
+
+    def remote_copy_path(self, local_path: str) -> str:
+        """Ablage für die heruntergeladene Remote-Version während des Merges."""
+        os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, self._name(local_path) + ".remote.xml")
+
+    def load(self, local_path: str) -> list | None:
+        """Liefert die Basis-Einträge oder None, wenn noch kein (gültiger) Stand vorliegt."""
+        path = self.base_path(local_path)
+        if not os.path.exists(path):
+            return None
+        try:
+            return parse_favourites(path)
+        except MergeError as e:
+            xbmc.log(f"Ignoring merge base for {local_path}: {str(e)}", xbmc.LOGWARNING)
+            return None
+
+    def save(self, local_path: str) -> None:
+        """Übernimmt den aktuellen Inhalt von ``local_path`` als neue Basis."""
+        if not os.path.exists(local_path):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.base_path(local_path)
+        shutil.copyfile(local_path, path + PART_SUFFIX)
+        os.replace(path + PART_SUFFIX, path)
@@ -0,0 +1,225 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import threading
+import ctypes
+import ctypes.util
+import xbmc
+
+# inotify-Konstanten aus <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """Minimaler inotify-Zugriff über ctypes (nur Linux)."""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, directory: str) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        return wd
+
+    def read_events(self, timeout: float) -> list:
+        """Liefert [(wd, mask, name)] oder eine leere Liste nach ``timeout`` Sekunden."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return []
+            raise
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Beobachtet einzelne Dateien und meldet Änderungen gebündelt.
+
+    Unter Linux werden die Elternordner per inotify überwacht (Kodi ersetzt Dateien
+    häufig per Umbenennen). Ordner, die (noch) nicht existieren oder nicht per
+    inotify überwacht werden können, werden alle ``poll_interval`` Sekunden per
+    ``os.scandir`` auf geänderte mtimes geprüft. Eine Datei gilt erst als geändert,
+    wenn ``debounce`` Sekunden lang kein weiteres Ereignis für sie eintraf.
+    """
+
+    def __init__(self, paths, debounce: float = 2.0, poll_interval: float = 5.0):
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._targets = {}  # Ordner -> {Dateiname: Pfad}
+        for path in paths:
+            directory, name = os.path.split(os.path.abspath(path))
+            self._targets.setdefault(directory, {})[name] = path
+        self._pending = {}  # Pfad -> Zeitpunkt des letzten Ereignisses
+        self._ignored = {}  # Pfad -> (mtime_ns, Größe) einer selbst geschriebenen Version
+        self._snapshots = {}  # Ordner -> {Dateiname: (mtime_ns, Größe)}
+        self._watches = {}  # wd -> Ordner
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._inotify = None
+        if sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                xbmc.log(f"inotify unavailable, using polling: {str(e)}", xbmc.LOGINFO)
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def start(self) -> None:
+        for directory in self._targets:
+            self._snapshots[directory] = self._scan(directory)
+        self._add_watches()
+        self._thread = threading.Thread(target=self._run, name="auto_ftp_sync.watcher", daemon=True)
+        self._thread.start()
+        xbmc.log(f"Watching {sum(len(t) for t in self._targets.values())} files ({self.mode})", xbmc.LOGINFO)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def take_ready(self) -> set:
+        """Liefert alle Pfade, deren letzte Änderung länger als ``debounce`` zurückliegt."""
+        now = time.monotonic()
+        with self._lock:
+            ready = {path for path, last in self._pending.items() if now - last >= self.debounce}
+            for path in ready:
+                del self._pending[path]
+        return ready
+
+    def discard(self, paths) -> None:
+        """Verwirft Ereignisse für Pfade, die das Addon selbst geschrieben hat.
+
+        Auch später eintreffende Ereignisse werden ignoriert, solange sich mtime
+        und Größe der Datei nicht erneut ändern.
+        """
+        with self._lock:
+            for path in paths:
+                self._pending.pop(path, None)
+                self._ignored[path] = self._signature(path)
+        for directory in {os.path.dirname(os.path.abspath(path)) for path in paths}:
+            if directory in self._snapshots:
+                self._snapshots[directory] = self._scan(directory)
+
+    @staticmethod
+    def _signature(path: str):
+        try:
+            st = os.stat(path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _mark(self, path: str) -> None:
+        with self._lock:
+            if path in self._ignored:
+                if self._ignored[path] == self._signature(path):
+                    return
+                del self._ignored[path]
+            self._pending[path] = time.monotonic()
+
+    def _add_watches(self) -> None:
+        if self._inotify is None:
+            return
+        watched = set(self._watches.values())
+        for directory in self._targets:
+            if directory in watched or not os.path.isdir(directory):
+                continue
+            try:
+                self._watches[self._inotify.add_watch(directory)] = directory
+            except OSError as e:
+                xbmc.log(f"Cannot watch {directory}, using polling: {str(e)}", xbmc.LOGDEBUG)
+
+    def _scan(self, directory: str) -> dict:
+        """Liest mtime und Größe der beobachteten Dateien eines Ordners per ``os.scandir``."""
+        names = self._targets[directory]
+        snapshot = {}
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name in names:
+                        st = entry.stat()
+                        snapshot[entry.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            pass
+        return snapshot
+
+    def _poll_unwatched(self, watched: set) -> None:
+        for directory, names in self._targets.items():
+            if directory in watched:
+                continue
+            snapshot = self._scan(directory)
+            previous = self._snapshots.get(directory, {})
+            for name in set(snapshot) | set(previous):
+                if snapshot.get(name) != previous.get(name):
+                    self._mark(names[name])
+            self._snapshots[directory] = snapshot
+
+    def _run(self) -> None:
+        last_poll = time.monotonic()
+        while not self._stop.is_set():
+            if self._inotify is not None:
+                try:
+                    events = self._inotify.read_events(min(1.0, self.poll_interval))
+                except OSError as e:
+                    xbmc.log(f"inotify read failed, using polling: {str(e)}", xbmc.LOGWARNING)
+                    self._inotify.close()
+                    self._inotify = None
+                    self._watches.clear()
+                    continue
+                for wd, mask, name in events:
+                    directory = self._watches.get(wd)
+                    if directory is None:
+                        continue
+                    if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                        # Ordner gelöscht/verschoben: bis zur Neuanlage per Polling prüfen
+                        self._watches.pop(wd, None)
+                        continue
+                    path = self._targets[directory].get(name)
+                    if path is not None:
+                        self._mark(path)
+            else:
+                self._stop.wait(min(1.0, self.poll_interval))
+            if time.monotonic() - last_poll >= self.poll_interval:
+                last_poll = time.monotonic()
+                # Neu überwachte Ordner ein letztes Mal abgleichen, damit Änderungen
+                # zwischen Anlage des Ordners und inotify_add_watch nicht verloren gehen
+                watched = set(self._watches.values())
+                self._add_watches()
+                self._poll_unwatched(watched)
@@ -0,0 +1,166 @@
+import os
+import json
+import mmap
+import hashlib
+import threading
+import xml.etree.ElementTree as ET
+import xbmc
+
+DEFAULT_HASH_ALGORITHM = "blake2b"
+# Hash-Verfahren von Statuseinträgen ohne "hash_algo" (ältere Versionen)
+LEGACY_HASH_ALGORITHM = "md5"
+HASH_CHUNK_SIZE = 64 * 1024
+MMAP_THRESHOLD = 8 * 1024 * 1024
+# Hash-Cache-Variante für semantische Hashes (z. B. "blake2b:canonical")
+CANONICAL_VARIANT_SUFFIX = ":canonical"
+
+_buffers = threading.local()
+
+
+def _chunk_buffer(size: int) -> memoryview:
+    """Liefert einen pro Thread wiederverwendeten Lesepuffer."""
+    buffer = getattr(_buffers, "buffer", None)
+    if buffer is None or len(buffer) != size:
+        buffer = memoryview(bytearray(size))
+        _buffers.buffer = buffer
+    return buffer
+
+
+def hash_file(file_path: str, algorithm: str = DEFAULT_HASH_ALGORITHM,
+              chunk_size: int = HASH_CHUNK_SIZE, mmap_threshold: int = MMAP_THRESHOLD) -> str:
+    """Berechnet den Hash einer Datei, ohne sie vollständig in den Speicher zu laden.
+
+    Kleine Dateien werden blockweise in einen wiederverwendeten Puffer gelesen,
+    Dateien ab ``mmap_threshold`` werden per ``mmap`` eingeblendet.
+    """
+    digest = hashlib.new(algorithm)
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        else:
+            buffer = _chunk_buffer(chunk_size)
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                digest.update(buffer[:read])
+    return digest.hexdigest()
+
+
+def canonical_children(element) -> list:
+    """Kindelemente (z. B. ``<action>`` kategorisierter Favoriten) in normalisierter Form."""
+    return [[child.tag,
+             sorted((name, value.strip()) for name, value in child.attrib.items()),
+             (child.text or "").strip(),
+             canonical_children(child)]
+            for child in element]
+
+
+def canonical_favourites_hash(file_path: str, algorithm: str = DEFAULT_HASH_ALGORITHM) -> str | None:
+    """Hash über Name, Aktion und Vorschaubild aller Favoriten einer favourites.xml.
+
+    Kindelemente wie ``<action>`` gehen normalisiert mit ein. Leerzeichen,
+    Attributreihenfolge, Entities und XML-Deklaration wirken sich nicht aus;
+    die Reihenfolge der Einträge schon. Liefert None, wenn die Datei kein
+    gültiges Favoriten-XML ist (dann gilt der Byte-Hash).
+    """
+    try:
+        root = ET.parse(file_path).getroot()
+    except (ET.ParseError, OSError):
+        return None
+    if root.tag != "favourites":
+        return None
+    entries = []
+    for favourite in root.iter("favourite"):
+        entry = [(favourite.get("name") or "").strip(),
+                 (favourite.text or "").strip(),
+                 (favourite.get("thumb") or "").strip()]
+        if len(favourite):
+            # Nur Einträge mit Kindelementen ändern ihre Form; bestehende Hashes bleiben gültig
+            entry.append(canonical_children(favourite))
+        entries.append(entry)
+    digest = hashlib.new(algorithm)
+    digest.update(json.dumps(entries, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class HashCache:
+    """Persistenter Hash-Cache, der über (Pfad, Größe, mtime_ns, Inode) gültig bleibt.
+
+    Solange sich die ``stat``-Werte einer Datei nicht ändern, wird der gespeicherte
+    Hash zurückgegeben, ohne die Datei erneut zu lesen.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict | None = None
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                if os.path.exists(self.path):
+                    with open(self.path, "r") as f:
+                        self._entries = json.load(f)
+            except Exception as e:
+                xbmc.log(f"Error loading hash cache: {str(e)}", xbmc.LOGERROR)
+        return self._entries
+
+    @staticmethod
+    def _signature(st: os.stat_result) -> list:
+        return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+    def get_or_compute(self, file_path: str, compute, variant: str = "") -> str:
+        """Liefert den gecachten Hash oder berechnet ihn über ``compute(file_path)``.
+
+        ``variant`` trennt Hashes verschiedener Verfahren für dieselbe Datei.
+        """
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return ""
+        signature = self._signature(st)
+        with self._lock:
+            entry = self._load().get(file_path)
+            if entry and entry.get("stat") == signature and variant in entry.get("hashes", {}):
+                self.hits += 1
+                return entry["hashes"][variant]
+            self.misses += 1
+        file_hash = compute(file_path)
+        if file_hash:
+            with self._lock:
+                entry = self._load().get(file_path)
+                if not entry or entry.get("stat") != signature:
+                    entry = {"stat": signature, "hashes": {}}
+                    self._entries[file_path] = entry
+                entry["hashes"][variant] = file_hash
+                self._dirty = True
+        return file_hash
+
+    def flush(self) -> bool:
+        with self._lock:
+            if not self._dirty:
+                return True
+            temp_path = f"{self.path}.tmp"
+            try:
+                # Einträge für gelöschte Dateien verwerfen
+                self._entries = {path: entry for path, entry in self._entries.items() if os.path.exists(path)}
+                with open(temp_path, "w") as f:
+                    json.dump(self._entries, f)
+                os.replace(temp_path, self.path)
+                self._dirty = False
+                return True
+            except Exception as e:
+                xbmc.log(f"Error saving hash cache: {str(e)}", xbmc.LOGERROR)
+                return False
+
+    def log_stats(self) -> None:
+        total = self.hits + self.misses
+        if total:
+            xbmc.log(f"Hash cache: {self.hits} hits, {self.misses} misses ({total} lookups)", xbmc.LOGINFO)
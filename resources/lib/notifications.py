@@ -0,0 +1,64 @@
+import threading
+import time
+from collections import OrderedDict
+import xbmc
+
+
+class NotificationDispatcher:
+    """Zeigt Kodi-Benachrichtigungen asynchron in einem eigenen Thread an.
+
+    ``notify`` kehrt sofort zurück. Gleiche Meldungen, die noch in der Warteschlange
+    stehen oder gerade angezeigt werden, werden zusammengefasst; zwischen zwei
+    Meldungen wartet der Dispatcher-Thread die Anzeigedauer der vorherigen ab
+    (mindestens ``min_interval``), damit sie sich nicht gegenseitig verdrängen.
+    """
+
+    def __init__(self, min_interval: float = 1.0, max_pending: int = 5):
+        self.min_interval = min_interval
+        self.max_pending = max_pending
+        self._pending = OrderedDict()  # (Titel, Text) -> (Dauer, Icon)
+        self._current = None
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def notify(self, heading: str, message: str, duration: int = 5000, icon: str = "") -> None:
+        key = (heading, message)
+        with self._condition:
+            if self._stopped or key == self._current or key in self._pending:
+                return
+            if len(self._pending) >= self.max_pending:
+                # Älteste Meldung verwerfen statt die Warteschlange wachsen zu lassen
+                self._pending.popitem(last=False)
+            self._pending[key] = (duration, icon)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="auto_ftp_sync.notifications", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                (heading, message), (duration, icon) = self._pending.popitem(last=False)
+                self._current = (heading, message)
+            try:
+                xbmc.executebuiltin(f'Notification({heading}, {message}, {duration}, {icon})')
+            except Exception as e:
+                xbmc.log(f"Error showing notification: {str(e)}", xbmc.LOGERROR)
+            # Anzeigedauer abwarten, ohne den Aufrufer zu blockieren
+            deadline = time.monotonic() + max(duration / 1000, self.min_interval)
+            with self._condition:
+                while not self._stopped and time.monotonic() < deadline:
+                    self._condition.wait(deadline - time.monotonic())
+                self._current = None
+
+    def stop(self) -> None:
+        """Beendet den Dispatcher-Thread; noch wartende Meldungen werden verworfen."""
+        with self._condition:
+            self._stopped = True
+            self._pending.clear()
+            self._condition.notify_all()
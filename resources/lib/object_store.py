@@ -0,0 +1,31 @@
+import json
+
+OBJECTS_DIR = "objects"
+# Zeigerdatei anstelle der eigentlichen Datei im custom_folder
+POINTER_SUFFIX = ".ref"
+POINTER_VERSION = 1
+
+
+def object_name(file_hash: str) -> str:
+    """Pfad eines Objekts relativ zum gemeinsamen ``auto_fav_sync``-Ordner."""
+    return f"{OBJECTS_DIR}/{file_hash}"
+
+
+def write_pointer(file_path: str, file_hash: str, hash_algo: str, size: int) -> None:
+    """Schreibt eine Zeigerdatei, die auf ``objects/<hash>`` verweist."""
+    data = {"version": POINTER_VERSION, "object": file_hash, "hash": file_hash,
+            "hash_algo": hash_algo, "size": size}
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+
+
+def read_pointer(file_path: str) -> dict | None:
+    """Liest eine Zeigerdatei; liefert den Eintrag (wie im Manifest) oder None."""
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or not data.get("object") or data.get("object") != data.get("hash"):
+        return None
+    return data
@@ -0,0 +1,95 @@
+import time
+import threading
+import posixpath
+
+DIR_CACHE_TTL = 300.0
+
+
+class RemoteDirCache:
+    """Zeitlich begrenzter Cache bekannter Remote-Ordner, gemeinsam für alle Backends.
+
+    Einträge sind über einen Server-Schlüssel (z. B. ``('sftp', host, port)``) getrennt.
+    Ein bekannter Ordner impliziert, dass auch alle übergeordneten Ordner existieren.
+    """
+
+    def __init__(self, ttl: float = DIR_CACHE_TTL):
+        self.ttl = ttl
+        self._known = {}  # (server, path) -> Zeitpunkt der letzten Bestätigung
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        path = path.replace("\\", "/")
+        return posixpath.normpath(path) if path else path
+
+    @staticmethod
+    def _parent(path: str) -> str:
+        return posixpath.dirname(path)
+
+    def is_known(self, server: tuple, path: str) -> bool:
+        path = self._normalize(path)
+        with self._lock:
+            confirmed = self._known.get((server, path))
+            if confirmed is None:
+                return False
+            if time.monotonic() - confirmed > self.ttl:
+                del self._known[(server, path)]
+                return False
+            return True
+
+    def add(self, server: tuple, path: str) -> None:
+        """Merkt sich einen existierenden Ordner samt aller übergeordneten Ordner."""
+        path = self._normalize(path)
+        now = time.monotonic()
+        with self._lock:
+            while path and path not in ("/", "."):
+                self._known[(server, path)] = now
+                parent = self._parent(path)
+                if parent == path:
+                    break
+                path = parent
+
+    def invalidate(self, server: tuple, path: str) -> None:
+        """Verwirft einen Ordner und alle darunterliegenden Einträge (z. B. nach einem Schreibfehler)."""
+        path = self._normalize(path)
+        prefix = path.rstrip("/") + "/"
+        with self._lock:
+            for key in [key for key in self._known
+                        if key[0] == server and (key[1] == path or key[1].startswith(prefix))]:
+                del self._known[key]
+
+    def ensure(self, server: tuple, path: str, exists, mkdir=None, makedirs=None) -> None:
+        """Stellt sicher, dass ``path`` existiert, mit möglichst wenigen Roundtrips.
+
+        Bietet das Backend ``makedirs`` (ganzer Pfad in einem Durchgang), wird es direkt
+        verwendet. Sonst wird vom Zielordner aufwärts bis zum ersten existierenden oder
+        bekannten Ordner geprüft und nur der fehlende Rest mit ``mkdir`` angelegt.
+        """
+        path = self._normalize(path)
+        if not path or path in ("/", ".") or self.is_known(server, path):
+            return
+        if makedirs is not None:
+            makedirs(path)
+            self.add(server, path)
+            return
+        missing = []
+        current = path
+        while current and current not in ("/", ".") and not self.is_known(server, current):
+            if exists(current):
+                break
+            missing.append(current)
+            parent = self._parent(current)
+            if parent == current:
+                break
+            current = parent
+        for directory in reversed(missing):
+            mkdir(directory)
+        self.add(server, path)
+
+
+_dir_cache = RemoteDirCache()
+
+
+def get_dir_cache() -> RemoteDirCache:
+    """Liefert den prozessweiten Ordner-Cache."""
+    return _dir_cache
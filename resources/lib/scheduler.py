@@ -0,0 +1,31 @@
+class AdaptiveScheduler:
+    """Bestimmt den Abstand bis zum nächsten Sync-Lauf.
+
+    Nach einem Lauf mit Änderungen wird wieder das kürzeste Intervall verwendet;
+    bleibt ein Lauf ohne Änderungen, verdoppelt sich das Intervall (``backoff``)
+    bis höchstens ``max_interval``.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float, backoff: float = 2.0):
+        self.min_interval = max(1.0, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.backoff = backoff
+        self.interval = self.min_interval
+
+    def configure(self, min_interval: float, max_interval: float) -> None:
+        """Übernimmt geänderte Grenzen und beginnt wieder mit dem kürzesten Intervall."""
+        self.min_interval = max(1.0, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.reset()
+
+    def reset(self) -> None:
+        self.interval = self.min_interval
+
+    def record_result(self, changed: bool) -> None:
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+
+    def next_delay(self) -> float:
+        return self.interval
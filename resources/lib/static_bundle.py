@@ -0,0 +1,43 @@
+import json
+import zipfile
+
+from resources.lib.transfer import DEFAULT_BUFFER_SIZE, copy_stream
+
+BUNDLE_FILE = "static_bundle.zip"
+INDEX_MEMBER = "index.json"
+BUNDLE_VERSION = 1
+
+
+def member_name(folder: str) -> str:
+    """Name der favourites.xml eines statischen Ordners im Archiv."""
+    return f"{folder}/favourites.xml"
+
+
+def write_bundle(target_path: str, members: dict, level: int = 6) -> None:
+    """Packt ``members`` ({Ordner: (lokaler Pfad, Indexeintrag)}) in ein ZIP-Archiv.
+
+    Als erster Eintrag steht ``index.json`` mit Hash und Größe je Ordner, damit
+    Leser nur abweichende Ordner entpacken müssen.
+    """
+    index = {folder: entry for folder, (_, entry) in members.items()}
+    with zipfile.ZipFile(target_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=level) as bundle:
+        bundle.writestr(INDEX_MEMBER, json.dumps({"version": BUNDLE_VERSION, "members": index},
+                                                 separators=(",", ":")))
+        for folder, (local_path, _) in members.items():
+            bundle.write(local_path, member_name(folder))
+
+
+def read_index(bundle: zipfile.ZipFile) -> dict:
+    """Liest den Index eines Archivs ({Ordner: Indexeintrag})."""
+    try:
+        data = json.loads(bundle.read(INDEX_MEMBER))
+    except (KeyError, ValueError) as e:
+        raise zipfile.BadZipFile(f"Invalid bundle index: {str(e)}")
+    return data.get("members", {})
+
+
+def extract_member(bundle: zipfile.ZipFile, folder: str, target_path: str,
+                   buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
+    """Entpackt die favourites.xml eines Ordners blockweise nach ``target_path``."""
+    with bundle.open(member_name(folder)) as source, open(target_path, "wb") as target:
+        return copy_stream(source, target, buffer_size)
@@ -0,0 +1,196 @@
+import os
+import json
+import sqlite3
+import threading
+import xbmc
+
+STATE_BACKEND_JSON = 0
+STATE_BACKEND_SQLITE = 1
+
+
+class JsonSyncStateStore:
+    """Synchronisationsstatus als JSON-Datei, einmal geladen und im Speicher gehalten.
+
+    Änderungen markieren den Store als "dirty"; ``flush`` schreibt den gesamten Status
+    über eine temporäre Datei und ``os.replace``, sodass ein Absturz beim Schreiben
+    die bestehende Datei nicht beschädigt.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._state: dict | None = None
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    def _load(self) -> dict:
+        if self._state is None:
+            self._state = {}
+            try:
+                if os.path.exists(self.path):
+                    with open(self.path, "r") as f:
+                        self._state = json.load(f)
+            except Exception as e:
+                xbmc.log(f"Error loading sync state: {str(e)}", xbmc.LOGERROR)
+        return self._state
+
+    def get(self, key: str) -> dict:
+        with self._lock:
+            return dict(self._load().get(key, {}))
+
+    def set(self, key: str, entry: dict) -> None:
+        with self._lock:
+            self._load()[key] = dict(entry)
+            self._dirty = True
+
+    def all(self) -> dict:
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._load().items()}
+
+    def replace_all(self, state: dict) -> None:
+        with self._lock:
+            self._state = {key: dict(entry) for key, entry in state.items()}
+            self._dirty = True
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def flush(self) -> bool:
+        """Schreibt den Status atomar, falls sich seit dem letzten Flush etwas geändert hat."""
+        with self._lock:
+            if not self._dirty:
+                return True
+            temp_path = f"{self.path}.tmp"
+            try:
+                with open(temp_path, "w") as f:
+                    json.dump(self._state, f, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+                self._dirty = False
+                return True
+            except Exception as e:
+                xbmc.log(f"Error saving sync state: {str(e)}", xbmc.LOGERROR)
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+                return False
+
+    def close(self) -> None:
+        self.flush()
+
+
+class SQLiteSyncStateStore:
+    """Synchronisationsstatus in einer SQLite-Datenbank (WAL-Modus).
+
+    Jeder Pfad ist eine eigene Zeile mit Index auf dem Hash, sodass Änderungen nur
+    die betroffenen Zeilen schreiben. ``flush`` schließt die laufende Transaktion ab.
+    Ein vorhandenes ``sync_state.json`` wird beim ersten Öffnen einmalig übernommen.
+    """
+
+    def __init__(self, path: str, legacy_json_path: str | None = None):
+        self.path = path
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sync_state ("
+            " path TEXT PRIMARY KEY,"
+            " hash TEXT,"
+            " timestamp REAL,"
+            " data TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_sync_state_hash ON sync_state(hash)")
+        self._conn.commit()
+        if legacy_json_path:
+            self._migrate_json(legacy_json_path)
+
+    @staticmethod
+    def _row(key: str, entry: dict) -> tuple:
+        entry_hash = entry.get("local_hash") or entry.get("remote_hash")
+        return (key, entry_hash, entry.get("timestamp"), json.dumps(entry))
+
+    def _migrate_json(self, json_path: str) -> None:
+        if not os.path.exists(json_path):
+            return
+        try:
+            with open(json_path, "r") as f:
+                state = json.load(f)
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO sync_state (path, hash, timestamp, data) VALUES (?, ?, ?, ?)",
+                    [self._row(key, entry) for key, entry in state.items()]
+                )
+                self._conn.commit()
+            os.replace(json_path, f"{json_path}.migrated")
+            xbmc.log(f"Migrated {len(state)} sync state entries to SQLite", xbmc.LOGINFO)
+        except Exception as e:
+            xbmc.log(f"Error migrating sync state to SQLite: {str(e)}", xbmc.LOGERROR)
+
+    def get(self, key: str) -> dict:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM sync_state WHERE path = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def set(self, key: str, entry: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (path, hash, timestamp, data) VALUES (?, ?, ?, ?)",
+                self._row(key, entry)
+            )
+            self._dirty = True
+
+    def find_by_hash(self, entry_hash: str) -> list:
+        """Liefert alle Pfade, deren zuletzt synchronisierter Inhalt diesen Hash hat."""
+        with self._lock:
+            rows = self._conn.execute("SELECT path FROM sync_state WHERE hash = ?", (entry_hash,)).fetchall()
+        return [row[0] for row in rows]
+
+    def all(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT path, data FROM sync_state").fetchall()
+        return {path: json.loads(data) for path, data in rows}
+
+    def replace_all(self, state: dict) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM sync_state")
+            self._conn.executemany(
+                "INSERT INTO sync_state (path, hash, timestamp, data) VALUES (?, ?, ?, ?)",
+                [self._row(key, entry) for key, entry in state.items()]
+            )
+            self._dirty = True
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def flush(self) -> bool:
+        with self._lock:
+            if not self._dirty:
+                return True
+            try:
+                self._conn.commit()
+                self._dirty = False
+                return True
+            except Exception as e:
+                xbmc.log(f"Error saving sync state: {str(e)}", xbmc.LOGERROR)
+                return False
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+
+def open_sync_state_store(directory: str, backend: int = STATE_BACKEND_JSON):
+    """Öffnet den konfigurierten Status-Store im Addon-Datenordner."""
+    json_path = os.path.join(directory, "sync_state.json")
+    if backend == STATE_BACKEND_SQLITE:
+        try:
+            return SQLiteSyncStateStore(os.path.join(directory, "sync_state.db"), legacy_json_path=json_path)
+        except sqlite3.Error as e:
+            xbmc.log(f"SQLite sync state unavailable, falling back to JSON: {str(e)}", xbmc.LOGWARNING)
+    return JsonSyncStateStore(json_path)
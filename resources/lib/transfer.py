@@ -0,0 +1,182 @@
+import os
+import re
+import gzip
+import time
+import threading
+import xbmc
+
+from resources.lib.hashing import hash_file, DEFAULT_HASH_ALGORITHM, LEGACY_HASH_ALGORITHM
+
+DEFAULT_BUFFER_SIZE = 256 * 1024
+PART_SUFFIX = ".part"
+# Komprimierte Nebendatei neben der unveränderten Datei auf dem Server
+GZIP_SUFFIX = ".gz"
+
+_buffers = threading.local()
+
+
+class TransferResult:
+    """Ergebnis einer Übertragung; wahr bei Erfolg wie bisher das bool der Backends.
+
+    ``unchanged`` bedeutet, dass die heruntergeladene Datei inhaltsgleich mit der
+    lokalen war und diese nicht angefasst wurde.
+    """
+
+    def __init__(self, ok: bool, unchanged: bool = False, size: int = 0):
+        self.ok = ok
+        self.unchanged = unchanged
+        self.size = size
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def __repr__(self) -> str:
+        return f"TransferResult(ok={self.ok}, unchanged={self.unchanged}, size={self.size})"
+
+
+def _transfer_buffer(size: int) -> memoryview:
+    """Liefert einen pro Thread wiederverwendeten Übertragungspuffer."""
+    buffer = getattr(_buffers, "buffer", None)
+    if buffer is None or len(buffer) != size:
+        buffer = memoryview(bytearray(size))
+        _buffers.buffer = buffer
+    return buffer
+
+
+def copy_stream(source, target, buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
+    """Kopiert ``source`` blockweise nach ``target`` und liefert die Anzahl Bytes.
+
+    Quellen mit ``readinto`` lesen direkt in einen wiederverwendeten Puffer,
+    sodass pro Datei höchstens ``buffer_size`` Bytes im Speicher liegen.
+    """
+    total = 0
+    readinto = getattr(source, "readinto", None)
+    buffer = _transfer_buffer(buffer_size) if readinto is not None else None
+    while True:
+        if readinto is not None:
+            read = readinto(buffer)
+            chunk = buffer[:read] if read else None
+        else:
+            chunk = source.read(buffer_size)
+            read = len(chunk)
+        if not read:
+            break
+        target.write(chunk)
+        total += read
+    return total
+
+
+def compress_file(source_path: str, target_path: str, level: int = 6,
+                  buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
+    """Schreibt ``source_path`` gzip-komprimiert nach ``target_path`` und liefert dessen Größe.
+
+    Der Header enthält weder Zeitstempel noch Dateinamen, sodass gleicher Inhalt
+    immer dieselben Bytes ergibt.
+    """
+    with open(source_path, "rb") as source, open(target_path, "wb") as raw:
+        with gzip.GzipFile(filename="", mode="wb", compresslevel=level, fileobj=raw, mtime=0) as target:
+            copy_stream(source, target, buffer_size)
+    return os.path.getsize(target_path)
+
+
+def decompress_file(source_path: str, target_path: str, buffer_size: int = DEFAULT_BUFFER_SIZE) -> int:
+    """Entpackt eine gzip-Datei blockweise und liefert die Anzahl entpackter Bytes."""
+    with gzip.open(source_path, "rb") as source, open(target_path, "wb") as target:
+        return copy_stream(source, target, buffer_size)
+
+
+def log_throughput(protocol: str, direction: str, path: str, size: int, started: float) -> None:
+    """Protokolliert Dauer und Durchsatz einer Übertragung (``started`` aus ``time.monotonic()``)."""
+    elapsed = max(time.monotonic() - started, 1e-6)
+    xbmc.log(f"{protocol} {direction} {path}: {size} bytes in {elapsed:.2f} s "
+             f"({size / elapsed / 1024:.1f} KiB/s)", xbmc.LOGINFO)
+
+
+def partial_path(path: str, expected: dict | None = None) -> tuple:
+    """Liefert (Name der Teildatei, fortsetzbar).
+
+    Nur wenn der Hash des Zielinhalts bekannt ist, steckt er im Namen der
+    Teildatei; dann gehört eine vorhandene Teildatei sicher zum selben Inhalt
+    und darf fortgesetzt werden. Sonst wird unter ``<path>.part`` neu begonnen.
+    """
+    if expected and expected.get("hash"):
+        return f"{path}.{expected['hash'][:16]}{PART_SUFFIX}", True
+    return path + PART_SUFFIX, False
+
+
+def stale_partials(path: str, names, current_part: str) -> list:
+    """Namen fortsetzbarer Teildateien von ``path`` (``<name>.<hash16>.part``), die nicht ``current_part`` sind.
+
+    Sie stammen von abgebrochenen Übertragungen eines früheren Inhalts und
+    werden nie mehr fortgesetzt.
+    """
+    pattern = re.compile(re.escape(os.path.basename(path)) + r"\.[0-9a-f]{16}" + re.escape(PART_SUFFIX) + "$")
+    current = os.path.basename(current_part)
+    return [os.path.basename(name) for name in names
+            if pattern.match(os.path.basename(name)) and os.path.basename(name) != current]
+
+
+def discard_stale_partials(path: str, current_part: str) -> None:
+    """Löscht lokale Teildateien früherer Inhalte neben ``path`` (siehe ``stale_partials``)."""
+    directory = os.path.dirname(path) or "."
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return
+    for name in stale_partials(path, names, current_part):
+        discard_partial(os.path.join(directory, name))
+        xbmc.log(f"Removed stale partial download {name}", xbmc.LOGDEBUG)
+
+
+def resume_offset(part_size: int | None, total_size: int | None) -> int:
+    """Anzahl bereits übertragener Bytes, an die angeknüpft werden kann (sonst 0)."""
+    if not part_size or total_size is None or part_size >= total_size:
+        return 0
+    return part_size
+
+
+def verify_partial(path: str, size: int | None, expected: dict | None = None) -> bool:
+    """Prüft eine lokale Teildatei vor dem Umbenennen auf Größe und, falls bekannt, Hash."""
+    if size is not None and os.path.getsize(path) != size:
+        xbmc.log(f"Size mismatch for {path}: {os.path.getsize(path)} != {size}", xbmc.LOGWARNING)
+        return False
+    if expected and expected.get("hash"):
+        algorithm = expected.get("hash_algo") or LEGACY_HASH_ALGORITHM
+        if hash_file(path, algorithm) != expected["hash"]:
+            xbmc.log(f"Hash mismatch for {path}", xbmc.LOGWARNING)
+            return False
+    return True
+
+
+class BytesWriter:
+    """Für Ziele, deren ``write`` keine memoryview annimmt (z. B. paramiko ``SFTPFile``)."""
+
+    def __init__(self, target):
+        self._target = target
+
+    def write(self, chunk) -> None:
+        self._target.write(bytes(chunk))
+
+
+def replace_if_changed(part_path: str, local_path: str) -> TransferResult:
+    """Ersetzt ``local_path`` atomar durch die fertige Teildatei, aber nur bei anderem Inhalt.
+
+    Ist der Inhalt gleich, wird die Teildatei verworfen; die lokale Datei behält
+    ihre mtime und nachgelagerte Schritte (UI-Aktualisierung, Watcher) entfallen.
+    """
+    size = os.path.getsize(part_path)
+    if (os.path.exists(local_path) and os.path.getsize(local_path) == size
+            and hash_file(part_path, DEFAULT_HASH_ALGORITHM) == hash_file(local_path, DEFAULT_HASH_ALGORITHM)):
+        os.remove(part_path)
+        xbmc.log(f"Downloaded content of {local_path} is unchanged, keeping local file", xbmc.LOGDEBUG)
+        return TransferResult(True, unchanged=True, size=size)
+    os.replace(part_path, local_path)
+    return TransferResult(True, size=size)
+
+
+def discard_partial(path: str) -> None:
+    """Entfernt eine nicht fortsetzbare Teildatei nach einem Fehler."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -1,17 +1,44 @@
 import os
+import time
 import xbmc
 import xbmcvfs
 from contextlib import contextmanager
 
+from resources.lib.remote_dir_cache import get_dir_cache
+from resources.lib.transfer import (DEFAULT_BUFFER_SIZE, PART_SUFFIX, copy_stream, discard_partial,
+                                    log_throughput, replace_if_changed, verify_partial)
+
+
+class _VFSReader:
+    """Stellt ``read(size)`` mit Bytes für ``copy_stream`` bereit (``xbmcvfs.File.read`` liefert str)."""
+
+    def __init__(self, vfs_file):
+        self._file = vfs_file
+
+    def read(self, size: int) -> bytes:
+        return self._file.readBytes(size)
+
+
+class _VFSWriter:
+    def __init__(self, vfs_file):
+        self._file = vfs_file
+
+    def write(self, chunk) -> None:
+        if not self._file.write(bytearray(chunk)):
+            raise OSError("xbmcvfs write failed")
+
 
 class VFSManager:
     """Connection-like Manager, der Kodi VFS-URLs (ftp/sftp/smb) über xbmcvfs nutzt.
 
     Diese Klasse spiegelt das Interface der bestehenden ConnectionManager-Unterklassen,
     nutzt intern jedoch ausschließlich Kodi-VFS (kein paramiko/smbclient nötig).
+    Mit ``streaming`` wird statt ``xbmcvfs.copy`` blockweise über ``xbmcvfs.File``
+    in Blöcken von ``chunk_size`` Bytes kopiert.
     """
 
-    def __init__(self, protocol: str, host: str, user: str, password: str, base_path: str = "", port: int | None = None, share: str | None = None):
+    def __init__(self, protocol: str, host: str, user: str, password: str, base_path: str = "", port: int | None = None, share: str | None = None,
+                 streaming: bool = False, chunk_size: int = DEFAULT_BUFFER_SIZE):
         self.protocol = protocol.lower().strip()  # "ftp", "sftp", "smb"
         self.host = host or ""
         self.user = user or ""
@@ -19,6 +46,9 @@ class VFSManager:
         self.base_path = base_path.strip("/") if base_path else ""
         self.port = port
         self.share = share.strip("/\\") if share else None
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        self._dir_cache_key = ("vfs", self.protocol, self.host, self.port, self.share)
 
     @contextmanager
     def get_connection(self):
@@ -29,49 +59,131 @@ class VFSManager:
         return None
 
     # Public API – kompatibel zu ConnectionManager
-    def upload_file(self, local_path: str, remote_path: str) -> bool:
+    def upload_file(self, local_path: str, remote_path: str, expected: dict | None = None) -> bool:
         try:
             src = xbmcvfs.translatePath(local_path) if local_path.startswith("special://") else local_path
             dst = self._build_remote_url(remote_path)
-            self._ensure_remote_dirs(dst)
-            ok = xbmcvfs.copy(src, dst)
+            self._ensure_remote_dirs(remote_path)
+            started = time.monotonic()
+            ok = self._stream_upload(src, dst) if self.streaming else xbmcvfs.copy(src, dst)
             if ok:
                 xbmc.log(f"VFS upload OK: {src} -> {dst}", xbmc.LOGINFO)
+                log_throughput(self._label(), "upload", remote_path, os.path.getsize(src), started)
             else:
                 xbmc.log(f"VFS upload FAILED: {src} -> {dst}", xbmc.LOGERROR)
+                get_dir_cache().invalidate(self._dir_cache_key, self._remote_dir(remote_path))
             return bool(ok)
         except Exception as e:
             xbmc.log(f"VFS upload error: {str(e)}", xbmc.LOGERROR)
             return False
 
-    def download_file(self, remote_path: str, local_path: str) -> bool:
+    def download_file(self, remote_path: str, local_path: str, expected: dict | None = None) -> bool:
+        dst = xbmcvfs.translatePath(local_path) if local_path.startswith("special://") else local_path
+        # In eine Nachbardatei laden; die lokale Datei wird nur bei anderem Inhalt ersetzt
+        part = dst + PART_SUFFIX
         try:
             src = self._build_remote_url(remote_path)
-            dst = xbmcvfs.translatePath(local_path) if local_path.startswith("special://") else local_path
             # Lokalen Ordner sicherstellen
             local_dir = os.path.dirname(dst)
             if local_dir and not xbmcvfs.exists(local_dir):
                 xbmcvfs.mkdirs(local_dir)
-            ok = xbmcvfs.copy(src, dst)
+            started = time.monotonic()
+            ok = self._stream_download(src, part) if self.streaming else xbmcvfs.copy(src, part)
+            if ok and expected and not verify_partial(part, expected.get("size"), expected):
+                # Unvollständige oder veraltete Remote-Datei nicht installieren
+                ok = False
             if ok:
+                result = replace_if_changed(part, dst)
                 xbmc.log(f"VFS download OK: {src} -> {dst}", xbmc.LOGINFO)
-            else:
-                xbmc.log(f"VFS download FAILED: {src} -> {dst}", xbmc.LOGERROR)
-            return bool(ok)
+                log_throughput(self._label(), "download", remote_path, result.size, started)
+                return result
+            xbmc.log(f"VFS download FAILED: {src} -> {dst}", xbmc.LOGERROR)
+            discard_partial(part)
+            return False
         except Exception as e:
             xbmc.log(f"VFS download error: {str(e)}", xbmc.LOGERROR)
+            discard_partial(part)
             return False
 
     def folder_exists(self, folder_path: str) -> bool:
         try:
             url = self._build_remote_url(folder_path, as_dir=True)
             exists = xbmcvfs.exists(url)
+            if exists:
+                get_dir_cache().add(self._dir_cache_key, "/" + folder_path.replace("\\", "/").strip("/"))
             return bool(exists)
         except Exception as e:
             xbmc.log(f"VFS folder_exists error: {str(e)}", xbmc.LOGERROR)
             return False
 
+    def stat(self, remote_path: str) -> dict | None:
+        """Liefert Größe/Änderungszeit der Remote-Datei über xbmcvfs.Stat oder None."""
+        try:
+            url = self._build_remote_url(remote_path)
+            st = xbmcvfs.Stat(url)
+            size = st.st_size()
+            mtime = st.st_mtime()
+            # xbmcvfs.Stat liefert für fehlende Dateien nur Nullwerte
+            if not size and not mtime:
+                return None
+            return {"size": size, "mtime": mtime, "etag": None}
+        except Exception as e:
+            xbmc.log(f"VFS stat error: {str(e)}", xbmc.LOGERROR)
+            return None
+
+    def file_missing(self, remote_path: str) -> bool:
+        """True nur, wenn der Ordner erreichbar ist, die Datei darin aber fehlt."""
+        try:
+            if xbmcvfs.exists(self._build_remote_url(remote_path)):
+                return False
+            # xbmcvfs.exists liefert auch bei Verbindungsfehlern False
+            folder = remote_path.replace("\\", "/").rsplit("/", 1)[0]
+            return bool(xbmcvfs.exists(self._build_remote_url(folder, as_dir=True)))
+        except Exception as e:
+            xbmc.log(f"VFS stat error: {str(e)}", xbmc.LOGERROR)
+            return False
+
+    def rename_file(self, source_path: str, target_path: str) -> bool:
+        try:
+            src = self._build_remote_url(source_path)
+            dst = self._build_remote_url(target_path)
+            if xbmcvfs.rename(src, dst):
+                return True
+            # Manche VFS-Implementierungen überschreiben beim Umbenennen nicht
+            if xbmcvfs.exists(dst) and xbmcvfs.delete(dst):
+                return bool(xbmcvfs.rename(src, dst))
+            return False
+        except Exception as e:
+            xbmc.log(f"VFS rename error: {str(e)}", xbmc.LOGERROR)
+            return False
+
+    def delete_file(self, remote_path: str) -> bool:
+        try:
+            return bool(xbmcvfs.delete(self._build_remote_url(remote_path)))
+        except Exception as e:
+            xbmc.log(f"VFS delete error: {str(e)}", xbmc.LOGERROR)
+            return False
+
     # Internals
+    def _label(self) -> str:
+        return f"VFS/{self.protocol.upper()}" + (" stream" if self.streaming else "")
+
+    def _stream_upload(self, src: str, dst: str) -> bool:
+        """Lokale Datei blockweise über ``xbmcvfs.File`` auf den Server schreiben."""
+        with open(src, "rb") as local_file:
+            with xbmcvfs.File(dst, "w") as remote_file:
+                copy_stream(local_file, _VFSWriter(remote_file), self.chunk_size)
+        return True
+
+    def _stream_download(self, src: str, dst: str) -> bool:
+        """Remote-Datei blockweise über ``xbmcvfs.File`` lesen und lokal schreiben."""
+        if not xbmcvfs.exists(src):
+            return False
+        with xbmcvfs.File(src) as remote_file:
+            with open(dst, "wb") as local_file:
+                copy_stream(_VFSReader(remote_file), local_file, self.chunk_size)
+        return True
+
     def _build_remote_url(self, remote_path: str, as_dir: bool = False) -> str:
         remote_path = remote_path.replace("\\", "/")
         remote_path = remote_path.lstrip("/")
@@ -96,14 +208,19 @@ class VFSManager:
             full = full + "/"
         return full
 
-    def _ensure_remote_dirs(self, remote_url: str) -> None:
+    @staticmethod
+    def _remote_dir(remote_path: str) -> str:
+        return "/" + remote_path.replace("\\", "/").strip("/").rpartition("/")[0]
+
+    def _ensure_remote_dirs(self, remote_path: str) -> None:
         try:
-            # xbmcvfs.mkdirs akzeptiert Pfade/URLs; wir entfernen den Dateinamen
-            url_dir = remote_url
-            if "/" in remote_url:
-                url_dir = remote_url.rsplit("/", 1)[0] + "/"
-            if not xbmcvfs.exists(url_dir):
-                xbmcvfs.mkdirs(url_dir)
+            # xbmcvfs.mkdirs legt den gesamten Pfad in einem Durchgang an;
+            # bekannte Ordner überspringen den exists-Roundtrip
+            def makedirs(path: str) -> None:
+                url_dir = self._build_remote_url(path, as_dir=True)
+                if not xbmcvfs.exists(url_dir):
+                    xbmcvfs.mkdirs(url_dir)
+            get_dir_cache().ensure(self._dir_cache_key, self._remote_dir(remote_path), exists=None, makedirs=makedirs)
         except Exception as e:
             xbmc.log(f"VFS ensure dirs error: {str(e)}", xbmc.LOGERROR)
 
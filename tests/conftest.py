@@ -0,0 +1,137 @@
+"""Test-Umgebung ohne Kodi: minimale Ersatzmodule für xbmc, xbmcaddon und xbmcvfs.
+
+Die Module werden nur eingetragen, wenn kein echtes Kodi-Modul importierbar ist.
+``special://``-Pfade zeigen auf ein temporäres Verzeichnis.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import types
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+KODI_HOME = tempfile.mkdtemp(prefix="kodi-home-")
+
+
+def _install_kodi_modules():
+    xbmc = types.ModuleType("xbmc")
+    xbmc.LOGDEBUG, xbmc.LOGINFO, xbmc.LOGWARNING, xbmc.LOGERROR = 0, 1, 2, 3
+    xbmc.log = lambda message, level=0: None
+    xbmc.getInfoLabel = lambda label: "testbox"
+    xbmc.getCondVisibility = lambda condition: False
+    xbmc.executebuiltin = lambda command, wait=False: None
+    xbmc.sleep = lambda milliseconds: None
+
+    class Monitor:
+        def abortRequested(self):
+            return False
+
+        def waitForAbort(self, timeout=0):
+            return False
+
+    class Player:
+        def isPlaying(self):
+            return False
+
+    xbmc.Monitor, xbmc.Player = Monitor, Player
+
+    xbmcaddon = types.ModuleType("xbmcaddon")
+
+    class Addon:
+        def __init__(self, addon_id=None):
+            pass
+
+        def getSettingBool(self, key):
+            return False
+
+        def getSettingString(self, key):
+            return ""
+
+        def getSettingInt(self, key):
+            return 0
+
+        def getSetting(self, key):
+            return ""
+
+        def getLocalizedString(self, string_id):
+            return str(string_id)
+
+        def getAddonInfo(self, key):
+            return ROOT
+
+    xbmcaddon.Addon = Addon
+
+    xbmcvfs = types.ModuleType("xbmcvfs")
+    xbmcvfs.translatePath = lambda path: path.replace("special://", KODI_HOME + "/")
+    xbmcvfs.exists = os.path.exists
+    xbmcvfs.mkdirs = lambda path: os.makedirs(path, exist_ok=True) or True
+
+    sys.modules.update({"xbmc": xbmc, "xbmcaddon": xbmcaddon, "xbmcvfs": xbmcvfs})
+
+
+try:
+    import xbmc  # noqa: F401
+except ImportError:
+    _install_kodi_modules()
+
+
+class LocalConnectionManager:
+    """Verbindungsmanager, dessen "Server" ein lokales Verzeichnis ist."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.buffer_size = 64 * 1024
+
+    def _path(self, remote_path: str) -> str:
+        return os.path.join(self.root, remote_path.lstrip("/"))
+
+    def upload_file(self, local_path, remote_path, expected=None):
+        target = self._path(remote_path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(local_path, target)
+        return True
+
+    def download_file(self, remote_path, local_path, expected=None):
+        from resources.lib.transfer import replace_if_changed
+        source = self._path(remote_path)
+        if not os.path.exists(source):
+            return False
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        shutil.copyfile(source, local_path + ".part")
+        return replace_if_changed(local_path + ".part", local_path)
+
+    def stat(self, remote_path):
+        source = self._path(remote_path)
+        if not os.path.exists(source):
+            return None
+        return {"size": os.path.getsize(source), "mtime": os.path.getmtime(source), "etag": None}
+
+    def file_missing(self, remote_path):
+        return not os.path.exists(self._path(remote_path))
+
+    def folder_exists(self, folder_path):
+        return os.path.isdir(self._path(folder_path))
+
+    def rename_file(self, source_path, target_path):
+        os.replace(self._path(source_path), self._path(target_path))
+        return True
+
+    def delete_file(self, remote_path):
+        try:
+            os.remove(self._path(remote_path))
+            return True
+        except OSError:
+            return False
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path):
+    return LocalConnectionManager(str(tmp_path / "server"))
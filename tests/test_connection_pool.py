@@ -0,0 +1,44 @@
+import time
+
+import auto_ftp_sync as sync
+from resources.lib.connection_pool import ConnectionPool
+
+
+class Connection:
+    def __init__(self):
+        self.closed = False
+
+
+def _close(connection):
+    connection.closed = True
+
+
+def test_idle_timeout_outlasts_the_sync_interval():
+    settings = sync.config.load()
+    assert sync.connection_options(settings)['idle_timeout'] > settings.sync_interval_max * 60
+
+
+def test_release_evicts_expired_connections():
+    pool = ConnectionPool("test", closer=_close, idle_timeout=60)
+    old = Connection()
+    pool.release(old)
+    pool._idle[0] = (old, time.monotonic() - 120)
+
+    pool.release(Connection())
+
+    assert old.closed
+    assert len(pool._idle) == 1
+    pool.close_all()
+
+
+def test_idle_connections_are_closed_without_further_use():
+    pool = ConnectionPool("test", closer=_close, idle_timeout=0)
+    connection = Connection()
+    pool.release(connection)
+
+    deadline = time.monotonic() + 5
+    while not connection.closed and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert connection.closed
+    assert not pool._idle
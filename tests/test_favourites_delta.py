@@ -0,0 +1,46 @@
+from resources.lib.favourites_delta import apply_patch, diff_favourites, read_patch, write_patch
+from resources.lib.favourites_merge import entry_value, parse_favourites, write_favourites
+from resources.lib.hashing import canonical_favourites_hash
+
+OLD = ('<favourites>'
+       '<favourite name="Anime">ActivateWindow(10025,"plugin://anime")</favourite>'
+       '<favourite name="Marvel" thumb="marvel.jpg"><action>PlayMedia("plugin://marvel")</action></favourite>'
+       '</favourites>')
+NEW = ('<favourites>'
+       '<favourite name="Marvel" thumb="marvel.jpg"><action>PlayMedia("plugin://marvel/new")</action></favourite>'
+       '<favourite name="Anime">ActivateWindow(10025,"plugin://anime")</favourite>'
+       '<favourite name="DC" thumb="dc.jpg"><action>PlayMedia("plugin://dc")</action></favourite>'
+       '</favourites>')
+
+
+def _parse(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    return parse_favourites(str(path))
+
+
+def test_patch_round_trip_keeps_action_children(tmp_path):
+    old = _parse(tmp_path, "old.xml", OLD)
+    new = _parse(tmp_path, "new.xml", NEW)
+    patch = tmp_path / "1.json"
+
+    write_patch(str(patch), 1, diff_favourites(old, new))
+    patched = apply_patch(old, read_patch(str(patch), 1))
+
+    assert [(key, entry_value(element)) for key, element in patched] \
+        == [(key, entry_value(element)) for key, element in new]
+    assert [element.findtext("action") for _, element in patched] \
+        == ['PlayMedia("plugin://marvel/new")', None, 'PlayMedia("plugin://dc")']
+
+    result = tmp_path / "patched.xml"
+    write_favourites(str(result), patched)
+    assert canonical_favourites_hash(str(result)) == canonical_favourites_hash(str(tmp_path / "new.xml"))
+
+
+def test_changed_action_is_part_of_the_diff(tmp_path):
+    old = _parse(tmp_path, "old.xml", OLD)
+    new = _parse(tmp_path, "new.xml", OLD.replace("plugin://marvel", "plugin://marvel/new"))
+
+    ops = diff_favourites(old, new)
+
+    assert [(op["op"], op["key"]) for op in ops] == [("add", ["Marvel", 0])]
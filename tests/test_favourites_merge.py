@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+import auto_ftp_sync as sync
+from resources.lib.favourites_merge import parse_favourites, write_favourites
+
+FAVOURITES = ('<favourites>'
+              '<favourite name="Anime">ActivateWindow(10025,"plugin://anime")</favourite>'
+              '<favourite name="Marvel" thumb="marvel.jpg"><action>PlayMedia("plugin://marvel")</action></favourite>'
+              '</favourites>')
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    settings = sync.config.load()
+    monkeypatch.setattr(settings, "merge_favourites", True)
+    monkeypatch.setattr(settings, "delta_uploads", False)
+    monkeypatch.setattr(settings, "overwrite_static", False)
+    monkeypatch.setattr(settings, "ftp_base_path", "base")
+    monkeypatch.setattr(settings, "custom_folder", "living_room")
+    monkeypatch.setattr(settings, "super_favourites_path", str(tmp_path / "Super Favourites"))
+    return settings
+
+
+def test_subsystem_receives_static_folders_that_do_not_exist_yet(config, server):
+    for folder in ("Anime", "Marvel"):
+        remote = os.path.join(server.root, "base", "auto_fav_sync", "living_room", folder, "favourites.xml")
+        os.makedirs(os.path.dirname(remote))
+        with open(remote, "w", encoding="utf-8") as f:
+            f.write(FAVOURITES)
+    assert not os.path.exists(config.super_favourites_path)
+
+    sync_manager = sync.SyncManager(config)
+    try:
+        for folder in ("Anime", "Marvel"):
+            assert sync.sync_static_folder_real(sync_manager, server, False, folder)
+            local_path = sync.static_favourites_path(folder)
+            assert [element.get("name") for _, element in parse_favourites(local_path)] == ["Anime", "Marvel"]
+    finally:
+        sync_manager.close()
+
+
+def test_write_favourites_creates_missing_directory(tmp_path):
+    source = tmp_path / "source.xml"
+    source.write_text(FAVOURITES, encoding="utf-8")
+    target = tmp_path / "new" / "folder" / "favourites.xml"
+
+    write_favourites(str(target), parse_favourites(str(source)))
+
+    assert [key for key, _ in parse_favourites(str(target))] == [key for key, _ in parse_favourites(str(source))]
+    assert not os.path.exists(str(target) + ".part")
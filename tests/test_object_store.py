@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+import auto_ftp_sync as sync
+
+REMOTE_PATH = "/base/auto_fav_sync/living_room/favourites.xml"
+
+
+@pytest.fixture
+def config(monkeypatch):
+    settings = sync.config.load()
+    monkeypatch.setattr(settings, "content_addressed_store", True)
+    monkeypatch.setattr(settings, "compress_transfers", False)
+    monkeypatch.setattr(settings, "ftp_base_path", "base")
+    return settings
+
+
+def test_publishing_a_pointer_removes_the_stale_plain_file(config, server, tmp_path):
+    stale = server._path(REMOTE_PATH)
+    os.makedirs(os.path.dirname(stale))
+    with open(stale, "w", encoding="utf-8") as f:
+        f.write("<favourites />")
+    local_path = tmp_path / "favourites.xml"
+    local_path.write_text('<favourites><favourite name="New">PlayMedia("new")</favourite></favourites>', encoding="utf-8")
+    file_hash = sync.hash_file(str(local_path), "sha256")
+
+    assert sync.upload_file(server, str(local_path), REMOTE_PATH, {"hash": file_hash, "hash_algo": "sha256"})
+
+    assert not os.path.exists(stale)
+    assert os.path.exists(server._path(REMOTE_PATH + ".ref"))
+    downloaded = tmp_path / "downloaded.xml"
+    assert sync.download_file(server, REMOTE_PATH, str(downloaded))
+    assert downloaded.read_text(encoding="utf-8") == local_path.read_text(encoding="utf-8")
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+import auto_ftp_sync as sync
+
+OWN = '<favourites><favourite name="Own">PlayMedia("own")</favourite></favourites>'
+SPECIFIC = '<favourites><favourite name="Kids">PlayMedia("kids")</favourite></favourites>'
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    settings = sync.config.load()
+    monkeypatch.setattr(settings, "merge_favourites", False)
+    monkeypatch.setattr(settings, "overwrite_static", True)
+    monkeypatch.setattr(settings, "specific_custom_folder", "kids_room")
+    monkeypatch.setattr(settings, "ftp_base_path", "base")
+    monkeypatch.setattr(settings, "custom_folder", "living_room")
+    monkeypatch.setattr(settings, "super_favourites_path", str(tmp_path / "Super Favourites"))
+    return settings
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def test_overwritten_folder_is_not_downloaded_again_on_every_run(config, server, tmp_path):
+    own_remote = "/base/auto_fav_sync/living_room/kids_room/favourites.xml"
+    _write(server._path(own_remote), OWN)
+    _write(server._path("/base/auto_fav_sync/kids_room/favourites.xml"), SPECIFIC)
+    sync_manager = sync.SyncManager(config)
+    sync_manager.manifest = sync.RemoteManifest(server, "/base/auto_fav_sync/living_room", str(tmp_path))
+    sync_manager.manifest.loaded = True
+    sync_manager.manifest.update_entry(own_remote, sync.hash_file(server._path(own_remote), "sha256"),
+                                       len(OWN), "sha256")
+    local_path = sync.static_favourites_path("kids_room")
+    try:
+        runs = []
+        for _ in range(2):
+            change_set = sync.SyncChangeSet(config)
+            assert sync.sync_static_folder_real(sync_manager, server, False, "kids_room", change_set)
+            runs.append(change_set.changed)
+            with open(local_path, encoding="utf-8") as f:
+                assert f.read() == SPECIFIC
+        assert runs == [True, False]
+    finally:
+        sync_manager.close()